@@ -1,211 +1,34 @@
 from __future__ import annotations
 
 import json
-import logging
-import os
-import sys
-from dataclasses import dataclass, asdict
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Any
 
 import tkinter as tk
-from tkinter import ttk, messagebox
-
-from tools import (
-    QuickSearchTool,
-    SocialShortcutsTool,
-    WeatherTool,
-    WebDownloaderTool,
-    LinkCheckerTool,
-    Result,
-    Tool,
-    ToolError,
+from tkinter import ttk, messagebox, filedialog
+
+from tools import Result, RunContext
+from tools.batch import BatchRunner, read_inputs
+from history import HistoryPager, HistoryRow, render_event
+from jobs import Job, JobRunner
+from scheduler import Schedule, build_scheduler, format_interval, next_at, parse_interval
+from core import (
+    BATCH_INPUT_KEYS,
+    DATA_DIR,
+    HISTORY_PATH,
+    LOG_PATH,
+    RESOURCE_DIR,
+    build_registry,
+    load_config,
+    log,
+    open_history,
+    record,
+    safe_params,
+    setup_logging,
 )
 
-# ---------------- Paths (works for source + PyInstaller) ----------------
-
-def resource_dir() -> Path:
-    """
-    Where bundled read-only files live.
-    - Dev: repo folder
-    - PyInstaller: sys._MEIPASS (temp extraction dir)
-    """
-    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
-        return Path(sys._MEIPASS)
-    return Path(__file__).resolve().parent
-
-
-def user_data_dir(app_name: str = "AutomationHub") -> Path:
-    """
-    Where we write user data (logs/history/downloads).
-    """
-    if sys.platform == "darwin":
-        base = Path.home() / "Library" / "Application Support"
-    elif sys.platform.startswith("win"):
-        base = Path(os.environ.get("APPDATA", str(Path.home())))
-    else:
-        base = Path(os.environ.get("XDG_DATA_HOME", str(Path.home() / ".local" / "share")))
-    return base / app_name
-
-
-RESOURCE_DIR = resource_dir()
-DATA_DIR = user_data_dir()
-DATA_DIR.mkdir(parents=True, exist_ok=True)
-
-CONFIG_PATH = RESOURCE_DIR / "config.json"   # read-only bundled file
-HISTORY_PATH = DATA_DIR / "history.json"     # writable
-LOG_PATH = DATA_DIR / "app.log"              # writable
-
-# ---------------- Logging ----------------
-
-def setup_logging() -> None:
-    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s | %(levelname)s | %(message)s",
-        handlers=[
-            logging.FileHandler(LOG_PATH, encoding="utf-8"),
-            logging.StreamHandler(sys.stdout),
-        ],
-    )
-
 setup_logging()
-log = logging.getLogger("automation_hub")
-
-# ---------------- Models ----------------
-
-@dataclass(frozen=True)
-class AppConfig:
-    socials: dict[str, str]
-    search_engines: dict[str, str]
-    download_folder: str = "downloads"
-
-    @staticmethod
-    def from_dict(d: dict[str, Any]) -> "AppConfig":
-        socials = d.get("socials") or {}
-        search_engines = d.get("search_engines") or {}
-        download_folder = d.get("download_folder") or "downloads"
-
-        if not isinstance(socials, dict) or not isinstance(search_engines, dict):
-            raise ValueError("Invalid config.json structure.")
-
-        return AppConfig(
-            socials={str(k): str(v) for k, v in socials.items()},
-            search_engines={str(k): str(v) for k, v in search_engines.items()},
-            download_folder=str(download_folder),
-        )
-
-
-@dataclass(frozen=True)
-class HistoryEvent:
-    time: str
-    tool: str
-    params: dict[str, Any]
-    ok: bool
-    message: str
-    data: dict[str, Any]
-
-# ---------------- Config IO ----------------
-
-def load_config(path: Path = CONFIG_PATH) -> AppConfig:
-    if not path.exists():
-        return AppConfig(socials={}, search_engines={}, download_folder="downloads")
-
-    try:
-        raw = json.loads(path.read_text(encoding="utf-8"))
-        return AppConfig.from_dict(raw)
-    except Exception as e:
-        log.exception("Failed to load config.json: %s", e)
-        return AppConfig(socials={}, search_engines={}, download_folder="downloads")
-
-
-def now_iso() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-
-def safe_params(tool_name: str, params: dict[str, Any]) -> dict[str, Any]:
-    p = dict(params)
-
-    if tool_name in ("Web Downloader", "Link Checker"):
-        allowed = {"url", "mode", "out_dir", "timeout", "show_errors"}
-        p = {k: v for k, v in p.items() if k in allowed}
-
-    if tool_name == "Quick Search":
-        allowed = {"engine", "query"}
-        p = {k: v for k, v in p.items() if k in allowed}
-
-    if tool_name == "Weather":
-        p = {"city": p.get("city")}
-
-    if tool_name == "Social Shortcuts":
-        p = {"platform": p.get("platform")}
-
-    return p
-
-# ---------------- History Store ----------------
-
-class HistoryStore:
-    def __init__(self, path: Path, max_items: int = 300):
-        self.path = path
-        self.max_items = max_items
-
-    def load(self) -> list[HistoryEvent]:
-        if not self.path.exists():
-            return []
-        try:
-            items = json.loads(self.path.read_text(encoding="utf-8"))
-            if not isinstance(items, list):
-                return []
-            out: list[HistoryEvent] = []
-            for ev in items:
-                if isinstance(ev, dict):
-                    out.append(
-                        HistoryEvent(
-                            time=str(ev.get("time", "")),
-                            tool=str(ev.get("tool", "")),
-                            params=dict(ev.get("params", {}) or {}),
-                            ok=bool(ev.get("ok", False)),
-                            message=str(ev.get("message", "")),
-                            data=dict(ev.get("data", {}) or {}),
-                        )
-                    )
-            return out
-        except Exception as e:
-            log.exception("Failed to read history.json: %s", e)
-            return []
-
-    def save(self, items: list[HistoryEvent]) -> None:
-        if len(items) > self.max_items:
-            items = items[-self.max_items :]
-        self.path.write_text(
-            json.dumps([asdict(x) for x in items], indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
-
-    def append(self, event: HistoryEvent) -> None:
-        items = self.load()
-        items.append(event)
-        self.save(items)
-
-    def clear(self) -> None:
-        self.path.write_text("[]", encoding="utf-8")
-
-    def delete_at_display_index(self, display_index: int) -> None:
-        """
-        display_index: índice del Listbox tal como lo ves (0 = el más nuevo).
-        El JSON se guarda viejo->nuevo, por eso se mapea.
-        """
-        items = self.load()  # oldest -> newest
-        if not items:
-            return
-
-        target = len(items) - 1 - display_index  # 0 (newest) => -1
-        if target < 0 or target >= len(items):
-            return
-
-        del items[target]
-        self.save(items)
 
 # ---------------- App ----------------
 
@@ -213,11 +36,11 @@ class AutomationHubApp(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Automation Hub")
-        self.geometry("980x600")
-        self.minsize(920, 560)
+        self.geometry("980x680")
+        self.minsize(920, 620)
 
         self.config_data = load_config()
-        self.history = HistoryStore(HISTORY_PATH)
+        self.history = open_history()
 
         # store enter bindings so we can clear them when switching panels
         self._enter_bindings: list[tuple[tk.Widget, str]] = []
@@ -240,18 +63,26 @@ class AutomationHubApp(tk.Tk):
         self.style.configure("Accent.TButton", font=("Segoe UI", 10, "bold"))
         self.option_add("*TCombobox*Listbox.font", ("Segoe UI", 10))
 
-        # ---- Tools registry (typed) ----
-        self.tools: dict[str, Tool | None] = {
-            "Quick Search": QuickSearchTool(self.config_data.search_engines),
-            "Social Shortcuts": SocialShortcutsTool(self.config_data.socials),
-            "Weather": WeatherTool(),
-            "Web Downloader": WebDownloaderTool(),
-            "Link Checker": LinkCheckerTool(),
-            "History": None,
-        }
+        # ---- Tools registry (built lazily, see core.build_registry) ----
+        self.tools = build_registry(self.config_data)
+        # Sidebar entries: the tools, then panels that aren't tools themselves.
+        self.panels = [*self.tools.names(), "Batch", "Schedules", "History"]
+
+        # Tools run here, off the Tk thread; results come back through _poll_jobs.
+        self.jobs = JobRunner(max_workers=4)
+        self._jobs_version = -1
+        self._jobs_drawn_at = 0.0
+        self._job_rows: list[int] = []
+
+        # Recurring runs (schedule.db); `cli.py daemon` can run the same schedules headless.
+        self.scheduler = build_scheduler(self.config_data, self.tools, self.history, self._on_scheduled_done)
+        if self.config_data.scheduler.get("run_in_gui", True):
+            self.scheduler.start()
 
         self._build_layout()
         self._select_tool("Quick Search")
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.after(100, self._poll_jobs)
 
         log.info("App started. resource_dir=%s data_dir=%s", RESOURCE_DIR, DATA_DIR)
 
@@ -280,7 +111,7 @@ class AutomationHubApp(tk.Tk):
             selectforeground="white",
             relief="flat",
         )
-        for name in self.tools.keys():
+        for name in self.panels:
             self.tool_list.insert(tk.END, name)
         self.tool_list.pack(fill=tk.Y, expand=True)
         self.tool_list.bind("<<ListboxSelect>>", self._on_tool_select)
@@ -305,7 +136,7 @@ class AutomationHubApp(tk.Tk):
 
         self.output = tk.Text(
             self.main,
-            height=9,
+            height=7,
             wrap="word",
             font=("Consolas", 10),
             bg="#020617",
@@ -318,6 +149,25 @@ class AutomationHubApp(tk.Tk):
         self.output.pack(fill=tk.X)
         self.output.configure(state="disabled")
 
+        jobs_bar = ttk.Frame(self.main, style="Main.TFrame")
+        jobs_bar.pack(fill=tk.X, pady=(10, 6))
+        ttk.Label(jobs_bar, text="Jobs", style="Desc.TLabel").pack(side=tk.LEFT)
+        ttk.Button(jobs_bar, text="Cancel selected", command=self._cancel_selected_job).pack(side=tk.RIGHT)
+
+        self.jobs_list = tk.Listbox(
+            self.main,
+            height=3,
+            activestyle="none",
+            font=("Consolas", 9),
+            bg="#020617",
+            fg="#e2e8f0",
+            highlightthickness=0,
+            selectbackground="#1d4ed8",
+            selectforeground="white",
+            relief="flat",
+        )
+        self.jobs_list.pack(fill=tk.X)
+
     def _log_ui(self, text: str):
         self.output.configure(state="normal")
         self.output.insert(tk.END, text + "\n")
@@ -352,7 +202,7 @@ class AutomationHubApp(tk.Tk):
         self._clear_enter_bindings()
 
         try:
-            idx = list(self.tools.keys()).index(tool_name)
+            idx = self.panels.index(tool_name)
             self.tool_list.selection_clear(0, tk.END)
             self.tool_list.selection_set(idx)
         except ValueError:
@@ -367,7 +217,19 @@ class AutomationHubApp(tk.Tk):
             self._ui_history()
             return
 
-        tool = self.tools[tool_name]
+        if tool_name == "Schedules":
+            self.title_lbl.config(text="Schedules")
+            self.desc_lbl.config(text="Run a tool on a recurring schedule (e.g. check links every 6h).")
+            self._ui_schedules()
+            return
+
+        if tool_name == "Batch":
+            self.title_lbl.config(text="Batch")
+            self.desc_lbl.config(text="Run a tool over a file of inputs (one URL or city per line).")
+            self._ui_batch()
+            return
+
+        tool = self.tools.get(tool_name)
         if tool is None:
             self.title_lbl.config(text=tool_name)
             self.desc_lbl.config(text="")
@@ -390,38 +252,83 @@ class AutomationHubApp(tk.Tk):
 
     # ---------------- Tool runner ----------------
 
-    def _run_tool(self, tool_name: str, params: dict[str, Any]) -> Result:
-        tool = self.tools[tool_name]
+    def _run_tool(self, tool_name: str, params: dict[str, Any]) -> Job | None:
+        """Start the tool on the job pool; the result is logged and saved when it finishes."""
+        tool = self.tools.get(tool_name)
         if tool is None:
-            return Result(False, "Tool not available.", {})
-
-        try:
-            result = tool.run(params)
-        except ToolError as e:
-            log.warning("Tool error: %s tool=%s params=%s", e, tool_name, params)
-            result = Result(False, str(e), {})
-        except Exception as e:
-            log.exception("Tool crashed: %s tool=%s params=%s", e, tool_name, params)
-            result = Result(False, f"Tool crashed: {e}", {})
-
-        self._log_ui(("✅ " if result.ok else "❌ ") + result.message)
-
-        event = HistoryEvent(
-            time=now_iso(),
-            tool=tool_name,
-            params=safe_params(tool_name, params),
-            ok=result.ok,
-            message=result.message,
-            data=result.data or {},
-        )
-
-        try:
-            self.history.append(event)
-        except Exception as e:
-            log.exception("History append failed: %s", e)
+            self._log_ui("❌ Tool not available.")
+            return None
+
+        def on_done(job: Job) -> None:
+            result = job.result or Result(False, "No result.", {})
+            if not result.ok:
+                log.warning("Tool failed: %s tool=%s params=%s", result.message, tool_name, params)
+            self._log_ui(("✅ " if result.ok else "❌ ") + result.message)
+            self._record(tool_name, safe_params(tool_name, params), result)
+
+        job = self.jobs.submit(tool_name, lambda ctx: tool.run(params, ctx), on_done)
+        self._log_ui(f"⏳ {tool_name} started (job #{job.id})")
+        return job
+
+    def _record(self, tool_name: str, params: dict[str, Any], result: Result) -> None:
+        record(self.history, tool_name, params, result)
+
+    # ---------------- Jobs ----------------
+
+    def _poll_jobs(self):
+        """Tk-side end of the job queue: run posted callbacks, then redraw the jobs list."""
+        self.jobs.poll()
+        jobs = self.jobs.jobs()
+        now = time.time()
+        # Redraw on state changes, and once a second while something runs (elapsed time).
+        if self.jobs.version != self._jobs_version or (
+            any(j.active for j in jobs) and now - self._jobs_drawn_at >= 1
+        ):
+            self._jobs_version = self.jobs.version
+            self._jobs_drawn_at = now
+            self._draw_jobs(jobs, now)
+        self.after(100, self._poll_jobs)
+
+    def _draw_jobs(self, jobs: list[Job], now: float):
+        selected = self._selected_job_id()
+        self.jobs_list.delete(0, tk.END)
+        self._job_rows = [j.id for j in jobs]
+        for j in jobs:
+            end = j.finished or now
+            elapsed = f"{end - j.started:.1f}s" if j.started else "-"
+            line = f"#{j.id} {j.title} | {j.status} | {elapsed}"
+            if j.progress is not None:
+                line += f" | {j.progress.describe()}"
+                if j.active and j.progress.current:
+                    line += f" | {j.progress.current}"
+            self.jobs_list.insert(tk.END, line)
+        if selected in self._job_rows:
+            self.jobs_list.selection_set(self._job_rows.index(selected))
+
+    def _selected_job_id(self) -> int | None:
+        sel = self.jobs_list.curselection()
+        if not sel or sel[0] >= len(self._job_rows):
+            return None
+        return self._job_rows[sel[0]]
+
+    def _cancel_selected_job(self):
+        job_id = self._selected_job_id()
+        if job_id is None:
+            messagebox.showwarning("Cancel", "Select a running job first.")
+            return
+        self.jobs.cancel(job_id)
+        self._log_ui(f"⏹ Cancel requested for job #{job_id}")
 
-        return result
+    def _on_scheduled_done(self, schedule: Schedule, result: Result) -> None:
+        # Called on a scheduler thread; the UI is only touched from _poll_jobs.
+        first_line = result.message.splitlines()[0] if result.message else ""
+        line = ("✅ " if result.ok else "❌ ") + f"[scheduled] {schedule.name}: {first_line}"
+        self.jobs.post(lambda: self._log_ui(line))
 
+    def _on_close(self):
+        self.scheduler.stop(wait=False)
+        self.jobs.shutdown()
+        self.destroy()
 
     # ---------------- Panels ----------------
 
@@ -468,18 +375,29 @@ class AutomationHubApp(tk.Tk):
         self._bind_enter(combo, run)
 
     def _ui_weather(self):
-        ttk.Label(self.tool_panel, text="City", style="H.TLabel").pack(anchor="w")
+        ttk.Label(self.tool_panel, text="City (separate several with ;)", style="H.TLabel").pack(anchor="w")
         city_var = tk.StringVar()
         entry = ttk.Entry(self.tool_panel, textvariable=city_var)
         entry.pack(anchor="w", fill=tk.X, pady=(6, 12))
         entry.focus_set()
 
+        refresh_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.tool_panel, text="Skip cache (force refresh)", variable=refresh_var).pack(
+            anchor="w", pady=(0, 12)
+        )
+
         def run():
             city = city_var.get().strip()
             if not city:
                 messagebox.showwarning("Missing city", "Please enter a city.")
                 return
-            self._run_tool("Weather", {"city": city})
+            from tools.weather import parse_cities
+
+            cities = parse_cities(city)
+            params: dict[str, Any] = {"cities": cities} if len(cities) > 1 else {"city": city}
+            if refresh_var.get():
+                params["refresh"] = True
+            self._run_tool("Weather", params)
 
         ttk.Button(self.tool_panel, text="Get Weather", style="Accent.TButton", command=run).pack(anchor="w")
         self._bind_enter(entry, run)
@@ -540,6 +458,25 @@ class AutomationHubApp(tk.Tk):
         chk = ttk.Checkbutton(row, text="Show non-404 errors", variable=show_errors_var)
         chk.pack(side=tk.LEFT)
 
+        crawl_row = ttk.Frame(self.tool_panel, style="Card.TFrame")
+        crawl_row.pack(fill=tk.X, pady=(0, 12))
+
+        crawl_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(crawl_row, text="Crawl same-site pages", variable=crawl_var).pack(side=tk.LEFT)
+
+        ttk.Label(crawl_row, text="Depth", style="Body.TLabel").pack(side=tk.LEFT, padx=(18, 0))
+        depth_var = tk.StringVar(value="2")
+        depth_entry = ttk.Entry(crawl_row, textvariable=depth_var, width=5)
+        depth_entry.pack(side=tk.LEFT, padx=(8, 18))
+
+        ttk.Label(crawl_row, text="Max pages", style="Body.TLabel").pack(side=tk.LEFT)
+        pages_var = tk.StringVar(value="50")
+        pages_entry = ttk.Entry(crawl_row, textvariable=pages_var, width=7)
+        pages_entry.pack(side=tk.LEFT, padx=(8, 18))
+
+        sitemap_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(crawl_row, text="Seed from sitemap", variable=sitemap_var).pack(side=tk.LEFT)
+
         def run():
             url = url_var.get().strip()
             if not url:
@@ -550,15 +487,224 @@ class AutomationHubApp(tk.Tk):
             except ValueError:
                 timeout = 10
 
-            self._run_tool(
-                "Link Checker",
-                {"url": url, "timeout": timeout, "show_errors": bool(show_errors_var.get())},
-            )
+            params: dict[str, Any] = {"url": url, "timeout": timeout, "show_errors": bool(show_errors_var.get())}
+            if crawl_var.get():
+                params.update({"crawl": True, "max_depth": depth_var.get(), "max_pages": pages_var.get()})
+                params["sitemap"] = bool(sitemap_var.get())
+
+            self._run_tool("Link Checker", params)
 
         ttk.Button(self.tool_panel, text="Scan Links", style="Accent.TButton", command=run).pack(anchor="w")
         self._bind_enter(url_entry, run)
         self._bind_enter(timeout_entry, run)
         self._bind_enter(chk, run)
+        self._bind_enter(depth_entry, run)
+        self._bind_enter(pages_entry, run)
+
+    def _ui_batch(self):
+        tool_names = list(BATCH_INPUT_KEYS)
+
+        ttk.Label(self.tool_panel, text="Tool", style="H.TLabel").pack(anchor="w")
+        tool_var = tk.StringVar(value=tool_names[0])
+        ttk.Combobox(self.tool_panel, textvariable=tool_var, values=tool_names, state="readonly").pack(
+            anchor="w", fill=tk.X, pady=(6, 12)
+        )
+
+        ttk.Label(self.tool_panel, text="Input file", style="H.TLabel").pack(anchor="w")
+        file_row = ttk.Frame(self.tool_panel, style="Card.TFrame")
+        file_row.pack(fill=tk.X, pady=(6, 12))
+        file_var = tk.StringVar()
+        file_entry = ttk.Entry(file_row, textvariable=file_var)
+        file_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        def browse():
+            path = filedialog.askopenfilename(title="Choose input file")
+            if path:
+                file_var.set(path)
+
+        ttk.Button(file_row, text="Browse", command=browse).pack(side=tk.LEFT, padx=(6, 0))
+
+        row = ttk.Frame(self.tool_panel, style="Card.TFrame")
+        row.pack(fill=tk.X, pady=(0, 12))
+        ttk.Label(row, text="Workers", style="Body.TLabel").pack(side=tk.LEFT)
+        workers_var = tk.StringVar(value="4")
+        workers_entry = ttk.Entry(row, textvariable=workers_var, width=6)
+        workers_entry.pack(side=tk.LEFT, padx=(8, 0))
+
+        def run():
+            tool_name = tool_var.get()
+            in_path = Path(file_var.get().strip())
+            if not file_var.get().strip() or not in_path.is_file():
+                messagebox.showwarning("Missing file", "Please choose an input file.")
+                return
+            try:
+                workers = max(1, int(workers_var.get()))
+            except ValueError:
+                workers = 4
+
+            tool = self.tools.get(tool_name)
+            if tool is None:
+                return
+            inputs = read_inputs(in_path)
+            # Report lives next to the input, so re-running the same file resumes it.
+            report_path = in_path.with_name(f"{in_path.stem}.{self._safe_slug(tool_name)}.report.jsonl")
+            base_params: dict[str, Any] = {"out_dir": self.config_data.download_folder}
+
+            def on_result(item: str, result: Result) -> None:
+                first_line = result.message.splitlines()[0] if result.message else ""
+                line = ("✅ " if result.ok else "❌ ") + f"{item}: {first_line}"
+                self.jobs.post(lambda: self._log_ui(line))  # called on a worker thread
+
+            runner = BatchRunner(tool, tool_name, BATCH_INPUT_KEYS[tool_name], base_params, workers)
+
+            def work(ctx: RunContext) -> Result:
+                summary = runner.run(inputs, report_path, on_result, ctx)
+                msg = (
+                    f"Batch {tool_name}: {summary.ok} ok, {summary.failed} failed, "
+                    f"{summary.skipped} already done, {summary.cancelled} cancelled (of {summary.total})\n"
+                    f"Report: {summary.report_path}"
+                )
+                data = {"report": str(summary.report_path), "ok": summary.ok, "failed": summary.failed}
+                return Result(summary.failed == 0 and summary.cancelled == 0, msg, data)
+
+            def on_done(job: Job) -> None:
+                result = job.result or Result(False, "No result.", {})
+                self._log_ui(("✅ " if result.ok else "❌ ") + result.message)
+                self._record(f"{tool_name} (batch)", {"file": str(in_path), "workers": workers}, result)
+
+            job = self.jobs.submit(f"{tool_name} batch", work, on_done)
+            self._log_ui(f"⏳ Batch {tool_name} started: {len(inputs)} input(s) (job #{job.id})")
+
+        ttk.Button(self.tool_panel, text="Run batch", style="Accent.TButton", command=run).pack(anchor="w")
+        self._bind_enter(file_entry, run)
+        self._bind_enter(workers_entry, run)
+
+    def _ui_schedules(self):
+        store = self.scheduler.store
+
+        ttk.Label(self.tool_panel, text="Schedules", style="H.TLabel").pack(anchor="w")
+        schedule_list = tk.Listbox(
+            self.tool_panel,
+            height=6,
+            activestyle="none",
+            font=("Consolas", 10),
+            bg="#020617",
+            fg="#e2e8f0",
+            highlightthickness=0,
+            selectbackground="#1d4ed8",
+            selectforeground="white",
+            relief="flat",
+        )
+        schedule_list.pack(fill=tk.X, pady=(6, 6))
+        rows: list[Schedule] = []
+
+        def fmt_time(t: float | None) -> str:
+            return time.strftime("%Y-%m-%d %H:%M", time.localtime(t)) if t else "-"
+
+        def refresh():
+            rows[:] = store.schedules()
+            schedule_list.delete(0, tk.END)
+            for sc in rows:
+                last = "-" if sc.last_ok is None else ("OK" if sc.last_ok else "FAIL")
+                state = "" if sc.enabled else " (disabled)"
+                schedule_list.insert(
+                    tk.END,
+                    f"#{sc.id} {sc.name}{state} | {sc.tool} | every {format_interval(sc.interval)}"
+                    f" | next {fmt_time(sc.next_run)} | last {last}",
+                )
+
+        def selected() -> Schedule | None:
+            sel = schedule_list.curselection()
+            if not sel:
+                messagebox.showwarning("Schedules", "Select a schedule first.")
+                return None
+            return rows[sel[0]]
+
+        def run_now():
+            sc = selected()
+            if sc is not None:
+                store.run_now(sc.id)
+                refresh()
+
+        def toggle():
+            sc = selected()
+            if sc is not None:
+                store.set_enabled(sc.id, not sc.enabled)
+                refresh()
+
+        def delete():
+            sc = selected()
+            if sc is not None and messagebox.askyesno("Delete schedule", f"Delete '{sc.name}'?"):
+                store.remove(sc.id)
+                refresh()
+
+        buttons = ttk.Frame(self.tool_panel, style="Card.TFrame")
+        buttons.pack(fill=tk.X, pady=(0, 12))
+        ttk.Button(buttons, text="Refresh", command=refresh).pack(side=tk.LEFT)
+        ttk.Button(buttons, text="Run now", command=run_now).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(buttons, text="Enable/Disable", command=toggle).pack(side=tk.LEFT, padx=(6, 0))
+        ttk.Button(buttons, text="Delete", command=delete).pack(side=tk.LEFT, padx=(6, 0))
+
+        # ---- New schedule ----
+        ttk.Label(self.tool_panel, text="New schedule", style="H.TLabel").pack(anchor="w")
+        form = ttk.Frame(self.tool_panel, style="Card.TFrame")
+        form.pack(fill=tk.X, pady=(6, 6))
+        name_var = tk.StringVar()
+        tool_var = tk.StringVar(value=self.tools.names()[0])
+        every_var = tk.StringVar(value="6h")
+        at_var = tk.StringVar()
+        jitter_var = tk.StringVar(value="0")
+        for col, (label, widget) in enumerate(
+            [
+                ("Name", ttk.Entry(form, textvariable=name_var, width=18)),
+                ("Tool", ttk.Combobox(form, textvariable=tool_var, values=self.tools.names(), state="readonly", width=16)),
+                ("Every", ttk.Entry(form, textvariable=every_var, width=6)),
+                ("At (HH:MM)", ttk.Entry(form, textvariable=at_var, width=6)),
+                ("Jitter", ttk.Entry(form, textvariable=jitter_var, width=6)),
+            ]
+        ):
+            ttk.Label(form, text=label, style="Body.TLabel").grid(row=0, column=col, sticky="w", padx=(0, 8))
+            widget.grid(row=1, column=col, sticky="we", padx=(0, 8))
+
+        ttk.Label(self.tool_panel, text='Params (JSON), e.g. {"url": "https://example.com"}', style="Body.TLabel").pack(
+            anchor="w", pady=(6, 0)
+        )
+        params_var = tk.StringVar(value="{}")
+        ttk.Entry(self.tool_panel, textvariable=params_var).pack(anchor="w", fill=tk.X, pady=(4, 6))
+        catch_up_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(
+            self.tool_panel, text="Run missed slots once after downtime", variable=catch_up_var
+        ).pack(anchor="w", pady=(0, 12))
+
+        def add():
+            name = name_var.get().strip() or tool_var.get()
+            try:
+                params = json.loads(params_var.get() or "{}")
+                if not isinstance(params, dict):
+                    raise ValueError("params must be a JSON object")
+                interval = parse_interval(every_var.get())
+                jitter_text = jitter_var.get().strip()
+                jitter = parse_interval(jitter_text) if jitter_text not in ("", "0") else 0
+                first_run = next_at(at_var.get().strip()) if at_var.get().strip() else None
+            except ValueError as e:
+                messagebox.showwarning("Invalid schedule", str(e))
+                return
+            if tool_var.get() == "Web Downloader":
+                params.setdefault("out_dir", self.config_data.download_folder)
+            store.add(name, tool_var.get(), params, interval, jitter, first_run=first_run, catch_up=catch_up_var.get())
+            self._log_ui(f"🕒 Scheduled '{name}' every {format_interval(interval)}")
+            refresh()
+
+        ttk.Button(self.tool_panel, text="Add schedule", style="Accent.TButton", command=add).pack(anchor="w")
+        if not self.config_data.scheduler.get("run_in_gui", True):
+            ttk.Label(
+                self.tool_panel, text="Schedules run in the background daemon (python cli.py daemon).", style="Body.TLabel"
+            ).pack(anchor="w", pady=(8, 0))
+        refresh()
+
+    @staticmethod
+    def _safe_slug(text: str) -> str:
+        return "".join(c if c.isalnum() else "_" for c in text.lower())
 
     def _ui_history(self):
         container = ttk.Frame(self.tool_panel, style="Card.TFrame")
@@ -569,15 +715,47 @@ class AutomationHubApp(tk.Tk):
 
         ttk.Label(top, text="Latest events", style="H.TLabel").pack(side=tk.LEFT)
 
+        # Filters: one indexed query for the first page each time they change.
+        filters = ttk.Frame(container, style="Card.TFrame")
+        filters.pack(fill=tk.X, pady=(8, 0))
+        ttk.Label(filters, text="Tool", style="Body.TLabel").pack(side=tk.LEFT)
+        tool_var = tk.StringVar(value="All")
+        tool_combo = ttk.Combobox(filters, textvariable=tool_var, state="readonly", width=22)
+        tool_combo.pack(side=tk.LEFT, padx=(6, 12))
+        ttk.Label(filters, text="Status", style="Body.TLabel").pack(side=tk.LEFT)
+        status_var = tk.StringVar(value="All")
+        status_combo = ttk.Combobox(filters, textvariable=status_var, values=["All", "OK", "FAIL"], state="readonly", width=6)
+        status_combo.pack(side=tk.LEFT, padx=(6, 12))
+        count_lbl = ttk.Label(filters, text="", style="Body.TLabel")
+        count_lbl.pack(side=tk.RIGHT)
+
+        pager = HistoryPager(self.history, page_size=100)
+
+        def update_count():
+            count_lbl.config(text=f"Showing {len(pager.rows)} of {pager.total()}")
+
+        def append_rows(rows: list[HistoryRow]):
+            for row in rows:
+                self._history_list.insert(tk.END, row.describe())
+
         def refresh():
+            tool_combo.config(values=["All", *self.history.tools()])
+            tool = tool_var.get()
+            status = status_var.get()
             self._history_list.delete(0, tk.END)
-            items = self.history.load()
-            items = items[-200:]
-            items.reverse()  # newest first
-            self._history_items = items
-            for ev in items:
-                line = f"{ev.time} | {ev.tool} | {'OK' if ev.ok else 'FAIL'}"
-                self._history_list.insert(tk.END, line)
+            details.delete("1.0", tk.END)
+            append_rows(pager.set_filter(None if tool == "All" else tool, None if status == "All" else status == "OK"))
+            update_count()
+
+        loading = False
+
+        def load_more():
+            nonlocal loading
+            loading = False
+            rows = pager.load_more()
+            if rows:
+                append_rows(rows)
+                update_count()
 
         def open_file():
             messagebox.showinfo("Files", f"History:\n{HISTORY_PATH}\n\nLogs:\n{LOG_PATH}")
@@ -599,29 +777,46 @@ class AutomationHubApp(tk.Tk):
                 messagebox.showwarning("Delete", "Select an item first.")
                 return
 
-            idx = sel[0]  # displayed index (0 = newest)
-            ev = self._history_items[idx]
+            row = pager.rows[sel[0]]
 
             if not messagebox.askyesno(
                 "Delete selected",
-                f"Delete this entry?\n\n{ev.time} | {ev.tool} | {'OK' if ev.ok else 'FAIL'}",
+                f"Delete this entry?\n\n{row.time} | {row.tool} | {'OK' if row.ok else 'FAIL'}",
             ):
                 return
 
             try:
-                self.history.delete_at_display_index(idx)
-                refresh()
+                self.history.delete(row.id)
             except Exception as e:
                 log.exception("Failed to delete history item: %s", e)
                 messagebox.showerror("Error", f"Could not delete item:\n{e}")
+                return
+            idx = pager.remove(row.id)
+            if idx is not None:
+                self._history_list.delete(idx)
+            details.delete("1.0", tk.END)
+            update_count()
 
         ttk.Button(top, text="Refresh", command=refresh).pack(side=tk.RIGHT, padx=(6, 0))
         ttk.Button(top, text="Delete selected", command=delete_selected).pack(side=tk.RIGHT, padx=(6, 0))
         ttk.Button(top, text="Clear", command=clear_history).pack(side=tk.RIGHT, padx=(6, 0))
         ttk.Button(top, text="Show path", command=open_file).pack(side=tk.RIGHT)
 
+        list_frame = ttk.Frame(container, style="Card.TFrame")
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(10, 10))
+        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def on_scroll(first: str, last: str):
+            scrollbar.set(first, last)
+            # Near the bottom of what's loaded: fetch the next page.
+            nonlocal loading
+            if float(last) > 0.9 and pager.has_more and not loading:
+                loading = True
+                self.after_idle(load_more)
+
         self._history_list = tk.Listbox(
-            container,
+            list_frame,
             activestyle="none",
             font=("Consolas", 10),
             bg="#020617",
@@ -630,8 +825,10 @@ class AutomationHubApp(tk.Tk):
             selectbackground="#1d4ed8",
             selectforeground="white",
             relief="flat",
+            yscrollcommand=on_scroll,
         )
-        self._history_list.pack(fill=tk.BOTH, expand=True, pady=(10, 10))
+        self._history_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self._history_list.yview)
 
         details = tk.Text(
             container,
@@ -650,18 +847,19 @@ class AutomationHubApp(tk.Tk):
             sel = self._history_list.curselection()
             if not sel:
                 return
-            idx = sel[0]
-            ev = self._history_items[idx]
+            # Full event (with params/data) is only read for the selected row.
+            ev = self.history.get(pager.rows[sel[0]].id)
             details.delete("1.0", tk.END)
-            details.insert(tk.END, json.dumps(asdict(ev), indent=2, ensure_ascii=False))
+            if ev is not None:
+                details.insert(tk.END, render_event(ev))
 
         self._history_list.bind("<<ListboxSelect>>", on_select)
         self._history_list.bind("<Delete>", lambda _e: delete_selected())
+        tool_combo.bind("<<ComboboxSelected>>", lambda _e: refresh())
+        status_combo.bind("<<ComboboxSelected>>", lambda _e: refresh())
 
-        self._history_items: list[HistoryEvent] = []
         refresh()
 
-
 if __name__ == "__main__":
     app = AutomationHubApp()
     app.mainloop()
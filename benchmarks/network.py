@@ -0,0 +1,241 @@
+"""
+Throughput benchmark for the network tools against a local synthetic site.
+
+    python benchmarks/network.py                          # all scenarios, 3 runs each
+    python benchmarks/network.py -s link_checker_crawl --latency-ms 20 --status-mix 404=0.1
+    python benchmarks/network.py --out new.json --compare old.json
+
+For every run the tool executes in a fresh interpreter (so peak RSS belongs
+to that run alone) against a SiteServer started by this process; bytes and
+requests are counted on the server side. Results (per run and medians) are
+written as JSON, and --compare prints the change against an earlier file.
+"""
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from synthetic_site import SiteServer, SiteSpec, parse_status_mix  # noqa: E402
+
+# Medians of these are compared by --compare (higher is better except peak_rss_mb).
+METRICS = ("pages_per_sec", "links_per_sec", "bytes_per_sec", "peak_rss_mb")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    tool: str                     # "link_checker" or "web_downloader"
+    site: SiteSpec
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+SCENARIOS: dict[str, Scenario] = {
+    # One wide page: probe throughput (HEAD + pooled keep-alive).
+    "link_checker_page": Scenario(
+        "link_checker",
+        SiteSpec(pages=1, links_per_page=400, page_link_ratio=0, images_per_page=0),
+    ),
+    # BFS crawl with some latency and a few broken links.
+    "link_checker_crawl": Scenario(
+        "link_checker",
+        SiteSpec(pages=100, links_per_page=30, latency_ms=5, jitter_ms=5, status_mix={404: 0.05, 500: 0.01}),
+        {"crawl": True, "max_depth": 4, "max_pages": 100},
+    ),
+    # Page + images download, one page after another.
+    "web_downloader": Scenario(
+        "web_downloader",
+        SiteSpec(pages=10, links_per_page=20, images_per_page=12, image_bytes=64_000, latency_ms=5),
+        {"mode": "all"},
+    ),
+}
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ---------------- child: runs one tool ----------------
+
+def run_child(job: dict[str, Any]) -> dict[str, Any]:
+    from tools.link_checker import LinkCheckerTool
+    from tools.web_downloader import WebDownloaderTool
+
+    base_url: str = job["base_url"]
+    params: dict[str, Any] = job["params"]
+    pages = links = 0
+
+    t0 = time.perf_counter()
+    if job["tool"] == "link_checker":
+        res = LinkCheckerTool().run({"url": f"{base_url}/page/0.html", "use_cache": False, **params})
+        pages, links = res.data["pages_crawled"], res.data["links_checked"]
+        ok = res.ok
+    else:
+        tool = WebDownloaderTool()
+        ok = True
+        with tempfile.TemporaryDirectory() as out_dir:
+            for i in range(job["pages"]):
+                res = tool.run({"url": f"{base_url}/page/{i}.html", "out_dir": out_dir, **params})
+                ok = ok and res.ok
+                pages += 1
+                links += res.data.get("images", 0)
+                if res.data.get("links"):
+                    links += len(Path(res.data["links"]).read_text(encoding="utf-8").splitlines())
+    elapsed = time.perf_counter() - t0
+
+    return {"ok": ok, "elapsed": elapsed, "pages": pages, "links": links, "peak_rss_mb": peak_rss_mb()}
+
+
+# ---------------- parent: server, runs, report ----------------
+
+def run_scenario(name: str, scenario: Scenario, repeat: int) -> dict[str, Any]:
+    runs: list[dict[str, Any]] = []
+    with SiteServer(scenario.site) as server:
+        job = {
+            "tool": scenario.tool,
+            "base_url": server.base_url,
+            "params": scenario.params,
+            "pages": scenario.site.pages,
+        }
+        for _ in range(repeat):
+            server.site.reset_counters()
+            proc = subprocess.run(
+                [sys.executable, __file__, "--child", json.dumps(job)],
+                capture_output=True,
+                text=True,
+            )
+            if proc.returncode != 0:
+                raise RuntimeError(f"{name}: child failed:\n{proc.stderr}")
+            run = json.loads(proc.stdout.strip().splitlines()[-1])
+            elapsed = max(run["elapsed"], 1e-9)
+            run.update(
+                requests=server.site.requests,
+                bytes=server.site.bytes_sent,
+                pages_per_sec=run["pages"] / elapsed,
+                links_per_sec=run["links"] / elapsed,
+                bytes_per_sec=server.site.bytes_sent / elapsed,
+            )
+            runs.append(run)
+
+    median = {}
+    for key in ("elapsed", *METRICS):
+        values = [r[key] for r in runs if r.get(key) is not None]
+        median[key] = statistics.median(values) if values else None
+    return {
+        "name": name,
+        "tool": scenario.tool,
+        "params": scenario.params,
+        "site": scenario.site.as_dict(),
+        "runs": runs,
+        "median": median,
+    }
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    before = {s["name"]: s["median"] for s in baseline.get("scenarios", [])}
+    lines = []
+    for s in current["scenarios"]:
+        old = before.get(s["name"])
+        if old is None:
+            continue
+        for key in METRICS:
+            new_v, old_v = s["median"].get(key), old.get(key)
+            if new_v is None or not old_v:
+                continue
+            change = (new_v - old_v) / old_v * 100
+            lines.append(f"{s['name']:<22} {key:<14} {old_v:>12.1f} -> {new_v:>12.1f}  ({change:+.1f}%)")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("-s", "--scenario", action="append", choices=sorted(SCENARIOS),
+                    help="scenario to run (repeatable; default: all)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--pages", type=int)
+    ap.add_argument("--links", type=int, help="links per page")
+    ap.add_argument("--images", type=int, help="images per page")
+    ap.add_argument("--image-bytes", type=int)
+    ap.add_argument("--latency-ms", type=float)
+    ap.add_argument("--jitter-ms", type=float)
+    ap.add_argument("--status-mix", type=parse_status_mix, help='e.g. "404=0.05,500=0.01"')
+    ap.add_argument("--out", type=Path, default=Path("bench-network.json"))
+    ap.add_argument("--compare", type=Path, help="earlier results file to compare against")
+    args = ap.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_child(json.loads(args.child))))
+        return 0
+
+    overrides = {
+        k: v
+        for k, v in {
+            "pages": args.pages,
+            "links_per_page": args.links,
+            "images_per_page": args.images,
+            "image_bytes": args.image_bytes,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "status_mix": args.status_mix,
+        }.items()
+        if v is not None
+    }
+
+    results: dict[str, Any] = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "repeat": args.repeat,
+        },
+        "scenarios": [],
+    }
+    for name in args.scenario or list(SCENARIOS):
+        base = SCENARIOS[name]
+        scenario = dataclasses.replace(base, site=dataclasses.replace(base.site, **overrides))
+        res = run_scenario(name, scenario, max(1, args.repeat))
+        results["scenarios"].append(res)
+        m = res["median"]
+        rss = f"{m['peak_rss_mb']:.0f} MB" if m["peak_rss_mb"] is not None else "n/a"
+        print(
+            f"{name:<22} {m['pages_per_sec']:8.1f} pages/s {m['links_per_sec']:9.1f} links/s "
+            f"{m['bytes_per_sec'] / 1e6:8.2f} MB/s  peak RSS {rss}"
+        )
+
+    args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(f"Results: {args.out}")
+
+    if args.compare:
+        lines = compare(results, json.loads(args.compare.read_text(encoding="utf-8")))
+        print("\n".join(lines) if lines else "Nothing to compare.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
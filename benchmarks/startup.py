@@ -0,0 +1,157 @@
+"""
+Startup benchmark: import cost (python -X importtime) and time to first window.
+
+    python benchmarks/startup.py                # 5 runs, prints a summary
+    python benchmarks/startup.py --runs 10 --json startup.json
+
+Each run is a fresh interpreter with a throwaway data dir, so caches, history
+and logs from a real install don't skew the numbers. Time to first window is
+measured from process start until Tk has drawn the main window once
+(skipped when there is no display).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that should only load once a tool that needs them is used.
+HEAVY = ("requests", "urllib3", "charset_normalizer", "idna", "bs4", "lxml", "selectolax")
+
+_WINDOW_SNIPPET = """
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+try:
+    win = app.AutomationHubApp()
+except Exception as e:  # TclError without a display
+    print(json.dumps({"error": str(e)}))
+    raise SystemExit(0)
+win.update()
+t2 = time.perf_counter()
+print(json.dumps({"import_app": t1 - t0, "first_window": t2 - t0, "loaded_tools": win.tools.loaded()}))
+win.destroy()
+"""
+
+
+def _env(data_dir: str) -> dict[str, str]:
+    env = dict(os.environ)
+    # user_data_dir() honours these on Linux / Windows; HOME covers macOS.
+    env.update(XDG_DATA_HOME=data_dir, APPDATA=data_dir, HOME=data_dir)
+    return env
+
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for each line of -X importtime output."""
+    rows: list[tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # header line
+        rows.append((parts[2].strip(), self_us, cumulative_us))
+    return rows
+
+
+def measure_imports(module: str) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT,
+            env=_env(data_dir),
+            capture_output=True,
+            text=True,
+        )
+        wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    rows = parse_importtime(proc.stderr)
+    total = next((cum for name, _self, cum in rows if name == module), 0)
+    return {
+        "wall": wall,
+        "import_us": total,
+        "modules": len(rows),
+        "heavy": sorted({name for name, _s, _c in rows if name.split(".")[0] in HEAVY and "." not in name}),
+        "top": sorted(rows, key=lambda r: r[1], reverse=True)[:15],
+    }
+
+
+def measure_window() -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as data_dir:
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", _WINDOW_SNIPPET],
+            cwd=ROOT,
+            env=_env(data_dir),
+            capture_output=True,
+            text=True,
+        )
+        wall = time.perf_counter() - t0
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    lines = proc.stdout.strip().splitlines()
+    out = json.loads(lines[-1]) if lines else {"error": "no output"}
+    out["process_wall"] = wall  # includes interpreter start and teardown
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--module", default="app", help="module to import (default: app)")
+    ap.add_argument("--json", type=Path, help="also write the results to this file")
+    args = ap.parse_args(argv)
+
+    imports = [measure_imports(args.module) for _ in range(max(1, args.runs))]
+    windows = [measure_window() for _ in range(max(1, args.runs))] if args.module == "app" else []
+
+    results: dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "runs": len(imports),
+        "import_ms_median": statistics.median(r["import_us"] for r in imports) / 1000,
+        "modules": imports[-1]["modules"],
+        "heavy_modules": imports[-1]["heavy"],
+        "slowest_self_ms": [(name, s / 1000) for name, s, _c in imports[-1]["top"]],
+    }
+    drawn = [w for w in windows if "first_window" in w]
+    if drawn:
+        results["first_window_ms_median"] = statistics.median(w["first_window"] for w in drawn) * 1000
+        results["process_ms_median"] = statistics.median(w["process_wall"] for w in drawn) * 1000
+        results["loaded_tools"] = drawn[-1]["loaded_tools"]
+    elif windows:
+        results["first_window_skipped"] = windows[-1].get("error", "unknown error")
+
+    print(f"import {args.module}: {results['import_ms_median']:.1f} ms median over {results['runs']} runs "
+          f"({results['modules']} modules)")
+    print(f"heavy modules at startup: {', '.join(results['heavy_modules']) or 'none'}")
+    if "first_window_ms_median" in results:
+        print(f"first window: {results['first_window_ms_median']:.1f} ms "
+              f"(process {results['process_ms_median']:.1f} ms), tools loaded: {results['loaded_tools']}")
+    elif windows:
+        print(f"first window: skipped ({results['first_window_skipped']})")
+    print("slowest imports (self time):")
+    for name, ms in results["slowest_self_ms"]:
+        print(f"  {ms:8.2f} ms  {name}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
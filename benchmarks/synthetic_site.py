@@ -0,0 +1,207 @@
+"""
+A local stand-in website for the network benchmarks.
+
+Everything is generated from a SiteSpec and a seed, so two runs (or two
+versions of the app) see exactly the same site:
+
+    /page/<i>.html      HTML page: links to other pages, to leaf resources and images
+    /res/<i>-<k>        leaf link; its status comes from status_mix (200 otherwise)
+    /img/<i>-<k>.png    image_bytes of opaque data (with an ETag; honours If-None-Match)
+    /robots.txt         Disallow lines from SiteSpec.disallow, plus a Sitemap line
+    /sitemap.xml        sitemap index pointing at /sitemap-pages.xml.gz (every page, gzipped)
+
+Every response carries Content-Length so keep-alive (HTTP/1.1) works and
+pooled connections are actually reused. latency_ms (+ up to jitter_ms) is
+slept before each response.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+@dataclass(frozen=True)
+class SiteSpec:
+    pages: int = 50
+    links_per_page: int = 20           # <a> tags per page, split between pages and leaf resources
+    page_link_ratio: float = 0.3       # share of links that point at other pages (crawlable)
+    images_per_page: int = 5
+    image_bytes: int = 20_000
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    status_mix: dict[int, float] = field(default_factory=dict)  # e.g. {404: 0.05, 500: 0.01}
+    disallow: tuple[str, ...] = ()     # robots.txt Disallow paths, e.g. ("/res/",)
+    seed: int = 1
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def parse_status_mix(text: str) -> dict[int, float]:
+    """"404=0.05,500=0.01" -> {404: 0.05, 500: 0.01}."""
+    mix: dict[int, float] = {}
+    for part in text.split(","):
+        if part.strip():
+            code, _, share = part.partition("=")
+            mix[int(code)] = float(share)
+    return mix
+
+
+class SyntheticSite:
+    def __init__(self, spec: SiteSpec):
+        self.spec = spec
+        self.image = (hashlib.sha256(str(spec.seed).encode()).digest() * (spec.image_bytes // 32 + 1))[
+            : spec.image_bytes
+        ]
+        self._pages: dict[int, bytes] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+
+    # ---- content ----
+
+    def page(self, i: int) -> bytes:
+        cached = self._pages.get(i)
+        if cached is not None:
+            return cached
+        spec = self.spec
+        rnd = random.Random(spec.seed * 1_000_003 + i)
+        n_pages = round(spec.links_per_page * spec.page_link_ratio)
+        parts = [f"<!doctype html><html><head><title>Page {i}</title></head><body><h1>Page {i}</h1>"]
+        for _ in range(n_pages):
+            parts.append(f'<p><a href="/page/{rnd.randrange(spec.pages)}.html">next</a></p>')
+        for k in range(spec.links_per_page - n_pages):
+            parts.append(f'<p>Item {k}: <a href="/res/{i}-{k}">details</a></p>')
+        for k in range(spec.images_per_page):
+            parts.append(f'<img src="/img/{i}-{k}.png" alt="image {k}">')
+        parts.append("</body></html>")
+        body = "\n".join(parts).encode()
+        self._pages[i] = body
+        return body
+
+    def robots(self, base_url: str) -> bytes:
+        lines = ["User-agent: *", *(f"Disallow: {p}" for p in self.spec.disallow), f"Sitemap: {base_url}/sitemap.xml"]
+        return ("\n".join(lines) + "\n").encode()
+
+    def sitemap_index(self, base_url: str) -> bytes:
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+            f"<sitemap><loc>{base_url}/sitemap-pages.xml.gz</loc></sitemap></sitemapindex>"
+        ).encode()
+
+    def sitemap_pages(self, base_url: str) -> bytes:
+        urls = "".join(f"<url><loc>{base_url}/page/{i}.html</loc></url>" for i in range(self.spec.pages))
+        xml = f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+        return gzip.compress(xml.encode(), mtime=0)
+
+    def resource_status(self, name: str) -> int:
+        rnd = random.Random(f"{self.spec.seed}:{name}")
+        x = rnd.random()
+        for code, share in sorted(self.spec.status_mix.items()):
+            if x < share:
+                return code
+            x -= share
+        return 200
+
+    def count(self, sent: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += sent
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.requests = 0
+            self.bytes_sent = 0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "SiteServer"
+
+    def log_message(self, format, *args):  # noqa: A002 - quiet
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, head: bool, headers: dict[str, str] | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+        self.server.site.count(0 if head else len(body))
+
+    def _serve(self, head: bool) -> None:
+        site = self.server.site
+        spec = site.spec
+        if spec.latency_ms or spec.jitter_ms:
+            time.sleep((spec.latency_ms + random.random() * spec.jitter_ms) / 1000)
+
+        path = self.path.split("?", 1)[0]
+        base_url = f"http://{self.headers.get('Host') or self.server.base_url[len('http://'):]}"
+        try:
+            if path == "/" or path == "/index.html":
+                self._send(200, site.page(0), "text/html; charset=utf-8", head)
+            elif path.startswith("/page/") and path.endswith(".html"):
+                i = int(path[len("/page/"):-len(".html")])
+                if not 0 <= i < spec.pages:
+                    raise ValueError(path)
+                self._send(200, site.page(i), "text/html; charset=utf-8", head)
+            elif path == "/robots.txt":
+                self._send(200, site.robots(base_url), "text/plain", head)
+            elif path == "/sitemap.xml":
+                self._send(200, site.sitemap_index(base_url), "application/xml", head)
+            elif path == "/sitemap-pages.xml.gz":
+                self._send(200, site.sitemap_pages(base_url), "application/gzip", head)
+            elif path.startswith("/res/"):
+                status = site.resource_status(path[len("/res/"):])
+                self._send(status, b"ok" if status < 400 else b"error", "text/plain", head)
+            elif path.startswith("/img/"):
+                etag = f'"{spec.seed}-{path[len("/img/"):]}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, b"", "image/png", True, {"ETag": etag})
+                else:
+                    self._send(200, site.image, "image/png", head, {"ETag": etag})
+            else:
+                raise ValueError(path)
+        except ValueError:
+            self._send(404, b"not found", "text/plain", head)
+
+    def do_GET(self):  # noqa: N802
+        self._serve(head=False)
+
+    def do_HEAD(self):  # noqa: N802
+        self._serve(head=True)
+
+
+class SiteServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer on 127.0.0.1 (random port) serving a SyntheticSite in a background thread."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, spec: SiteSpec):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.site = SyntheticSite(spec)
+        self._thread = threading.Thread(target=self.serve_forever, name="bench-site", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "SiteServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.shutdown()
+        self.server_close()
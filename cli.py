@@ -0,0 +1,268 @@
+"""
+Headless entry point: run a tool without Tk (cron, CI containers).
+
+    python cli.py list
+    python cli.py run "Link Checker" -p url=https://example.com -p crawl=true
+    python cli.py run link-checker --json '{"url": "https://example.com", "max_pages": 50}'
+    python cli.py run weather --json @params.json --pretty
+    python cli.py schedule add "Docs links" link-checker --every 6h --jitter 10m -p url=https://example.com
+    python cli.py daemon            # run schedules until stopped (or --once for cron)
+
+The Result is printed to stdout as JSON ({"tool", "ok", "message", "data"}) and
+recorded in the same history database as the GUI. Exit status: 0 ok, 1 the tool
+failed, 2 bad usage, 130 interrupted (Ctrl+C cancels the run cooperatively).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from tools import Result, RunContext
+from tools.batch import run_tool_safely
+from tools.progress import ProgressEvent
+from core import SCHEDULE_PATH, build_registry, load_config, log, open_history, record, safe_params, setup_logging
+from scheduler import Schedule, ScheduleStore, build_scheduler, next_at, parse_interval
+
+EXIT_OK, EXIT_FAILED, EXIT_USAGE, EXIT_INTERRUPTED = 0, 1, 2, 130
+
+
+def _slug(name: str) -> str:
+    return "".join(c for c in name.lower() if c.isalnum())
+
+
+def resolve_tool_name(names: list[str], wanted: str) -> str | None:
+    """Exact name, or case/punctuation-insensitive ("link-checker" -> "Link Checker")."""
+    if wanted in names:
+        return wanted
+    by_slug = {_slug(n): n for n in names}
+    return by_slug.get(_slug(wanted))
+
+
+def parse_value(text: str) -> Any:
+    """JSON if it parses (numbers, true/false, lists, objects), else the plain string."""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def build_params(json_arg: str | None, pairs: list[str]) -> dict[str, Any]:
+    """--json (inline, @file or - for stdin) first, then -p key=value pairs on top."""
+    params: dict[str, Any] = {}
+    if json_arg:
+        if json_arg == "-":
+            text = sys.stdin.read()
+        elif json_arg.startswith("@"):
+            text = Path(json_arg[1:]).read_text(encoding="utf-8")
+        else:
+            text = json_arg
+        loaded = json.loads(text)
+        if not isinstance(loaded, dict):
+            raise ValueError("--json must be a JSON object")
+        params.update(loaded)
+    for pair in pairs:
+        key, sep, value = pair.partition("=")
+        if not sep or not key.strip():
+            raise ValueError(f"expected key=value, got {pair!r}")
+        params[key.strip()] = parse_value(value)
+    return params
+
+
+def _parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Run Automation Hub tools without the GUI.",
+    )
+    ap.add_argument("-v", "--verbose", action="store_true", help="log to stderr as well as app.log")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="list available tools")
+
+    run = sub.add_parser("run", help="run one tool and print its Result as JSON")
+    run.add_argument("tool", help='tool name, e.g. "Link Checker" or link-checker')
+    run.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE",
+                     help="tool param; VALUE is parsed as JSON when possible (repeatable)")
+    run.add_argument("--json", metavar="JSON", help="params as a JSON object, @file.json, or - for stdin")
+    run.add_argument("--no-history", action="store_true", help="don't record this run in history")
+    run.add_argument("--progress", action="store_true", help="print progress to stderr")
+    run.add_argument("--pretty", action="store_true", help="indent the JSON output")
+
+    daemon = sub.add_parser("daemon", help="run due schedules (see 'schedule') until stopped")
+    daemon.add_argument("--once", action="store_true", help="run everything due now, wait for it, then exit")
+
+    schedule = sub.add_parser("schedule", help="manage recurring runs")
+    sched_sub = schedule.add_subparsers(dest="action", required=True)
+    add = sched_sub.add_parser("add", help="add a recurring run")
+    add.add_argument("name")
+    add.add_argument("tool")
+    add.add_argument("--every", required=True, help='interval, e.g. "30m", "6h", "1d"')
+    add.add_argument("--at", metavar="HH:MM", help="first run at this local time (e.g. nightly at 02:00)")
+    add.add_argument("--jitter", default="0", help='start up to this much later than the slot, e.g. "5m"')
+    add.add_argument("--no-catch-up", action="store_true",
+                     help="after downtime, wait for the next slot instead of running once right away")
+    add.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE")
+    add.add_argument("--json", metavar="JSON", help="params as a JSON object, @file.json, or - for stdin")
+    sched_sub.add_parser("list", help="print schedules as JSON")
+    for action in ("remove", "enable", "disable", "run"):
+        p = sched_sub.add_parser(action, help=f"{action} a schedule" if action != "run" else "make a schedule due now")
+        p.add_argument("id", type=int)
+    return ap
+
+
+def _run(args: argparse.Namespace) -> int:
+    config = load_config()
+    tools = build_registry(config)
+
+    name = resolve_tool_name(tools.names(), args.tool)
+    if name is None:
+        print(f"Unknown tool {args.tool!r}. Available: {', '.join(tools.names())}", file=sys.stderr)
+        return EXIT_USAGE
+    try:
+        params = build_params(args.json, args.param)
+    except (OSError, ValueError) as e:
+        print(f"Invalid params: {e}", file=sys.stderr)
+        return EXIT_USAGE
+    if name == "Web Downloader":
+        params.setdefault("out_dir", config.download_folder)
+
+    tool = tools.get(name)
+    if tool is None:
+        print(f"Tool {name!r} could not be loaded (see app.log).", file=sys.stderr)
+        return EXIT_FAILED
+
+    def show_progress(ev: ProgressEvent) -> None:
+        print(f"[{name}] {ev.describe()}", file=sys.stderr, flush=True)
+
+    ctx = RunContext(progress=show_progress if args.progress else None)
+    # The tool runs on a worker thread so Ctrl+C here can cancel it cooperatively.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(run_tool_safely, tool, params, ctx)
+        try:
+            result = future.result()
+        except KeyboardInterrupt:
+            ctx.cancel.cancel()
+            print("Cancelling...", file=sys.stderr)
+            result = future.result()
+
+    interrupted = result is None
+    if result is None:
+        result = Result(False, "Cancelled.", {})
+
+    if not args.no_history:
+        history = open_history()
+        try:
+            record(history, name, safe_params(name, params), result)
+        finally:
+            history.close()
+
+    out = {"tool": name, "ok": result.ok, "message": result.message, "data": result.data or {}}
+    print(json.dumps(out, ensure_ascii=False, default=str, indent=2 if args.pretty else None))
+    if interrupted:
+        return EXIT_INTERRUPTED
+    return EXIT_OK if result.ok else EXIT_FAILED
+
+
+def _schedule_json(s: Schedule) -> dict[str, Any]:
+    d = asdict(s)
+    for key in ("next_run", "last_run"):
+        if d[key] is not None:
+            d[key + "_local"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(d[key]))
+    return d
+
+
+def _schedule(args: argparse.Namespace) -> int:
+    store = ScheduleStore(SCHEDULE_PATH)
+    try:
+        if args.action == "list":
+            print(json.dumps([_schedule_json(s) for s in store.schedules()], ensure_ascii=False, indent=2))
+            return EXIT_OK
+
+        if args.action == "add":
+            names = build_registry(load_config()).names()
+            tool = resolve_tool_name(names, args.tool)
+            if tool is None:
+                print(f"Unknown tool {args.tool!r}. Available: {', '.join(names)}", file=sys.stderr)
+                return EXIT_USAGE
+            try:
+                params = build_params(args.json, args.param)
+                interval = parse_interval(args.every)
+                jitter = parse_interval(args.jitter) if args.jitter not in ("", "0") else 0
+                first_run = next_at(args.at) if args.at else None
+            except (OSError, ValueError) as e:
+                print(f"Invalid schedule: {e}", file=sys.stderr)
+                return EXIT_USAGE
+            schedule_id = store.add(
+                args.name, tool, params, interval, jitter, first_run=first_run, catch_up=not args.no_catch_up
+            )
+            print(json.dumps(_schedule_json(store.get(schedule_id)), ensure_ascii=False))
+            return EXIT_OK
+
+        if store.get(args.id) is None:
+            print(f"No schedule with id {args.id}", file=sys.stderr)
+            return EXIT_USAGE
+        if args.action == "remove":
+            store.remove(args.id)
+        elif args.action in ("enable", "disable"):
+            store.set_enabled(args.id, args.action == "enable")
+        elif args.action == "run":
+            store.run_now(args.id)
+        return EXIT_OK
+    finally:
+        store.close()
+
+
+def _daemon(args: argparse.Namespace) -> int:
+    config = load_config()
+    history = open_history()
+
+    def on_finish(s: Schedule, result: Result) -> None:
+        line = {"schedule": s.name, "tool": s.tool, "ok": result.ok, "message": result.message}
+        print(json.dumps(line, ensure_ascii=False, default=str), flush=True)
+
+    scheduler = build_scheduler(config, build_registry(config), history, on_finish)
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    try:
+        if args.once:
+            scheduler.store.skip_missed(time.time())
+            scheduler.run_due()
+        else:
+            scheduler.start()
+            log.info("Scheduler daemon started (owner %s)", scheduler.owner)
+            while not stop.wait(1):
+                pass
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.stop()
+        scheduler.store.close()
+        history.close()
+    return EXIT_OK
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parser().parse_args(argv)
+    setup_logging(sys.stderr if args.verbose else None)
+
+    if args.command == "list":
+        tools = build_registry(load_config())
+        for name in tools.names():
+            print(name)
+        return EXIT_OK
+    if args.command == "schedule":
+        return _schedule(args)
+    if args.command == "daemon":
+        return _daemon(args)
+    return _run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,261 @@
+"""
+Shared, UI-free setup used by both app.py (Tk) and cli.py (headless):
+paths, logging, config, history and the tool registry.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+from tools import Result, Tool
+from tools.registry import ToolFactory, ToolRegistry, lazy
+from history import HistoryEvent, HistoryStore, SqliteHistoryStore
+
+# ---------------- Paths (works for source + PyInstaller) ----------------
+
+def resource_dir() -> Path:
+    """
+    Where bundled read-only files live.
+    - Dev: repo folder
+    - PyInstaller: sys._MEIPASS (temp extraction dir)
+    """
+    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+        return Path(sys._MEIPASS)
+    return Path(__file__).resolve().parent
+
+
+def user_data_dir(app_name: str = "AutomationHub") -> Path:
+    """
+    Where we write user data (logs/history/downloads).
+    """
+    if sys.platform == "darwin":
+        base = Path.home() / "Library" / "Application Support"
+    elif sys.platform.startswith("win"):
+        base = Path(os.environ.get("APPDATA", str(Path.home())))
+    else:
+        base = Path(os.environ.get("XDG_DATA_HOME", str(Path.home() / ".local" / "share")))
+    return base / app_name
+
+
+RESOURCE_DIR = resource_dir()
+DATA_DIR = user_data_dir()
+DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+CONFIG_PATH = RESOURCE_DIR / "config.json"   # read-only bundled file
+HISTORY_PATH = DATA_DIR / "history.db"       # writable (SQLite)
+JSONL_HISTORY_PATH = DATA_DIR / "history.jsonl"  # older formats, migrated on first use
+LEGACY_HISTORY_PATH = DATA_DIR / "history.json"
+LINK_CACHE_PATH = DATA_DIR / "link_cache.json"  # writable
+WEATHER_CACHE_PATH = DATA_DIR / "weather_cache.json"  # writable
+ROBOTS_CACHE_PATH = DATA_DIR / "robots_cache.json"  # writable
+SCHEDULE_PATH = DATA_DIR / "schedule.db"     # writable (SQLite, shared by GUI and daemon)
+LOG_PATH = DATA_DIR / "app.log"              # writable
+
+# ---------------- Logging ----------------
+
+def setup_logging(stream: TextIO | None = sys.stdout) -> None:
+    """Log to app.log and, unless stream is None, to stream (the CLI keeps stdout for results)."""
+    LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    handlers: list[logging.Handler] = [logging.FileHandler(LOG_PATH, encoding="utf-8")]
+    if stream is not None:
+        handlers.append(logging.StreamHandler(stream))
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+        handlers=handlers,
+    )
+
+log = logging.getLogger("automation_hub")
+
+# ---------------- Models ----------------
+
+@dataclass(frozen=True)
+class AppConfig:
+    socials: dict[str, str]
+    search_engines: dict[str, str]
+    download_folder: str = "downloads"
+    http: dict[str, Any] = field(default_factory=dict)
+    weather: dict[str, Any] = field(default_factory=dict)
+    scheduler: dict[str, Any] = field(default_factory=dict)
+    robots: dict[str, Any] = field(default_factory=dict)
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "AppConfig":
+        socials = d.get("socials") or {}
+        search_engines = d.get("search_engines") or {}
+        download_folder = d.get("download_folder") or "downloads"
+        http = d.get("http") or {}
+        weather = d.get("weather") or {}
+        scheduler = d.get("scheduler") or {}
+        robots = d.get("robots") or {}
+
+        if not all(isinstance(x, dict) for x in (socials, search_engines, http, weather, scheduler, robots)):
+            raise ValueError("Invalid config.json structure.")
+
+        return AppConfig(
+            socials={str(k): str(v) for k, v in socials.items()},
+            search_engines={str(k): str(v) for k, v in search_engines.items()},
+            download_folder=str(download_folder),
+            http=dict(http),
+            weather=dict(weather),
+            scheduler=dict(scheduler),
+            robots=dict(robots),
+        )
+
+
+# ---------------- Config IO ----------------
+
+def load_config(path: Path = CONFIG_PATH) -> AppConfig:
+    if not path.exists():
+        return AppConfig(socials={}, search_engines={}, download_folder="downloads")
+
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return AppConfig.from_dict(raw)
+    except Exception as e:
+        log.exception("Failed to load config.json: %s", e)
+        return AppConfig(socials={}, search_engines={}, download_folder="downloads")
+
+
+def now_iso() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def safe_params(tool_name: str, params: dict[str, Any]) -> dict[str, Any]:
+    p = dict(params)
+
+    if tool_name in ("Web Downloader", "Link Checker"):
+        allowed = {
+            "url", "mode", "out_dir", "timeout", "show_errors",
+            "workers", "per_host", "use_cache",
+            "crawl", "max_depth", "max_pages",
+            "max_image_bytes", "max_total_bytes",
+            "respect_robots", "sitemap", "max_page_bytes", "include_srcset",
+        }
+        p = {k: v for k, v in p.items() if k in allowed}
+
+    if tool_name == "Quick Search":
+        allowed = {"engine", "query"}
+        p = {k: v for k, v in p.items() if k in allowed}
+
+    if tool_name == "Weather":
+        p = {k: p[k] for k in ("city", "cities", "refresh", "include_raw") if k in p}
+
+    if tool_name == "Social Shortcuts":
+        p = {"platform": p.get("platform")}
+
+    return p
+
+# Which param each batch input line fills, per tool.
+BATCH_INPUT_KEYS = {
+    "Web Downloader": "url",
+    "Link Checker": "url",
+    "Weather": "city",
+}
+
+
+# ---------------- Tools ----------------
+
+def open_history() -> SqliteHistoryStore:
+    return SqliteHistoryStore(
+        HISTORY_PATH,
+        migrate_from=HistoryStore(JSONL_HISTORY_PATH, legacy_path=LEGACY_HISTORY_PATH),
+    )
+
+
+def record(history: SqliteHistoryStore, tool_name: str, params: dict[str, Any], result: Result) -> None:
+    """Append a finished run to history; params should already be safe_params()-filtered."""
+    event = HistoryEvent(
+        time=now_iso(),
+        tool=tool_name,
+        params=params,
+        ok=result.ok,
+        message=result.message,
+        data=result.data or {},
+    )
+    try:
+        history.append(event)
+    except Exception as e:
+        log.exception("History append failed: %s", e)
+
+
+def _weather_tool(config: AppConfig) -> Tool:
+    from tools.weather import WeatherTool
+
+    cfg = config.weather
+    try:
+        return WeatherTool(
+            cache_path=WEATHER_CACHE_PATH,
+            cache_ttl=float(cfg.get("cache_ttl", 600)),
+            max_stale=float(cfg.get("max_stale", 24 * 3600)),
+            cache_max_items=int(cfg.get("cache_size", 200)),
+        )
+    except (TypeError, ValueError) as e:
+        log.warning("Invalid weather settings in config.json, using defaults: %s", e)
+        return WeatherTool(cache_path=WEATHER_CACHE_PATH)
+
+
+def _robots_cache(config: AppConfig) -> Any:
+    """One robots.txt cache shared by the crawling tools, or None when disabled."""
+    from tools.robots import RobotsCache
+
+    cfg = config.robots
+    if not cfg.get("respect", True):
+        return None
+    try:
+        return RobotsCache(
+            ROBOTS_CACHE_PATH,
+            ttl=float(cfg.get("ttl", 24 * 3600)),
+            max_crawl_delay=float(cfg.get("max_crawl_delay", 10)),
+        )
+    except (TypeError, ValueError) as e:
+        log.warning("Invalid robots settings in config.json, using defaults: %s", e)
+        return RobotsCache(ROBOTS_CACHE_PATH)
+
+
+def build_registry(config: AppConfig) -> ToolRegistry:
+    """
+    All tools, registered lazily: a tool (and requests, html parsers, ...) is
+    imported and built the first time it is selected or run.
+    """
+    http_configured = False
+    robots: list[Any] = []  # built once, on first use
+
+    def network(factory: ToolFactory) -> ToolFactory:
+        # Configure the shared HTTP session before the first network tool loads.
+        def build() -> Tool:
+            nonlocal http_configured
+            if not http_configured:
+                from tools import http_client
+
+                try:
+                    http_client.configure(http_client.HttpSettings.from_dict(config.http))
+                except (TypeError, ValueError) as e:
+                    log.warning("Invalid http settings in config.json, using defaults: %s", e)
+                http_configured = True
+            return factory()
+
+        return build
+
+    def crawler(spec: str, **kwargs: Any) -> ToolFactory:
+        def build() -> Tool:
+            if not robots:
+                robots.append(_robots_cache(config))
+            return lazy(spec, robots=robots[0], **kwargs)()
+
+        return network(build)
+
+    tools = ToolRegistry()
+    tools.register("Quick Search", lazy("tools.quick_search:QuickSearchTool", config.search_engines))
+    tools.register("Social Shortcuts", lazy("tools.social_shortcuts:SocialShortcutsTool", config.socials))
+    tools.register("Weather", network(lambda: _weather_tool(config)))
+    tools.register("Web Downloader", crawler("tools.web_downloader:WebDownloaderTool"))
+    tools.register("Link Checker", crawler("tools.link_checker:LinkCheckerTool", cache_path=LINK_CACHE_PATH))
+    return tools
+
@@ -0,0 +1,486 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger("automation_hub")
+
+
+@dataclass(frozen=True)
+class HistoryEvent:
+    time: str
+    tool: str
+    params: dict[str, Any]
+    ok: bool
+    message: str
+    data: dict[str, Any]
+    id: int | None = None  # stable row id (SQLite store only)
+
+    @staticmethod
+    def from_dict(ev: dict[str, Any]) -> "HistoryEvent":
+        return HistoryEvent(
+            time=str(ev.get("time", "")),
+            tool=str(ev.get("tool", "")),
+            params=dict(ev.get("params", {}) or {}),
+            ok=bool(ev.get("ok", False)),
+            message=str(ev.get("message", "")),
+            data=dict(ev.get("data", {}) or {}),
+        )
+
+
+@dataclass(frozen=True)
+class HistoryRow:
+    """One list line: enough to show and select an event without loading params/data."""
+    id: int
+    time: str
+    tool: str
+    ok: bool
+    summary: str  # first line of the message, truncated
+
+    def describe(self) -> str:
+        return f"{self.time} | {self.tool} | {'OK' if self.ok else 'FAIL'} | {self.summary}"
+
+
+def _dumps(event: HistoryEvent) -> str:
+    d = asdict(event)
+    d.pop("id", None)
+    return json.dumps(d, ensure_ascii=False, default=str)
+
+
+class HistoryStore:
+    """
+    Append-only JSONL history (one event per line, oldest first).
+    - append() writes a single line: O(1) regardless of history size
+    - once the file holds compact_factor * max_items lines it is rewritten
+      with the newest max_items (amortized O(1) per append)
+    - a legacy history.json (one JSON array) is migrated on first use
+    """
+
+    def __init__(self, path: Path, max_items: int = 300, legacy_path: Path | None = None, compact_factor: int = 2):
+        self.path = path
+        self.max_items = max_items
+        self.legacy_path = legacy_path
+        self.compact_factor = max(1, compact_factor)
+        self._lock = threading.RLock()
+        self._lines: int | None = None  # counted lazily
+
+    # ---- internals ----
+
+    def _migrate_legacy(self) -> None:
+        if self.path.exists() or self.legacy_path is None or not self.legacy_path.exists():
+            return
+        try:
+            items = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+        except Exception as e:
+            log.exception("Failed to read legacy history %s: %s", self.legacy_path, e)
+            return
+        events = [HistoryEvent.from_dict(ev) for ev in items if isinstance(ev, dict)] if isinstance(items, list) else []
+        self._rewrite(events[-self.max_items :])
+        self.legacy_path.replace(self.legacy_path.with_name(self.legacy_path.name + ".migrated"))
+        log.info("Migrated %d history events to %s", len(events), self.path)
+
+    def _line_count(self) -> int:
+        if self._lines is None:
+            self._migrate_legacy()
+            if not self.path.exists():
+                self._lines = 0
+            else:
+                lines = 0
+                last = b"\n"
+                with self.path.open("rb") as f:
+                    for last in f:
+                        lines += 1
+                if not last.endswith(b"\n"):
+                    # A crash mid-append left a torn line; terminate it so the next event starts clean.
+                    with self.path.open("ab") as f:
+                        f.write(b"\n")
+                self._lines = lines
+        return self._lines
+
+    def _rewrite(self, items: list[HistoryEvent]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("w", encoding="utf-8") as f:
+            for ev in items:
+                f.write(_dumps(ev) + "\n")
+        os.replace(tmp, self.path)
+        self._lines = len(items)
+
+    # ---- public API ----
+
+    def load(self) -> list[HistoryEvent]:
+        with self._lock:
+            self._line_count()
+            if not self.path.exists():
+                return []
+            out: list[HistoryEvent] = []
+            try:
+                with self.path.open(encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            ev = json.loads(line)
+                        except ValueError:
+                            continue  # torn line from a crash mid-append
+                        if isinstance(ev, dict):
+                            out.append(HistoryEvent.from_dict(ev))
+            except Exception as e:
+                log.exception("Failed to read %s: %s", self.path, e)
+                return []
+            return out[-self.max_items :]
+
+    def save(self, items: list[HistoryEvent]) -> None:
+        with self._lock:
+            self._rewrite(items[-self.max_items :])
+
+    def append(self, event: HistoryEvent) -> None:
+        with self._lock:
+            lines = self._line_count()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as f:
+                f.write(_dumps(event) + "\n")
+            self._lines = lines + 1
+            if self._lines >= self.max_items * self.compact_factor:
+                self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the file keeping only the newest max_items events."""
+        with self._lock:
+            self._rewrite(self.load())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rewrite([])
+
+    def delete_at_display_index(self, display_index: int) -> None:
+        """
+        display_index: índice del Listbox tal como lo ves (0 = el más nuevo).
+        El archivo se guarda viejo->nuevo, por eso se mapea.
+        """
+        with self._lock:
+            items = self.load()  # oldest -> newest
+            if not items:
+                return
+
+            target = len(items) - 1 - display_index  # 0 (newest) => -1
+            if target < 0 or target >= len(items):
+                return
+
+            del items[target]
+            self.save(items)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id      INTEGER PRIMARY KEY AUTOINCREMENT,
+    time    TEXT    NOT NULL,
+    tool    TEXT    NOT NULL,
+    ok      INTEGER NOT NULL,
+    params  TEXT    NOT NULL,
+    message TEXT    NOT NULL,
+    data    TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_time ON events(time);
+CREATE INDEX IF NOT EXISTS idx_events_tool ON events(tool, id);
+CREATE INDEX IF NOT EXISTS idx_events_ok ON events(ok, id);
+"""
+
+
+class SqliteHistoryStore:
+    """
+    Indexed history in a single SQLite file (WAL mode).
+    - events have stable ids; pages are fetched newest-first with keyset
+      pagination (before_id), so deep pages cost the same as the first one
+    - filters: tool, ok, time range (ISO strings, as in HistoryEvent.time), text
+    - older rows beyond max_items are pruned in batches
+    - JSONL / legacy JSON history is imported once when the database is new
+    """
+
+    _PRUNE_EVERY = 500
+
+    def __init__(self, path: Path, max_items: int = 100_000, migrate_from: HistoryStore | None = None):
+        self.path = path
+        self.max_items = max_items
+        self._lock = threading.RLock()
+        self._appends = 0
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        if migrate_from is not None:
+            self._migrate(migrate_from)
+
+    # ---- internals ----
+
+    def _migrate(self, old: HistoryStore) -> None:
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM events LIMIT 1").fetchone() is not None:
+                return
+            old.max_items = max(old.max_items, self.max_items)
+            events = old.load()
+            if not events:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO events (time, tool, ok, params, message, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    [self._row(ev) for ev in events],
+                )
+        if old.path.exists():
+            old.path.replace(old.path.with_name(old.path.name + ".migrated"))
+        log.info("Migrated %d history events to %s", len(events), self.path)
+
+    @staticmethod
+    def _row(ev: HistoryEvent) -> tuple[Any, ...]:
+        return (
+            ev.time,
+            ev.tool,
+            int(bool(ev.ok)),
+            json.dumps(ev.params, ensure_ascii=False, default=str),
+            ev.message,
+            json.dumps(ev.data, ensure_ascii=False, default=str),
+        )
+
+    @staticmethod
+    def _event(row: tuple[Any, ...]) -> HistoryEvent:
+        id_, time, tool, ok, params, message, data = row
+        return HistoryEvent(
+            time=time,
+            tool=tool,
+            params=json.loads(params or "{}"),
+            ok=bool(ok),
+            message=message,
+            data=json.loads(data or "{}"),
+            id=id_,
+        )
+
+    @staticmethod
+    def _where(
+        tool: str | None,
+        ok: bool | None,
+        since: str | None,
+        until: str | None,
+        text: str | None,
+    ) -> tuple[list[str], list[Any]]:
+        clauses: list[str] = []
+        args: list[Any] = []
+        if tool is not None:
+            clauses.append("tool = ?")
+            args.append(tool)
+        if ok is not None:
+            clauses.append("ok = ?")
+            args.append(int(ok))
+        if since is not None:
+            clauses.append("time >= ?")
+            args.append(since)
+        if until is not None:
+            clauses.append("time <= ?")
+            args.append(until)
+        if text:
+            escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("(message LIKE ? ESCAPE '\\' OR params LIKE ? ESCAPE '\\')")
+            args.extend([f"%{escaped}%"] * 2)
+        return clauses, args
+
+    # ---- public API ----
+
+    def append(self, event: HistoryEvent) -> int:
+        with self._lock:
+            with self._conn:
+                cur = self._conn.execute(
+                    "INSERT INTO events (time, tool, ok, params, message, data) VALUES (?, ?, ?, ?, ?, ?)",
+                    self._row(event),
+                )
+            self._appends += 1
+            if self._appends % self._PRUNE_EVERY == 0:
+                self.prune()
+            return int(cur.lastrowid)
+
+    def query(
+        self,
+        tool: str | None = None,
+        ok: bool | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        text: str | None = None,
+        before_id: int | None = None,
+        limit: int = 50,
+    ) -> list[HistoryEvent]:
+        """Newest first. Pass the last id of a page as before_id to get the next page."""
+        clauses, args = self._where(tool, ok, since, until, text)
+        if before_id is not None:
+            clauses.append("id < ?")
+            args.append(before_id)
+        sql = "SELECT id, time, tool, ok, params, message, data FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        args.append(max(1, limit))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [self._event(r) for r in rows]
+
+    def rows(
+        self,
+        tool: str | None = None,
+        ok: bool | None = None,
+        before_id: int | None = None,
+        limit: int = 100,
+        summary_chars: int = 80,
+    ) -> list[HistoryRow]:
+        """
+        Like query() but only reads the small columns (params/data blobs stay
+        on disk), for listing. Fetch the full event with get(row.id).
+        """
+        clauses, args = self._where(tool, ok, None, None, None)
+        if before_id is not None:
+            clauses.append("id < ?")
+            args.append(before_id)
+        sql = "SELECT id, time, tool, ok, substr(message, 1, ?) FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC LIMIT ?"
+        args = [summary_chars * 2, *args, max(1, limit)]
+        with self._lock:
+            found = self._conn.execute(sql, args).fetchall()
+        out = []
+        for id_, time, tool_, ok_, message in found:
+            first = (message or "").splitlines()[0] if message else ""
+            if len(first) > summary_chars:
+                first = first[: summary_chars - 1] + "…"
+            out.append(HistoryRow(id=id_, time=time, tool=tool_, ok=bool(ok_), summary=first))
+        return out
+
+    def count(
+        self,
+        tool: str | None = None,
+        ok: bool | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        text: str | None = None,
+    ) -> int:
+        clauses, args = self._where(tool, ok, since, until, text)
+        sql = "SELECT COUNT(*) FROM events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            return int(self._conn.execute(sql, args).fetchone()[0])
+
+    def tools(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT DISTINCT tool FROM events ORDER BY tool")]
+
+    def get(self, event_id: int) -> HistoryEvent | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, time, tool, ok, params, message, data FROM events WHERE id = ?", (event_id,)
+            ).fetchone()
+        return self._event(row) if row else None
+
+    def load(self) -> list[HistoryEvent]:
+        """Newest max_items events, oldest first (same shape as HistoryStore.load)."""
+        items = self.query(limit=self.max_items)
+        items.reverse()
+        return items
+
+    def delete(self, event_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE id = ?", (event_id,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events")
+
+    def prune(self) -> None:
+        """Drop events older than the newest max_items."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM events WHERE id <= (SELECT id FROM events ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (self.max_items,),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class HistoryPager:
+    """
+    Newest-first window over a SqliteHistoryStore for a scrolling list.
+    - load_more() appends the next page (keyset pagination, cheap at any depth)
+    - set_filter() starts over with a new tool/status filter: one indexed
+      query for the first page, never a full reload
+    - remove() drops a deleted row locally, without re-querying
+    """
+
+    def __init__(self, store: SqliteHistoryStore, page_size: int = 100):
+        self.store = store
+        self.page_size = page_size
+        self.tool: str | None = None
+        self.ok: bool | None = None
+        self.rows: list[HistoryRow] = []
+        self.has_more = True
+
+    def set_filter(self, tool: str | None = None, ok: bool | None = None) -> list[HistoryRow]:
+        self.tool, self.ok = tool, ok
+        self.rows = []
+        self.has_more = True
+        return self.load_more()
+
+    def load_more(self) -> list[HistoryRow]:
+        """Next page (possibly empty); also returned so the caller can append just these."""
+        if not self.has_more:
+            return []
+        before = self.rows[-1].id if self.rows else None
+        page = self.store.rows(tool=self.tool, ok=self.ok, before_id=before, limit=self.page_size)
+        self.rows.extend(page)
+        self.has_more = len(page) == self.page_size
+        return page
+
+    def remove(self, event_id: int) -> int | None:
+        """Forget a row; returns its former index (or None if it wasn't loaded)."""
+        for i, row in enumerate(self.rows):
+            if row.id == event_id:
+                del self.rows[i]
+                return i
+        return None
+
+    def total(self) -> int:
+        return self.store.count(tool=self.tool, ok=self.ok)
+
+
+def _capped(value: Any, max_items: int, max_str: int) -> Any:
+    if isinstance(value, str):
+        if len(value) > max_str:
+            return value[:max_str] + f"… (+{len(value) - max_str} chars)"
+        return value
+    if isinstance(value, dict):
+        items = list(value.items())
+        out = {str(k): _capped(v, max_items, max_str) for k, v in items[:max_items]}
+        if len(items) > max_items:
+            out["…"] = f"+{len(items) - max_items} more keys"
+        return out
+    if isinstance(value, (list, tuple)):
+        out_list = [_capped(v, max_items, max_str) for v in value[:max_items]]
+        if len(value) > max_items:
+            out_list.append(f"… +{len(value) - max_items} more items")
+        return out_list
+    return value
+
+
+def render_event(ev: HistoryEvent, max_items: int = 50, max_str: int = 2000, max_chars: int = 20_000) -> str:
+    """
+    Event as indented JSON for the details pane, with large payloads cut down:
+    at most max_items per list/dict, max_str per string and max_chars overall.
+    """
+    text = json.dumps(_capped(asdict(ev), max_items, max_str), indent=2, ensure_ascii=False, default=str)
+    if len(text) > max_chars:
+        text = text[:max_chars] + f"\n… (truncated, {len(text) - max_chars} more chars)"
+    return text
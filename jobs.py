@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from tools import CancelledError, Result, RunContext, ToolError
+from tools.progress import ProgressEvent
+
+log = logging.getLogger("automation_hub")
+
+# Job states, in the order a job moves through them.
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+@dataclass
+class Job:
+    id: int
+    title: str
+    ctx: RunContext = field(default_factory=RunContext)
+    status: str = QUEUED
+    started: float | None = None
+    finished: float | None = None
+    result: Result | None = None
+    progress: ProgressEvent | None = None  # latest (already throttled) event from the tool
+    future: Future | None = field(default=None, repr=False)
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+
+class JobRunner:
+    """
+    Runs tool work on a background pool and hands results back to one
+    consumer thread (the Tk main loop).
+    - submit() returns immediately; fn(ctx) runs on a worker thread
+    - worker threads never touch the UI: they call post(), and the consumer
+      drains those callbacks with poll() (e.g. from Tk's after() loop)
+    - cancel() sets the job's CancelToken; tools stop cooperatively
+    - progress events only update job.progress and bump version; the UI
+      picks them up on its next poll, so a chatty tool can't flood Tk
+    """
+
+    def __init__(self, max_workers: int = 4, keep_finished: int = 20):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._jobs: dict[int, Job] = {}
+        self._keep_finished = keep_finished
+        self._inbox: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+        self.version = 0  # bumped on every state change, so the UI only redraws when needed
+
+    def post(self, callback: Callable[[], None]) -> None:
+        """Queue a callback to run on the consumer thread (safe from any thread)."""
+        self._inbox.put(callback)
+
+    def poll(self, max_items: int = 200) -> None:
+        """Run queued callbacks; call this from the consumer thread only."""
+        for _ in range(max_items):
+            try:
+                callback = self._inbox.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                callback()
+            except Exception as e:
+                log.exception("Job callback failed: %s", e)
+
+    def submit(
+        self,
+        title: str,
+        fn: Callable[[RunContext], Result],
+        on_done: Callable[[Job], None] | None = None,
+    ) -> Job:
+        job = Job(id=next(self._ids), title=title)
+        job.ctx = RunContext(progress=lambda ev: self._set(job, progress=ev))
+        with self._lock:
+            self._jobs[job.id] = job
+            self.version += 1
+
+        def work() -> None:
+            self._set(job, status=RUNNING, started=time.time())
+            try:
+                job.ctx.check()
+                result = fn(job.ctx)
+                status = DONE if result.ok else FAILED
+            except CancelledError:
+                result, status = Result(False, "Cancelled.", {}), CANCELLED
+            except ToolError as e:
+                result, status = Result(False, str(e), {}), FAILED
+            except Exception as e:
+                log.exception("Job crashed: %s job=%s", e, title)
+                result, status = Result(False, f"Tool crashed: {e}", {}), FAILED
+            self._set(job, status=status, finished=time.time(), result=result)
+            if on_done is not None:
+                self.post(lambda: on_done(job))
+
+        job.future = self._pool.submit(work)
+        return job
+
+    def _set(self, job: Job, **changes: Any) -> None:
+        with self._lock:
+            for k, v in changes.items():
+                setattr(job, k, v)
+            self.version += 1
+            finished = [j for j in self._jobs.values() if not j.active]
+            for old in finished[: max(0, len(finished) - self._keep_finished)]:
+                del self._jobs[old.id]
+
+    def cancel(self, job_id: int) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None and job.active:
+            job.ctx.cancel.cancel()
+
+    def jobs(self) -> list[Job]:
+        """Active jobs first (oldest first), then recently finished ones (newest first)."""
+        with self._lock:
+            items = list(self._jobs.values())
+        active = [j for j in items if j.active]
+        finished = sorted((j for j in items if not j.active), key=lambda j: j.id, reverse=True)
+        return active + finished
+
+    def shutdown(self) -> None:
+        for job in self.jobs():
+            if job.active:
+                job.ctx.cancel.cancel()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import random
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from tools import Result, RunContext
+from tools.batch import run_tool_safely
+from tools.registry import ToolRegistry
+from history import SqliteHistoryStore
+from core import SCHEDULE_PATH, AppConfig, record, safe_params
+
+log = logging.getLogger("automation_hub")
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_interval(text: str | float | int) -> float:
+    """Seconds from "90", "30m", "6h", "1d" or "1h30m"."""
+    if isinstance(text, (int, float)):
+        seconds = float(text)
+    else:
+        s = str(text).strip().lower().replace(" ", "")
+        seconds, number = 0.0, ""
+        for ch in s:
+            if ch.isdigit() or ch == ".":
+                number += ch
+            elif ch in _UNITS and number:
+                seconds += float(number) * _UNITS[ch]
+                number = ""
+            else:
+                raise ValueError(f"Invalid interval: {text!r}")
+        if number:
+            seconds += float(number)
+    if seconds <= 0:
+        raise ValueError(f"Interval must be positive: {text!r}")
+    return seconds
+
+
+def next_at(hhmm: str, now: float | None = None) -> float:
+    """Next local time-of-day "HH:MM" after now (for "nightly at 02:00")."""
+    hours, _, minutes = hhmm.partition(":")
+    now = time.time() if now is None else now
+    lt = time.localtime(now)
+    target = time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday, int(hours), int(minutes or 0), 0, 0, 0, -1))
+    return target if target > now else target + 86400
+
+
+def format_interval(seconds: float) -> str:
+    for unit in ("w", "d", "h", "m"):
+        if seconds >= _UNITS[unit] and seconds % _UNITS[unit] == 0:
+            return f"{int(seconds // _UNITS[unit])}{unit}"
+    return f"{seconds:g}s"
+
+
+@dataclass(frozen=True)
+class Schedule:
+    id: int
+    name: str
+    tool: str
+    params: dict[str, Any]
+    interval: float              # seconds between slots
+    jitter: float                # each run starts up to this many seconds after its slot
+    enabled: bool
+    catch_up: bool               # after downtime: run once right away (True) or wait for the next slot
+    next_slot: float             # epoch seconds, on the cadence
+    next_run: float              # next_slot + jitter
+    last_run: float | None = None
+    last_ok: bool | None = None
+    last_message: str = ""
+    lease_owner: str | None = None
+    lease_until: float | None = None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    name         TEXT    NOT NULL,
+    tool         TEXT    NOT NULL,
+    params       TEXT    NOT NULL,
+    interval     REAL    NOT NULL,
+    jitter       REAL    NOT NULL DEFAULT 0,
+    enabled      INTEGER NOT NULL DEFAULT 1,
+    catch_up     INTEGER NOT NULL DEFAULT 1,
+    next_slot    REAL    NOT NULL,
+    next_run     REAL    NOT NULL,
+    last_run     REAL,
+    last_ok      INTEGER,
+    last_message TEXT    NOT NULL DEFAULT '',
+    lease_owner  TEXT,
+    lease_until  REAL
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_due ON schedules(enabled, next_run);
+"""
+
+_COLUMNS = (
+    "id, name, tool, params, interval, jitter, enabled, catch_up, next_slot, next_run, "
+    "last_run, last_ok, last_message, lease_owner, lease_until"
+)
+
+
+class ScheduleStore:
+    """
+    Recurring jobs in a SQLite file (WAL), shared by the GUI and the daemon.
+    - a run is claimed with a lease (owner + expiry) in a single UPDATE, so two
+      processes never start the same schedule; a crashed owner's lease expires
+    - after a run the next slot keeps the original cadence and skips slots
+      that are already in the past (missed runs are coalesced into one)
+    """
+
+    def __init__(self, path: Path, rng: Callable[[], float] = random.random):
+        self.path = path
+        self._rng = rng
+        self._lock = threading.RLock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @staticmethod
+    def _schedule(row: tuple[Any, ...]) -> Schedule:
+        (id_, name, tool, params, interval, jitter, enabled, catch_up, next_slot, next_run,
+         last_run, last_ok, last_message, lease_owner, lease_until) = row
+        return Schedule(
+            id=id_,
+            name=name,
+            tool=tool,
+            params=json.loads(params or "{}"),
+            interval=interval,
+            jitter=jitter,
+            enabled=bool(enabled),
+            catch_up=bool(catch_up),
+            next_slot=next_slot,
+            next_run=next_run,
+            last_run=last_run,
+            last_ok=None if last_ok is None else bool(last_ok),
+            last_message=last_message or "",
+            lease_owner=lease_owner,
+            lease_until=lease_until,
+        )
+
+    def _jittered(self, slot: float, jitter: float) -> float:
+        return slot + self._rng() * jitter if jitter > 0 else slot
+
+    @staticmethod
+    def _following_slot(slot: float, interval: float, now: float) -> float:
+        """First slot on the cadence that is after now."""
+        if slot > now:
+            return slot
+        missed = int((now - slot) // interval) + 1
+        return slot + missed * interval
+
+    # ---- editing ----
+
+    def add(
+        self,
+        name: str,
+        tool: str,
+        params: dict[str, Any],
+        interval: float,
+        jitter: float = 0,
+        first_run: float | None = None,
+        catch_up: bool = True,
+    ) -> int:
+        slot = time.time() if first_run is None else first_run
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO schedules (name, tool, params, interval, jitter, catch_up, next_slot, next_run)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    name,
+                    tool,
+                    json.dumps(params, ensure_ascii=False),
+                    float(interval),
+                    max(0.0, float(jitter)),
+                    int(catch_up),
+                    slot,
+                    self._jittered(slot, jitter),
+                ),
+            )
+        return int(cur.lastrowid)
+
+    def schedules(self) -> list[Schedule]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLUMNS} FROM schedules ORDER BY next_run").fetchall()
+        return [self._schedule(r) for r in rows]
+
+    def get(self, schedule_id: int) -> Schedule | None:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
+        return self._schedule(row) if row else None
+
+    def remove(self, schedule_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM schedules WHERE id = ?", (schedule_id,))
+
+    def set_enabled(self, schedule_id: int, enabled: bool) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE schedules SET enabled = ? WHERE id = ?", (int(enabled), schedule_id))
+
+    def run_now(self, schedule_id: int) -> None:
+        """Make a schedule due immediately (its cadence is kept)."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE schedules SET next_run = ? WHERE id = ?", (time.time(), schedule_id))
+
+    # ---- running ----
+
+    def skip_missed(self, now: float) -> None:
+        """For schedules with catch_up off, move overdue runs to their next future slot."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM schedules WHERE catch_up = 0 AND next_run < ? AND lease_owner IS NULL",
+                (now,),
+            ).fetchall()
+            with self._conn:
+                for s in map(self._schedule, rows):
+                    slot = self._following_slot(s.next_slot, s.interval, now)
+                    self._conn.execute(
+                        "UPDATE schedules SET next_slot = ?, next_run = ? WHERE id = ?",
+                        (slot, self._jittered(slot, s.jitter), s.id),
+                    )
+
+    def due(self, now: float, limit: int = 50) -> list[Schedule]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM schedules WHERE enabled = 1 AND next_run <= ?"
+                " AND (lease_until IS NULL OR lease_until < ?) ORDER BY next_run LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+        return [self._schedule(r) for r in rows]
+
+    def claim(self, schedule_id: int, owner: str, now: float, lease: float) -> bool:
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "UPDATE schedules SET lease_owner = ?, lease_until = ?"
+                " WHERE id = ? AND enabled = 1 AND next_run <= ? AND (lease_until IS NULL OR lease_until < ?)",
+                (owner, now + lease, schedule_id, now, now),
+            )
+        return cur.rowcount == 1
+
+    def renew(self, schedule_ids: list[int], owner: str, until: float) -> None:
+        if not schedule_ids:
+            return
+        marks = ",".join("?" * len(schedule_ids))
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE schedules SET lease_until = ? WHERE lease_owner = ? AND id IN ({marks})",
+                (until, owner, *schedule_ids),
+            )
+
+    def release(self, schedule_id: int, owner: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE schedules SET lease_owner = NULL, lease_until = NULL WHERE id = ? AND lease_owner = ?",
+                (schedule_id, owner),
+            )
+
+    def finish(self, schedule_id: int, owner: str, ok: bool, message: str, now: float) -> None:
+        """Record the outcome, release the lease and move to the next slot after now."""
+        with self._lock:
+            s = self.get(schedule_id)
+            if s is None:
+                return  # removed while running
+            slot = self._following_slot(s.next_slot, s.interval, now)
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE schedules SET last_run = ?, last_ok = ?, last_message = ?, next_slot = ?, next_run = ?,"
+                    " lease_owner = NULL, lease_until = NULL WHERE id = ? AND lease_owner = ?",
+                    (now, int(ok), message[:500], slot, self._jittered(slot, s.jitter), schedule_id, owner),
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class Scheduler:
+    """
+    Runs due schedules on a bounded pool; used by the GUI and by `cli.py daemon`.
+    - at most max_workers runs at once, and per_tool[tool] (default_per_tool
+      otherwise) runs of the same tool
+    - overdue schedules run once on start (catch_up), or skip to the next slot
+    - each outcome is written to history as "<tool> (scheduled)"
+    - leases are renewed while a run is in progress, so if this process dies
+      another one can pick the schedule up after lease seconds
+    """
+
+    def __init__(
+        self,
+        store: ScheduleStore,
+        tools: ToolRegistry,
+        history: SqliteHistoryStore | None = None,
+        max_workers: int = 2,
+        per_tool: dict[str, int] | None = None,
+        default_per_tool: int = 1,
+        lease: float = 120,
+        tick: float = 1.0,
+        on_finish: Callable[[Schedule, Result], None] | None = None,
+        clock: Callable[[], float] = time.time,
+        defaults: dict[str, dict[str, Any]] | None = None,
+    ):
+        self.store = store
+        self.tools = tools
+        self.history = history
+        self.max_workers = max(1, max_workers)
+        self.per_tool = dict(per_tool or {})
+        self.default_per_tool = max(1, default_per_tool)
+        self.lease = lease
+        self.tick_interval = tick
+        self.on_finish = on_finish
+        self._clock = clock
+        # Per-tool params a schedule doesn't set itself (e.g. Web Downloader's out_dir).
+        self.defaults = {k: dict(v) for k, v in (defaults or {}).items()}
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="schedule")
+        self._lock = threading.Lock()
+        self._running: dict[int, tuple[str, RunContext]] = {}  # schedule id -> (tool, ctx)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._renewed_at = 0.0
+
+    def _limit(self, tool: str) -> int:
+        return max(1, int(self.per_tool.get(tool, self.default_per_tool)))
+
+    def running(self) -> list[int]:
+        with self._lock:
+            return list(self._running)
+
+    def tick(self, due_by: float | None = None) -> list[int]:
+        """
+        Start whatever is due (by due_by, default now) and allowed to run;
+        returns the schedule ids started. Also renews the leases of running ones.
+        """
+        now = self._clock()
+        started: list[int] = []
+        with self._lock:
+            if now - self._renewed_at >= self.lease / 4:
+                self.store.renew(list(self._running), self.owner, now + self.lease)
+                self._renewed_at = now
+            free = self.max_workers - len(self._running)
+            if free <= 0:
+                return started
+            per_tool: dict[str, int] = {}
+            for tool, _ctx in self._running.values():
+                per_tool[tool] = per_tool.get(tool, 0) + 1
+
+            for s in self.store.due(now if due_by is None else min(now, due_by)):
+                if free <= 0:
+                    break
+                if s.id in self._running or per_tool.get(s.tool, 0) >= self._limit(s.tool):
+                    continue
+                if not self.store.claim(s.id, self.owner, now, self.lease):
+                    continue  # another process got it
+                ctx = RunContext()
+                self._running[s.id] = (s.tool, ctx)
+                per_tool[s.tool] = per_tool.get(s.tool, 0) + 1
+                free -= 1
+                started.append(s.id)
+                self._pool.submit(self._run, s, ctx)
+        return started
+
+    def _run(self, s: Schedule, ctx: RunContext) -> None:
+        log.info("Scheduled run: %s (%s)", s.name, s.tool)
+        try:
+            tool = self.tools.get(s.tool)
+            if tool is None:
+                result: Result | None = Result(False, f"Unknown tool: {s.tool}", {})
+            else:
+                result = run_tool_safely(tool, {**self.defaults.get(s.tool, {}), **s.params}, ctx)
+            if result is None:
+                # Stopped with the process: leave the slot due so it runs again on restart.
+                self.store.release(s.id, self.owner)
+                return
+
+            self.store.finish(s.id, self.owner, result.ok, result.message, self._clock())
+            if self.history is not None:
+                record(self.history, f"{s.tool} (scheduled)", safe_params(s.tool, s.params), result)
+            if self.on_finish is not None:
+                self.on_finish(s, result)
+        except Exception as e:
+            log.exception("Scheduled run crashed: %s schedule=%s", e, s.name)
+        finally:
+            with self._lock:
+                self._running.pop(s.id, None)
+
+    def run_due(self, poll: float = 0.2) -> None:
+        """
+        Run everything that is due now, as the limits allow, and return once it
+        has all finished (`cli.py daemon --once`). Leases are renewed while
+        waiting; schedules that only become due meanwhile are left for later.
+        """
+        cutoff = self._clock()
+        while True:
+            self.tick(due_by=cutoff)
+            if not self.running() and not self.store.due(cutoff):
+                return
+            time.sleep(poll)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                log.exception("Scheduler tick failed: %s", e)
+            # Spread ticks a little so several processes don't poll in lockstep.
+            self._stop.wait(self.tick_interval * (0.8 + 0.4 * random.random()))
+
+    def start(self) -> None:
+        self.store.skip_missed(self._clock())
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop starting new runs and cancel the ones in progress."""
+        self._stop.set()
+        with self._lock:
+            for _tool, ctx in self._running.values():
+                ctx.cancel.cancel()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def build_scheduler(
+    config: AppConfig,
+    tools: ToolRegistry,
+    history: SqliteHistoryStore | None,
+    on_finish: Callable[[Schedule, Result], None] | None = None,
+) -> Scheduler:
+    """Scheduler over the shared schedule.db, with limits from config.json's "scheduler" section."""
+    cfg = config.scheduler
+    store = ScheduleStore(SCHEDULE_PATH)
+    # Same default as the GUI and `cli.py run`, so a daemon's cwd never decides where files go.
+    defaults = {"Web Downloader": {"out_dir": config.download_folder}}
+    try:
+        return Scheduler(
+            store,
+            tools,
+            history,
+            max_workers=int(cfg.get("workers", 2)),
+            per_tool={str(k): int(v) for k, v in (cfg.get("per_tool") or {}).items()},
+            default_per_tool=int(cfg.get("default_per_tool", 1)),
+            lease=float(cfg.get("lease", 120)),
+            on_finish=on_finish,
+            defaults=defaults,
+        )
+    except (AttributeError, TypeError, ValueError) as e:
+        log.warning("Invalid scheduler settings in config.json, using defaults: %s", e)
+        return Scheduler(store, tools, history, on_finish=on_finish, defaults=defaults)
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from tools.batch import BatchRunner, read_inputs
+from tools.errors import ValidationError
+from tools.types import Result
+
+
+class EchoTool:
+    description = "test tool"
+
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def run(self, params, ctx=None):
+        self.calls.append(params["url"])
+        if "bad" in params["url"]:
+            raise ValidationError("bad input")
+        return Result(True, f"done {params['url']}", {"mode": params.get("mode")})
+
+
+def test_read_inputs_skips_blanks_comments_and_duplicates(tmp_path: Path):
+    f = tmp_path / "urls.txt"
+    f.write_text("# list\nhttps://a\n\nhttps://b\nhttps://a\n", encoding="utf-8")
+    assert read_inputs(f) == ["https://a", "https://b"]
+
+
+def test_batch_writes_report_and_resumes(tmp_path: Path):
+    report = tmp_path / "report.jsonl"
+    inputs = ["https://a", "https://bad", "https://c"]
+
+    tool = EchoTool()
+    streamed: list[str] = []
+    summary = BatchRunner(tool, "Echo", "url", {"mode": "links"}, workers=2).run(
+        inputs, report, lambda item, _res: streamed.append(item)
+    )
+
+    assert (summary.ok, summary.failed, summary.skipped) == (2, 1, 0)
+    assert sorted(streamed) == sorted(inputs)
+    records = [json.loads(line) for line in report.read_text(encoding="utf-8").splitlines()]
+    assert {r["input"]: r["ok"] for r in records} == {"https://a": True, "https://bad": False, "https://c": True}
+    assert all(r["data"] == {"mode": "links"} for r in records if r["ok"])
+
+    rerun = EchoTool()
+    summary = BatchRunner(rerun, "Echo", "url", workers=2).run(inputs, report)
+
+    assert rerun.calls == ["https://bad"]
+    assert summary.skipped == 2
+
+
+def test_batch_reports_only_item_progress_and_shares_cancel(tmp_path: Path):
+    from tools.types import RunContext
+
+    class StagedTool:
+        description = "reports its own stages"
+
+        def run(self, params, ctx=None):
+            ctx.reporter("links", total=3).finish()
+            if params["url"] == "https://stop":
+                ctx.cancel.cancel()
+            return Result(True, "ok", {})
+
+    events = []
+    ctx = RunContext(progress=events.append)
+    BatchRunner(StagedTool(), "Staged", "url", workers=1).run(["https://a", "https://stop"], tmp_path / "r.jsonl", ctx=ctx)
+
+    assert events and {e.stage for e in events} == {"items"}
+    assert ctx.cancelled
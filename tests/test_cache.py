@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from tools.cache import PersistentTTLCache
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = PersistentTTLCache(tmp_path / "c.json", ttl=60, max_items=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest use
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_cache_expires_and_persists(tmp_path: Path, monkeypatch):
+    import time
+
+    path = tmp_path / "c.json"
+    cache = PersistentTTLCache(path, ttl=10)
+    cache.put("k", "v")
+    cache.save()
+
+    reloaded = PersistentTTLCache(path, ttl=10)
+    assert reloaded.get("k") == "v"
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert reloaded.get("k") is None
+
+
+def test_concurrent_saves_keep_a_valid_complete_file(tmp_path: Path):
+    import threading
+
+    path = tmp_path / "cache.json"
+    cache = PersistentTTLCache(path, ttl=60)
+    errors: list[Exception] = []
+
+    def worker(i: int) -> None:
+        try:
+            for k in range(10):
+                cache.put(f"{i}-{k}", k)
+                cache.save()
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(PersistentTTLCache(path, ttl=60)) == 200
+    assert list(tmp_path.iterdir()) == [path]
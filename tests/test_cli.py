@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import cli
+from history import SqliteHistoryStore
+from tools import Result, ValidationError
+from tools.registry import ToolRegistry
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class EchoTool:
+    description = "echo"
+
+    def run(self, params, ctx=None):
+        if params.get("fail"):
+            raise ValidationError("bad input")
+        return Result(True, "echoed", {"params": params})
+
+
+@pytest.fixture
+def fake_env(monkeypatch, tmp_path: Path) -> SqliteHistoryStore:
+    reg = ToolRegistry()
+    reg.register("Link Checker", EchoTool)
+    monkeypatch.setattr(cli, "build_registry", lambda config: reg)
+    db = tmp_path / "history.db"
+    monkeypatch.setattr(cli, "open_history", lambda: SqliteHistoryStore(db))
+    monkeypatch.setattr(cli, "setup_logging", lambda stream=None: None)
+    return SqliteHistoryStore(db)
+
+
+def test_build_params_merges_json_and_pairs(tmp_path: Path):
+    f = tmp_path / "p.json"
+    f.write_text('{"url": "https://a.com", "max_pages": 5}', encoding="utf-8")
+
+    params = cli.build_params(f"@{f}", ["max_pages=10", "crawl=true", "mode=html only"])
+
+    assert params == {"url": "https://a.com", "max_pages": 10, "crawl": True, "mode": "html only"}
+    with pytest.raises(ValueError):
+        cli.build_params("[1, 2]", [])
+    with pytest.raises(ValueError):
+        cli.build_params(None, ["novalue"])
+
+
+def test_resolve_tool_name_is_forgiving():
+    names = ["Link Checker", "Web Downloader"]
+
+    assert cli.resolve_tool_name(names, "link-checker") == "Link Checker"
+    assert cli.resolve_tool_name(names, "WEB_DOWNLOADER") == "Web Downloader"
+    assert cli.resolve_tool_name(names, "nope") is None
+
+
+def test_run_prints_result_json_and_records_history(fake_env, capsys):
+    code = cli.main(["run", "link-checker", "-p", "url=https://a.com", "-p", "secret=x"])
+
+    out = json.loads(capsys.readouterr().out)
+    assert code == cli.EXIT_OK
+    assert out["tool"] == "Link Checker" and out["ok"] is True
+    assert out["data"]["params"]["url"] == "https://a.com"
+    (ev,) = fake_env.query()
+    assert ev.tool == "Link Checker" and ev.params == {"url": "https://a.com"}  # safe_params applied
+
+
+def test_failed_run_exits_nonzero(fake_env, capsys):
+    code = cli.main(["run", "Link Checker", "--json", '{"fail": true}', "--no-history"])
+
+    out = json.loads(capsys.readouterr().out)
+    assert code == cli.EXIT_FAILED
+    assert out == {"tool": "Link Checker", "ok": False, "message": "bad input", "data": {}}
+    assert fake_env.count() == 0
+
+
+def test_unknown_tool_is_usage_error(fake_env, capsys):
+    assert cli.main(["run", "nope"]) == cli.EXIT_USAGE
+    assert "Available: Link Checker" in capsys.readouterr().err
+
+
+def test_cli_never_imports_tk(tmp_path: Path):
+    code = (
+        "import runpy, sys; sys.argv = ['cli.py', 'list']\n"
+        "try:\n    runpy.run_path('cli.py', run_name='__main__')\n"
+        "except SystemExit:\n    pass\n"
+        "print('tkinter' in sys.modules, 'requests' in sys.modules)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        env={"XDG_DATA_HOME": str(tmp_path), "APPDATA": str(tmp_path), "HOME": str(tmp_path), "PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.split()[-2:] == ["False", "False"]
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from history import HistoryEvent, HistoryPager, HistoryStore, SqliteHistoryStore, render_event
+
+
+def _event(i: int) -> HistoryEvent:
+    return HistoryEvent(time=f"2026-01-01 00:00:{i:02d}", tool="Weather", params={"city": str(i)}, ok=True, message=str(i), data={})
+
+
+def test_append_is_one_line_and_compacts(tmp_path: Path):
+    store = HistoryStore(tmp_path / "history.jsonl", max_items=3)
+    for i in range(5):
+        store.append(_event(i))
+
+    # 6 lines would trigger compaction; 5 are still appended as-is
+    assert len((tmp_path / "history.jsonl").read_text(encoding="utf-8").splitlines()) == 5
+    assert [e.message for e in store.load()] == ["2", "3", "4"]
+
+    store.append(_event(5))
+    assert len((tmp_path / "history.jsonl").read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_migrates_legacy_json_and_skips_torn_lines(tmp_path: Path):
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps([{"time": "t0", "tool": "Weather", "ok": True, "message": "old"}]), encoding="utf-8")
+
+    store = HistoryStore(tmp_path / "history.jsonl", legacy_path=legacy)
+    store.append(_event(1))
+    with (tmp_path / "history.jsonl").open("a", encoding="utf-8") as f:
+        f.write('{"time": "broken')
+
+    assert [e.message for e in store.load()] == ["old", "1"]
+    assert not legacy.exists()
+    assert (tmp_path / "history.json.migrated").exists()
+
+
+def test_delete_at_display_index_removes_newest_first(tmp_path: Path):
+    store = HistoryStore(tmp_path / "history.jsonl")
+    for i in range(3):
+        store.append(_event(i))
+
+    store.delete_at_display_index(0)
+    assert [e.message for e in store.load()] == ["0", "1"]
+
+
+def test_append_after_torn_line_starts_on_new_line(tmp_path: Path):
+    path = tmp_path / "history.jsonl"
+    path.write_text('{"time": "t", "tool": "Weather", "ok": true, "message": "a"}\n{"time": "bro', encoding="utf-8")
+
+    HistoryStore(path).append(_event(1))
+
+    assert [e.message for e in HistoryStore(path).load()] == ["a", "1"]
+
+
+def test_sqlite_query_filters_and_keyset_pages(tmp_path: Path):
+    store = SqliteHistoryStore(tmp_path / "history.db")
+    for i in range(10):
+        store.append(
+            HistoryEvent(
+                time=f"2026-01-{i + 1:02d} 10:00:00",
+                tool="Weather" if i % 2 else "Link Checker",
+                params={"i": i},
+                ok=i != 3,
+                message=f"run {i}" + (" paris" if i == 7 else ""),
+                data={},
+            )
+        )
+
+    first = store.query(limit=4)
+    assert [e.params["i"] for e in first] == [9, 8, 7, 6]
+    second = store.query(limit=4, before_id=first[-1].id)
+    assert [e.params["i"] for e in second] == [5, 4, 3, 2]
+
+    assert [e.params["i"] for e in store.query(tool="Weather", limit=3)] == [9, 7, 5]
+    assert [e.params["i"] for e in store.query(ok=False)] == [3]
+    assert [e.params["i"] for e in store.query(since="2026-01-04", until="2026-01-05 23:59:59")] == [4, 3]
+    assert [e.params["i"] for e in store.query(text="PARIS")] == [7]
+    assert store.count(tool="Link Checker") == 5
+
+    store.delete(first[0].id)
+    assert store.get(first[0].id) is None
+    assert store.count() == 9
+
+
+def test_sqlite_migrates_jsonl_and_prunes(tmp_path: Path):
+    jsonl = HistoryStore(tmp_path / "history.jsonl")
+    for i in range(3):
+        jsonl.append(_event(i))
+
+    store = SqliteHistoryStore(tmp_path / "history.db", max_items=2, migrate_from=HistoryStore(tmp_path / "history.jsonl"))
+    assert store.count() == 3
+    assert (tmp_path / "history.jsonl.migrated").exists()
+
+    store.prune()
+    assert store.count() == 2
+    assert [e.message for e in store.load()] == ["1", "2"]
+
+
+def test_pager_loads_pages_filters_and_removes(tmp_path: Path):
+    store = SqliteHistoryStore(tmp_path / "history.db")
+    for i in range(25):
+        ev = _event(i)
+        store.append(HistoryEvent(ev.time, "Link Checker" if i % 2 else "Weather", ev.params, i % 5 != 0, f"run {i}\nmore", {"big": "x" * 10_000}))
+
+    pager = HistoryPager(store, page_size=10)
+    first = pager.set_filter()
+    assert [r.summary for r in first[:2]] == ["run 24", "run 23"]
+    pager.load_more()
+    assert len(pager.load_more()) == 5 and not pager.has_more and pager.load_more() == []
+
+    failed_checks = pager.set_filter(tool="Link Checker", ok=False)
+    assert [r.summary for r in failed_checks] == ["run 15", "run 5"] and pager.total() == 2
+
+    assert pager.remove(failed_checks[0].id) == 0 and len(pager.rows) == 1
+    assert pager.remove(-1) is None
+
+
+def test_render_event_caps_large_payloads():
+    ev = HistoryEvent("t", "Link Checker", {}, True, "m", {"links": [f"u{i}" for i in range(500)], "html": "y" * 50_000})
+
+    text = render_event(ev, max_items=20, max_str=100)
+
+    assert "+480 more items" in text and "(+49900 chars)" in text
+    assert len(text) < 2_000
+    assert len(render_event(ev, max_items=1000, max_str=100_000, max_chars=5000)) < 5100
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import pytest
+
+from tools import html_extract
+
+PAGE = """
+<html><head><base href="https://cdn.example.com/root/"></head>
+<body>
+  <a href="/a">A</a><a name="anchor-only">x</a>
+  <A HREF="b.html">B</A>
+  <img src="logo.png" srcset="logo-1x.png 1x, logo-2x.png 2x">
+  <picture><source srcset="hero.webp 800w"><img src="hero.jpg"/></picture>
+</body></html>
+"""
+
+
+@pytest.mark.parametrize("backend", html_extract.available_backends())
+def test_extract_collects_refs_in_one_pass(backend):
+    refs = html_extract.extract(PAGE, backend)
+
+    assert refs.base_href == "https://cdn.example.com/root/"
+    assert refs.hrefs == ["/a", "b.html"]
+    assert refs.anchors == 3
+    assert refs.images == ["logo.png", "hero.jpg"]
+    assert refs.srcset == ["logo-1x.png", "logo-2x.png", "hero.webp"]
+
+
+@pytest.mark.parametrize("backend", html_extract.available_backends())
+def test_extract_accepts_chunked_feed(backend):
+    ex = html_extract.make_extractor(backend)
+    for i in range(0, len(PAGE), 7):
+        ex.feed(PAGE[i : i + 7])
+    refs = ex.close()
+
+    assert refs.hrefs == ["/a", "b.html"]
+    assert refs.images == ["logo.png", "hero.jpg"]
+
+
+def test_unknown_backend_falls_back_to_stdlib():
+    refs = html_extract.extract("<a href='x'>x</a>", "no-such-parser")
+    assert refs.hrefs == ["x"]
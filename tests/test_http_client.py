@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from tools import http_client
+from tools.http_client import HttpSettings, PooledSession
+
+
+def test_settings_from_dict_and_per_host_pools():
+    settings = HttpSettings.from_dict({"pool_maxsize": 4, "host_pool_sizes": {"CDN.example.com": 32}})
+    session = PooledSession(settings)
+
+    assert session.headers["User-Agent"] == http_client.DEFAULT_USER_AGENT
+    assert session.get_adapter("https://cdn.example.com/img.png")._pool_maxsize == 32
+    assert session.get_adapter("https://example.com/")._pool_maxsize == 4
+
+
+def test_default_timeout_applied(monkeypatch):
+    seen: dict = {}
+
+    def fake_request(self, method, url, **kwargs):
+        seen.update(kwargs)
+        resp = requests.Response()
+        resp.status_code = 200
+        return resp
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    session = PooledSession(HttpSettings(timeout=3))
+
+    session.get("https://example.com")
+    assert seen["timeout"] == 3
+
+    session.get("https://example.com", timeout=9)
+    assert seen["timeout"] == 9
+
+
+def test_get_session_is_shared_until_reconfigured():
+    first = http_client.get_session()
+    assert http_client.get_session() is first
+
+    http_client.configure(HttpSettings(pool_maxsize=2))
+    try:
+        assert http_client.get_session() is not first
+    finally:
+        http_client.configure(HttpSettings())
+
+
+def test_429_slows_the_host_and_is_retried(monkeypatch):
+    statuses = [429, 200]
+    pauses: list[float] = []
+
+    def fake_request(self, method, url, **kwargs):
+        resp = requests.Response()
+        resp.status_code = statuses.pop(0)
+        resp.raw = io.BytesIO(b"")
+        if resp.status_code == 429:
+            resp.headers["Retry-After"] = "3"
+        return resp
+
+    monkeypatch.setattr(requests.Session, "request", fake_request)
+    session = PooledSession(HttpSettings.from_dict({"rate_limit": {"rate": 4}}))
+    session.limiter._sleep = pauses.append
+
+    assert session.get("https://api.example.com/x").status_code == 200
+    assert pauses and 2.9 < sum(pauses) <= 3
+    assert session.limiter.rate("api.example.com") == 2.2  # halved on 429, then +10% on success
+
+
+def test_429_is_left_to_the_limiter_not_urllib3():
+    hits: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "30")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        session = PooledSession(HttpSettings.from_dict({"retries": 2, "rate_limit": {"retries": 1, "max_pause": 0.2}}))
+        started = time.monotonic()
+        resp = session.get(f"http://127.0.0.1:{server.server_port}/x")
+        elapsed = time.monotonic() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert resp.status_code == 429
+    assert len(hits) == 2  # one re-send by request(), none by urllib3
+    assert elapsed < 5  # Retry-After: 30 capped by max_pause
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from jobs import CANCELLED, DONE, FAILED, JobRunner
+from tools import Result, ValidationError
+
+
+def _drain(runner: JobRunner, until, timeout: float = 2.0) -> None:
+    deadline = time.time() + timeout
+    while not until() and time.time() < deadline:
+        runner.poll()
+        time.sleep(0.01)
+
+
+def test_results_are_delivered_through_poll():
+    runner = JobRunner(max_workers=2)
+    done: list[tuple[str, str]] = []
+    worker_threads: list[str] = []
+
+    def ok(_ctx):
+        worker_threads.append(threading.current_thread().name)
+        return Result(True, "fine")
+
+    def bad(_ctx):
+        raise ValidationError("nope")
+
+    runner.submit("ok", ok, lambda job: done.append((job.title, job.status)))
+    runner.submit("bad", bad, lambda job: done.append((job.title, job.status)))
+
+    time.sleep(0.05)
+    assert done == []  # nothing runs on the consumer thread until poll()
+    _drain(runner, lambda: len(done) == 2)
+
+    assert sorted(done) == [("bad", FAILED), ("ok", DONE)]
+    assert worker_threads and worker_threads[0] != threading.current_thread().name
+    runner.shutdown()
+
+
+def test_cancel_stops_cooperative_job():
+    runner = JobRunner(max_workers=1)
+    started = threading.Event()
+    finished: list[str] = []
+
+    def long_scan(ctx):
+        started.set()
+        while True:
+            ctx.check()
+            time.sleep(0.005)
+
+    job = runner.submit("scan", long_scan, lambda j: finished.append(j.status))
+    assert started.wait(1)
+    runner.cancel(job.id)
+    _drain(runner, lambda: bool(finished))
+
+    assert finished == [CANCELLED]
+    assert job.result is not None and job.result.message == "Cancelled."
+    runner.shutdown()
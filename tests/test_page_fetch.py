@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from tools.page_fetch import PageRejected, fetch_page, sniff_encoding
+
+
+class ChunkedResp:
+    def __init__(self, chunks: list[bytes], headers: dict[str, str] | None = None, status_code: int = 200):
+        self.chunks = chunks
+        self.headers = headers if headers is not None else {"Content-Type": "text/html"}
+        self.status_code = status_code
+        self.read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+class OneResponseSession:
+    def __init__(self, resp: ChunkedResp):
+        self.resp = resp
+        self.kwargs: dict = {}
+
+    def get(self, url, **kwargs):
+        self.kwargs = kwargs
+        return self.resp
+
+
+def test_streams_chunks_and_decodes_split_multibyte_characters():
+    html = ("<meta charset='iso-8859-1'>" + " " * 2000 + "<a href='/caf\xe9'>x</a><img src='/a.png'>").encode("latin-1")
+    utf8 = "<a href='/ñandú'>y</a>".encode()
+    resp = ChunkedResp([html[i : i + 7] for i in range(0, len(html), 7)])
+    page = fetch_page(OneResponseSession(resp), "https://e.com", 5, keep_text=True)
+
+    assert page.encoding == "iso8859-1"
+    assert page.refs.hrefs == ["/caf\xe9"] and page.refs.images == ["/a.png"]
+    assert page.size == len(html)
+
+    # A UTF-8 character cut in half between two chunks still decodes.
+    resp = ChunkedResp([utf8[:13], utf8[13:]], {"Content-Type": "text/html; charset=utf-8"})
+    page = fetch_page(OneResponseSession(resp), "https://e.com", 5, keep_text=True)
+    assert page.text == utf8.decode() and page.refs.hrefs == ["/ñandú"]
+
+
+def test_rejects_non_html_and_oversized_bodies_early():
+    pdf = ChunkedResp([b"%PDF"], {"Content-Type": "application/pdf"})
+    with pytest.raises(PageRejected) as e:
+        fetch_page(OneResponseSession(pdf), "https://e.com/a.pdf", 5)
+    assert e.value.reason == "content_type" and pdf.read == 0
+
+    declared = ChunkedResp([b"x"], {"Content-Type": "text/html", "Content-Length": str(10**10)})
+    with pytest.raises(PageRejected):
+        fetch_page(OneResponseSession(declared), "https://e.com/huge", 5, max_bytes=1000)
+    assert declared.read == 0
+
+    endless = ChunkedResp([b"<p>" * 100] * 1000)
+    with pytest.raises(PageRejected) as e:
+        fetch_page(OneResponseSession(endless), "https://e.com/huge", 5, max_bytes=1000)
+    assert e.value.reason == "size" and endless.read == 4
+
+
+def test_sniff_encoding_order():
+    assert sniff_encoding("text/html; charset=\"Shift_JIS\"", b"<meta charset=utf-8>") == "shift_jis"
+    assert sniff_encoding("text/html", b"\xef\xbb\xbf<html>") == "utf-8-sig"
+    assert sniff_encoding("text/html", b"<meta http-equiv='Content-Type' content='text/html; charset=windows-1252'>") == "cp1252"
+    assert sniff_encoding("text/html; charset=bogus", b"") == "utf-8"
+    assert sniff_encoding("text/html", b"<p>caf\xe9</p>") == "iso8859-1"  # charset-less text/*, as requests decoded it
+    assert sniff_encoding("", b"<p>caf\xc3\xa9</p>") == "utf-8"
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from tools.progress import ProgressEvent, ProgressReporter
+
+
+def test_reporter_throttles_and_always_emits_final_event():
+    now = [0.0]
+    events: list[ProgressEvent] = []
+    rep = ProgressReporter(events.append, "links", total=10, min_interval=1.0, clock=lambda: now[0])
+
+    for i in range(10):
+        now[0] = i * 0.25
+        rep.advance(current=f"u{i}")
+    rep.finish()
+
+    # emitted at t=0, 1.0, 2.0 and the final snapshot
+    assert [e.done for e in events] == [1, 5, 9, 10]
+    assert events[-1].current == "u9"
+    assert events[1].eta == 1.0  # 1.0s for 5 items -> 5 remaining take 1.0s
+
+
+def test_reporter_without_callback_is_a_noop():
+    rep = ProgressReporter(None, "images", total=3)
+    rep.advance(bytes=100)
+    rep.finish()
+    assert rep.done == 0
+
+
+def test_describe_is_compact():
+    ev = ProgressEvent("images", 3, 10, bytes=2 * 1024 * 1024, eta=4.2)
+    assert ev.describe() == "3/10 images · 2.0 MB · ETA 4s"
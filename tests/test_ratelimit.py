@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+
+from tools.errors import CancelledError
+from tools.ratelimit import HostRateLimiter, RateSettings, parse_retry_after
+from tools.types import CancelToken
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def make(**settings) -> tuple[HostRateLimiter, FakeClock]:
+    clock = FakeClock()
+    return HostRateLimiter(RateSettings.from_dict(settings), clock=clock, sleep=clock.sleep), clock
+
+
+def test_burst_then_paced_per_host():
+    limiter, clock = make(rate=2, burst=3, host_rates={"Slow.example": 0.5})
+
+    waits = [limiter.reserve("example.com") for _ in range(5)]
+    assert waits == [0, 0, 0, 0.5, 1.0]
+    assert limiter.reserve("other.example") == 0  # buckets are per host
+
+    limiter.acquire("slow.example")
+    limiter.acquire("slow.example")
+    limiter.acquire("slow.example")
+    limiter.acquire("slow.example")
+    assert clock.now == 102.0  # 4th request after the burst of 3 waits 1/0.5 s
+
+
+def test_throttle_pauses_host_and_recovers():
+    limiter, clock = make(rate=4, burst=1, recovery=2)
+
+    assert limiter.throttled("example.com", retry_after=5) == 5
+    assert limiter.rate("example.com") == 2
+    assert limiter.reserve("example.com") == 5  # every caller waits out Retry-After
+
+    limiter.ok("example.com")
+    limiter.ok("example.com")
+    assert limiter.rate("example.com") == 4  # back to, but not above, the configured pace
+
+
+def test_unlimited_host_gets_paced_after_429_and_backoff_doubles():
+    limiter, clock = make(throttled_rate=2, backoff=1, max_pause=3)
+
+    assert limiter.rate("api.example") is None
+    assert limiter.throttled("api.example") == 1
+    assert limiter.rate("api.example") == 2
+    assert limiter.throttled("api.example") == 2
+    assert limiter.throttled("api.example") == 3  # capped by max_pause
+    for _ in range(60):
+        limiter.ok("api.example")
+    assert limiter.rate("api.example") is None
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:30 GMT", now=1445412480) == 30
+
+
+def test_cap_limits_unlimited_and_faster_hosts():
+    limiter, _clock = make(rate=10, host_rates={"fast.example": 50})
+
+    limiter.cap("fast.example", 0.5)  # e.g. robots.txt Crawl-delay: 2
+    limiter.cap("free.example", 0.5)
+    assert limiter.rate("fast.example") == 0.5
+    assert limiter.rate("free.example") == 0.5
+    limiter.ok("fast.example")
+    assert limiter.rate("fast.example") == 0.5
+
+
+def test_crawl_delay_cap_disables_the_burst():
+    limiter, clock = make(rate=8, burst=8)
+
+    limiter.cap("slow.example", 0.1, burst=1)  # Crawl-delay: 10
+    assert [limiter.reserve("slow.example") for _ in range(3)] == [0, 10, 20]
+
+    clock.now += 1000  # idle: no burst builds up again
+    assert [limiter.reserve("slow.example") for _ in range(2)] == [0, 10]
+
+
+def test_acquire_waits_out_the_queue_and_stops_when_cancelled():
+    limiter, clock = make(rate=0.1, burst=1, max_pause=5)
+
+    limiter.acquire("slow.example")
+    limiter.acquire("slow.example")
+    assert clock.now == 110.0  # the full slot, not max_pause
+
+    cancel = CancelToken()
+
+    def sleep_then_cancel(seconds: float) -> None:
+        clock.sleep(seconds)
+        cancel.cancel()
+
+    limiter._sleep = sleep_then_cancel
+    with pytest.raises(CancelledError):
+        limiter.acquire("slow.example", cancel)
+    assert clock.now < 111.0
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from tools.registry import ToolRegistry, lazy
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_tools_are_built_once_on_first_get():
+    built: list[str] = []
+
+    class Dummy:
+        description = "dummy"
+
+        def run(self, params, ctx=None):
+            raise NotImplementedError
+
+    def factory():
+        built.append("x")
+        return Dummy()
+
+    reg = ToolRegistry()
+    reg.register("Dummy", factory)
+
+    assert built == [] and reg.loaded() == [] and "Dummy" in reg
+    assert reg.get("Dummy") is reg.get("Dummy")
+    assert built == ["x"] and reg.loaded() == ["Dummy"]
+    assert reg.get("Missing") is None
+
+
+def test_failing_factory_yields_none():
+    reg = ToolRegistry()
+    reg.register("Broken", lazy("tools.does_not_exist:Nope"))
+
+    assert reg.get("Broken") is None
+
+
+def test_lazy_imports_target_on_call():
+    tool = lazy("tools.quick_search:QuickSearchTool", {"Google": "https://google.com/search?q={q}"})()
+
+    assert type(tool).__name__ == "QuickSearchTool"
+
+
+def _imported_after(code: str, tmp_path: Path) -> set[str]:
+    out = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"],
+        cwd=ROOT,
+        env={"XDG_DATA_HOME": str(tmp_path), "APPDATA": str(tmp_path), "HOME": str(tmp_path), "PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(out.stdout.split())
+
+
+def test_importing_tools_package_is_light(tmp_path: Path):
+    mods = _imported_after("import tools; tools.Result", tmp_path)
+
+    assert "requests" not in mods and "tools.web_downloader" not in mods
+
+
+def test_importing_app_does_not_load_tools(tmp_path: Path):
+    pytest.importorskip("tkinter")
+    mods = _imported_after("import app", tmp_path)
+
+    assert not {"requests", "urllib3", "lxml", "tools.weather", "tools.link_checker"} & mods
+
+
+def test_tool_classes_still_importable_from_package():
+    import tools
+
+    assert tools.WeatherTool.__name__ == "WeatherTool"
+    assert "LinkCheckerTool" in dir(tools)
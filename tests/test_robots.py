@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import gzip
+import io
+
+from tools.robots import parse_robots, parse_sitemap
+
+ROBOTS = """
+# comments and unknown lines are ignored
+User-agent: *
+Disallow: /private/
+Allow: /private/public-page
+Crawl-delay: 1
+
+User-agent: AutomationHub
+User-agent: other-bot
+Disallow: /tmp
+Disallow: /*.pdf$
+Allow: /tmp/ok
+Crawl-delay: 2.5
+
+Sitemap: https://example.com/sitemap.xml
+"""
+
+
+def test_robots_uses_most_specific_group():
+    rules = parse_robots(ROBOTS, "AutomationHub/1.0")
+
+    assert rules.crawl_delay == 2.5
+    assert rules.sitemaps == ("https://example.com/sitemap.xml",)
+    assert rules.allowed("https://example.com/private/x")  # the "*" group doesn't apply to us
+    assert not rules.allowed("https://example.com/tmp/file")
+    assert rules.allowed("https://example.com/tmp/ok/1")  # longer Allow wins
+    assert not rules.allowed("https://example.com/docs/a.pdf")
+    assert rules.allowed("https://example.com/docs/a.pdf?download=1")
+    assert rules.allowed("https://example.com/robots.txt")
+
+
+def test_robots_falls_back_to_wildcard_group_and_round_trips():
+    rules = parse_robots(ROBOTS, "SomethingElse/2")
+
+    assert not rules.allowed("https://example.com/private/x")
+    assert rules.allowed("https://example.com/private/public-page")
+    assert rules.crawl_delay == 1
+    assert type(rules).from_dict(rules.to_dict()) == rules
+    assert parse_robots("").allowed("https://example.com/anything")
+
+
+def test_sitemap_is_parsed_incrementally_gzipped_or_not():
+    ns = "http://www.sitemaps.org/schemas/sitemap/0.9"
+    urlset = f'<urlset xmlns="{ns}">' + "".join(f"<url><loc> https://e.com/{i} </loc></url>" for i in range(3)) + "</urlset>"
+    index = f'<sitemapindex xmlns="{ns}"><sitemap><loc>https://e.com/a.xml.gz</loc></sitemap></sitemapindex>'
+
+    assert list(parse_sitemap(io.BytesIO(gzip.compress(urlset.encode())))) == [
+        ("url", "https://e.com/0"),
+        ("url", "https://e.com/1"),
+        ("url", "https://e.com/2"),
+    ]
+    assert list(parse_sitemap(io.BytesIO(index.encode()))) == [("sitemap", "https://e.com/a.xml.gz")]
+
+
+def test_sitemap_size_cap():
+    import pytest
+
+    big = "<urlset>" + "<url><loc>https://e.com/x</loc></url>" * 1000 + "</urlset>"
+    with pytest.raises(ValueError):
+        list(parse_sitemap(io.BytesIO(big.encode()), max_bytes=1000))
+
+
+def test_robots_agent_must_match_product_token_exactly():
+    text = "User-agent: hub\nDisallow: /\n\nUser-agent: *\nDisallow: /private/\n"
+    rules = parse_robots(text, "AutomationHub/1.0")
+
+    assert rules.allowed("https://example.com/page")
+    assert not rules.allowed("https://example.com/private/x")
+    assert not parse_robots("User-agent: AUTOMATIONHUB\nDisallow: /\n").allowed("https://example.com/x")
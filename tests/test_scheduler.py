@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from history import SqliteHistoryStore
+from scheduler import Scheduler, ScheduleStore, format_interval, parse_interval
+from tools import Result
+from tools.registry import ToolRegistry
+
+
+def test_parse_and_format_interval():
+    assert parse_interval("6h") == 6 * 3600
+    assert parse_interval("1h30m") == 5400
+    assert parse_interval(" 90 ") == 90
+    assert format_interval(86400) == "1d" and format_interval(90) == "90s"
+    for bad in ("", "0", "5x", "h"):
+        with pytest.raises(ValueError):
+            parse_interval(bad)
+
+
+def test_claim_is_exclusive_and_finish_coalesces_missed_slots(tmp_path: Path):
+    store = ScheduleStore(tmp_path / "schedule.db")
+    sid = store.add("links", "Link Checker", {"url": "https://a.com"}, interval=3600, first_run=1000)
+
+    now = 1000 + 5 * 3600 + 10  # five slots missed while nothing was running
+    assert [s.id for s in store.due(now)] == [sid]
+    assert store.claim(sid, "a", now, lease=60)
+    assert not store.claim(sid, "b", now, lease=60)
+    assert store.due(now) == []
+    assert store.claim(sid, "b", now + 61, lease=60)  # a's lease expired
+
+    store.finish(sid, "b", True, "fine", now + 70)
+    s = store.get(sid)
+    assert s.next_slot == 1000 + 6 * 3600 and s.next_run == s.next_slot  # one catch-up run, cadence kept
+    assert s.last_ok is True and s.lease_owner is None
+
+
+def test_skip_missed_and_jitter(tmp_path: Path):
+    store = ScheduleStore(tmp_path / "schedule.db", rng=lambda: 0.5)
+    sid = store.add("nightly", "Web Downloader", {}, interval=86400, jitter=600, first_run=0, catch_up=False)
+    assert store.get(sid).next_run == 300
+
+    store.skip_missed(86400 * 3 + 5)
+
+    s = store.get(sid)
+    assert s.next_slot == 86400 * 4 and s.next_run == 86400 * 4 + 300
+    assert store.due(86400 * 3 + 5) == []
+
+
+class GateTool:
+    """Blocks until released, so tests can look at what is running."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.calls: list[dict] = []
+
+    def run(self, params, ctx=None):
+        self.calls.append(params)
+        while not self.gate.wait(0.01):
+            ctx.check()
+        return Result(True, f"ran {params.get('n')}", {})
+
+
+def _wait_idle(scheduler: Scheduler) -> None:
+    deadline = time.monotonic() + 5
+    while scheduler.running() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_scheduler_limits_per_tool_and_records_history(tmp_path: Path):
+    store = ScheduleStore(tmp_path / "schedule.db")
+    history = SqliteHistoryStore(tmp_path / "history.db")
+    checker, weather = GateTool(), GateTool()
+    tools = ToolRegistry()
+    tools.register("Link Checker", lambda: checker)
+    tools.register("Weather", lambda: weather)
+    for n in range(3):
+        store.add(f"check {n}", "Link Checker", {"url": "https://a.com", "n": n}, interval=3600, first_run=0)
+    store.add("weather", "Weather", {"city": "Oslo"}, interval=3600, first_run=0)
+
+    finished: list[str] = []
+    scheduler = Scheduler(
+        store, tools, history, max_workers=3, per_tool={"Link Checker": 1},
+        on_finish=lambda s, r: finished.append(s.name),
+    )
+    started = scheduler.tick()
+
+    assert len(started) == 2  # one Link Checker (limit) + Weather
+    assert len(scheduler.tick()) == 0
+    checker.gate.set()
+    weather.gate.set()
+    _wait_idle(scheduler)
+    assert len(scheduler.tick()) == 1  # next Link Checker, now that the first one finished
+    _wait_idle(scheduler)
+    scheduler.stop()
+
+    assert sorted(finished) == ["check 0", "check 1", "weather"]
+    tools_seen = sorted(e.tool for e in history.query())
+    assert tools_seen == ["Link Checker (scheduled)", "Link Checker (scheduled)", "Weather (scheduled)"]
+    assert all("n" not in e.params for e in history.query(tool="Link Checker (scheduled)"))  # safe_params
+
+
+def test_stopped_run_stays_due(tmp_path: Path):
+    store = ScheduleStore(tmp_path / "schedule.db")
+    tool = GateTool()
+    tools = ToolRegistry()
+    tools.register("Link Checker", lambda: tool)
+    sid = store.add("links", "Link Checker", {}, interval=3600, first_run=0)
+
+    scheduler = Scheduler(store, tools)
+    assert scheduler.tick() == [sid]
+    scheduler.stop()
+
+    s = store.get(sid)
+    assert s.lease_owner is None and s.last_run is None and s.next_run == 0
+
+
+def test_run_due_drains_everything_due_and_applies_tool_defaults(tmp_path: Path):
+    store = ScheduleStore(tmp_path / "schedule.db")
+    tool = GateTool()
+    tool.gate.set()
+    tools = ToolRegistry()
+    tools.register("Web Downloader", lambda: tool)
+    for n in range(3):
+        store.add(f"mirror {n}", "Web Downloader", {"n": n}, interval=3600, first_run=0)
+    store.add("own folder", "Web Downloader", {"out_dir": "elsewhere"}, interval=3600, first_run=0)
+
+    scheduler = Scheduler(store, tools, max_workers=1, defaults={"Web Downloader": {"out_dir": "/data/downloads"}})
+    scheduler.run_due(poll=0.01)
+    scheduler.stop()
+
+    assert len(tool.calls) == 4  # more than max_workers, all in one --once pass
+    assert sorted(c["out_dir"] for c in tool.calls) == ["/data/downloads"] * 3 + ["elsewhere"]
+    assert all(s.last_ok for s in store.schedules())
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks.synthetic_site import SiteServer, SiteSpec, parse_status_mix
+from tools.link_checker import LinkCheckerTool
+from tools.web_downloader import WebDownloaderTool
+
+
+def test_parse_status_mix():
+    assert parse_status_mix("404=0.05, 500=0.01") == {404: 0.05, 500: 0.01}
+
+
+def test_link_checker_against_local_site():
+    spec = SiteSpec(pages=1, links_per_page=40, page_link_ratio=0, images_per_page=0, status_mix={404: 0.25})
+    with SiteServer(spec) as server:
+        expected = sorted(
+            f"{server.base_url}/res/0-{k}" for k in range(40) if server.site.resource_status(f"0-{k}") == 404
+        )
+        res = LinkCheckerTool().run({"url": f"{server.base_url}/page/0.html", "use_cache": False})
+
+    assert expected and sorted(res.data["broken_404"]) == expected
+    assert res.data["links_checked"] == 40
+
+
+def test_downloader_against_local_site(tmp_path: Path):
+    spec = SiteSpec(pages=1, links_per_page=3, images_per_page=4, image_bytes=5000)
+    with SiteServer(spec) as server:
+        res = WebDownloaderTool().run({"url": f"{server.base_url}/page/0.html", "out_dir": str(tmp_path)})
+        sent = server.site.bytes_sent
+
+    assert res.data["images"] == 4
+    assert sent >= 4 * 5000
+
+
+def test_link_checker_honours_robots_and_seeds_from_sitemap():
+    from tools.robots import RobotsCache
+
+    # Pages link only to leaf resources, so page 1+ are reachable through the sitemap alone.
+    spec = SiteSpec(pages=5, links_per_page=4, page_link_ratio=0, images_per_page=0, disallow=("/res/1-",))
+    with SiteServer(spec) as server:
+        tool = LinkCheckerTool(robots=RobotsCache())
+        res = tool.run(
+            {"url": f"{server.base_url}/page/0.html", "crawl": True, "max_depth": 1, "sitemap": True, "max_pages": 20, "use_cache": False}
+        )
+
+    assert res.data["sitemap_urls"] == 4
+    assert res.data["pages_crawled"] == 5  # page 0 and the 4 sitemap pages; its /res/ links are not HTML
+    assert res.data["robots_blocked"] == [f"{server.base_url}/res/1-{k}" for k in range(4)]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
 
 import pytest
@@ -16,9 +17,23 @@ class DummyResp:
     def __init__(self, text="", status_code=200, content=b"", headers=None, json_data=None):
         self.text = text
         self.status_code = status_code
-        self.content = content
+        self.content = content or text.encode()
         self.headers = headers or {}
         self._json_data = json_data
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i : i + chunk_size]
 
     def raise_for_status(self):
         if self.status_code >= 400:
@@ -30,6 +45,25 @@ class DummyResp:
         return self._json_data
 
 
+class FakeSession:
+    """Stands in for the shared pooled session; routes get/head to test callables."""
+
+    def __init__(self, get=None, head=None):
+        self._get = get
+        self._head = head
+
+    def get(self, url, **kwargs):
+        return self._get(url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self._head(url, **kwargs)
+
+
+def use_fake_http(monkeypatch, get=None, head=None):
+    from tools import http_client
+
+    monkeypatch.setattr(http_client, "get_session", lambda: FakeSession(get, head))
+
 
 def test_quick_search_returns_result(monkeypatch):
     import webbrowser
@@ -52,8 +86,6 @@ def test_social_shortcuts_validation_error():
 
 
 def test_weather_returns_result_with_mock(monkeypatch):
-    import requests
-    
     def fake_get(*_a, **_k):
         return DummyResp(
             status_code=200,
@@ -70,7 +102,7 @@ def test_weather_returns_result_with_mock(monkeypatch):
             },
         )
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    use_fake_http(monkeypatch, get=fake_get)
 
     tool = WeatherTool()
     res = tool.run({"city": "Buenos Aires"})
@@ -81,8 +113,6 @@ def test_weather_returns_result_with_mock(monkeypatch):
 
 
 def test_web_downloader_links_mode(monkeypatch, tmp_path: Path):
-    import requests
-
     html = """
     <html><body>
       <a href="/a">A</a>
@@ -91,7 +121,7 @@ def test_web_downloader_links_mode(monkeypatch, tmp_path: Path):
     </body></html>
     """
 
-    monkeypatch.setattr(requests, "get", lambda *a, **k: DummyResp(text=html, status_code=200))
+    use_fake_http(monkeypatch, get=lambda *a, **k: DummyResp(text=html, status_code=200))
 
     tool = WebDownloaderTool()
     res = tool.run({"url": "https://example.com", "mode": "links", "out_dir": str(tmp_path)})
@@ -106,8 +136,6 @@ def test_web_downloader_links_mode(monkeypatch, tmp_path: Path):
 
 
 def test_link_checker_reports_404(monkeypatch):
-    import requests
-
     def fake_get(url, *args, **kwargs):
         if url == "https://example.com":
             return DummyResp(text="<a href='/ok'>ok</a><a href='/missing'>missing</a>", status_code=200)
@@ -115,11 +143,338 @@ def test_link_checker_reports_404(monkeypatch):
             return DummyResp(status_code=404)
         return DummyResp(status_code=200)
 
-    monkeypatch.setattr(requests, "get", fake_get)
+    use_fake_http(monkeypatch, get=fake_get, head=fake_get)
 
     tool = LinkCheckerTool()
     res = tool.run({"url": "https://example.com", "timeout": 5, "show_errors": False})
 
     assert res.ok is True
     assert res.data is not None
-    assert "https://example.com/missing" in res.data["broken_404"]
\ No newline at end of file
+    assert "https://example.com/missing" in res.data["broken_404"]
+
+def test_link_checker_concurrent_keeps_page_order(monkeypatch):
+    import random
+    import threading
+    import time
+
+    links = "".join(f"<a href='/missing{i}'>x</a>" for i in range(20))
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_get(url, *args, **kwargs):
+        nonlocal active, peak
+        if url == "https://example.com":
+            return DummyResp(text=links, status_code=200)
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(random.uniform(0, 0.01))
+        with lock:
+            active -= 1
+        return DummyResp(status_code=404)
+
+    use_fake_http(monkeypatch, get=fake_get, head=fake_get)
+
+    tool = LinkCheckerTool()
+    res = tool.run({"url": "https://example.com", "workers": 8, "per_host": 3})
+
+    assert res.data is not None
+    assert res.data["broken_404"] == [f"https://example.com/missing{i}" for i in range(20)]
+    assert peak <= 3
+
+
+def test_link_checker_head_first_with_streamed_get_fallback(monkeypatch):
+    streamed: list[DummyResp] = []
+
+    def fake_head(url, *args, **kwargs):
+        if url.endswith("/video"):
+            return DummyResp(status_code=200, headers={"Content-Length": "5000"})
+        return DummyResp(status_code=405)
+
+    def fake_get(url, *args, **kwargs):
+        if url == "https://example.com":
+            return DummyResp(text="<a href='/video'>v</a><a href='/legacy'>l</a>", status_code=200)
+        assert kwargs.get("stream") is True
+        resp = DummyResp(status_code=404, headers={"Content-Length": "700"})
+        streamed.append(resp)
+        return resp
+
+    use_fake_http(monkeypatch, get=fake_get, head=fake_head)
+
+    res = LinkCheckerTool().run({"url": "https://example.com"})
+
+    assert res.data is not None
+    assert res.data["broken_404"] == ["https://example.com/legacy"]
+    assert res.data["probe_stats"] == {"head": 1, "get_fallback": 1, "bytes_saved": 5700}
+    assert streamed and all(r.closed for r in streamed)
+
+
+def test_link_checker_dedups_and_caches_healthy_links(monkeypatch, tmp_path: Path):
+    probes: list[str] = []
+    page = "<a href='/ok'>1</a><a href='/ok#top'>2</a><a href='https://EXAMPLE.com/ok'>3</a><a href='/gone'>4</a>"
+
+    def fake_get(url, *args, **kwargs):
+        return DummyResp(text=page, status_code=200)
+
+    def fake_head(url, *args, **kwargs):
+        probes.append(url)
+        return DummyResp(status_code=404 if url.endswith("/gone") else 200)
+
+    use_fake_http(monkeypatch, get=fake_get, head=fake_head)
+
+    cache_path = tmp_path / "link_cache.json"
+    res = LinkCheckerTool(cache_path=cache_path).run({"url": "https://example.com"})
+    assert probes == ["https://example.com/ok", "https://example.com/gone"]
+    assert res.data and res.data["cache_hits"] == 0
+
+    probes.clear()
+    res = LinkCheckerTool(cache_path=cache_path).run({"url": "https://example.com"})
+    assert probes == ["https://example.com/gone"]
+    assert res.data and res.data["cache_hits"] == 1
+    assert res.data["broken_404"] == ["https://example.com/gone"]
+
+
+def test_link_checker_crawl_groups_broken_links_by_page(monkeypatch):
+    site = {
+        "https://example.com": "<a href='/a'>a</a><a href='/b'>b</a><a href='https://other.org/x'>x</a>",
+        "https://example.com/a": "<a href='/deep'>d</a><a href='/dead'>dead</a>",
+        "https://example.com/b": "<a href='/dead'>dead</a><a href='/a'>a</a>",
+        "https://example.com/deep": "<a href='/too-deep'>t</a>",
+    }
+    fetched: list[str] = []
+
+    def fake_get(url, *args, **kwargs):
+        fetched.append(url)
+        return DummyResp(text=site.get(url, ""))
+
+    def fake_head(url, *args, **kwargs):
+        return DummyResp(status_code=404 if "dead" in url else 200)
+
+    use_fake_http(monkeypatch, get=fake_get, head=fake_head)
+
+    res = LinkCheckerTool().run({"url": "https://example.com", "crawl": True, "max_depth": 1, "max_pages": 10})
+
+    assert res.data is not None
+    assert res.data["pages_crawled"] == 3
+    assert "https://other.org/x" not in fetched
+    assert "https://example.com/deep" not in fetched
+    assert res.data["broken_404"] == ["https://example.com/dead"]
+    assert res.data["broken_by_page"] == {
+        "https://example.com/a": ["https://example.com/dead"],
+        "https://example.com/b": ["https://example.com/dead"],
+    }
+
+
+def test_hashed_url_set_tracks_membership():
+    from tools.links import HashedURLSet
+
+    seen = HashedURLSet()
+    assert seen.add("https://example.com/a") is True
+    assert seen.add("https://example.com/a") is False
+    assert "https://example.com/a" in seen
+    assert "https://example.com/b" not in seen
+    assert len(seen) == 1
+
+
+def test_web_downloader_streams_images_with_size_cap(monkeypatch, tmp_path: Path):
+    html = "<img src='/a.png'><img src='/big.jpg'><img src='/b.gif'><img src='/a.png'>"
+    bodies = {"/a.png": b"A" * 300, "/big.jpg": b"B" * 5000, "/b.gif": b"G" * 10}
+
+    def fake_get(url, **kwargs):
+        if url == "https://example.com":
+            return DummyResp(text=html)
+        assert kwargs.get("stream") is True
+        return DummyResp(content=bodies[url.replace("https://example.com", "")])
+
+    use_fake_http(monkeypatch, get=fake_get)
+
+    res = WebDownloaderTool().run(
+        {"url": "https://example.com", "mode": "images", "out_dir": str(tmp_path), "max_image_bytes": 1000}
+    )
+
+    assert res.data is not None
+    assert res.data["images"] == 2
+    assert res.data["image_bytes"] == 310
+    index = json.loads((tmp_path / "example.com" / "images.json").read_text(encoding="utf-8"))
+    assert sorted(index) == ["https://example.com/a.png", "https://example.com/b.gif"]
+    assert len(list((tmp_path / "example.com" / "images").iterdir())) == 2
+
+
+def test_web_downloader_revalidates_with_manifest(monkeypatch, tmp_path: Path):
+    html = "<img src='/logo.png'>"
+    requests_seen: list[tuple[str, dict]] = []
+
+    def fake_get(url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        requests_seen.append((url, headers))
+        if headers.get("If-None-Match"):
+            return DummyResp(status_code=304)
+        if url == "https://example.com":
+            return DummyResp(text=html, headers={"ETag": '"page-v1"'})
+        return DummyResp(content=b"PNG" * 10, headers={"ETag": '"logo-v1"'})
+
+    use_fake_http(monkeypatch, get=fake_get)
+    params = {"url": "https://example.com", "mode": "all", "out_dir": str(tmp_path)}
+
+    first = WebDownloaderTool().run(params)
+    assert first.data and first.data["unchanged"] == {"html": False, "images": 0}
+    assert (tmp_path / "example.com.manifest.json").exists()
+
+    requests_seen.clear()
+    second = WebDownloaderTool().run(params)
+
+    assert [h.get("If-None-Match") for _u, h in requests_seen] == ['"page-v1"', '"logo-v1"']
+    assert second.data and second.data["unchanged"] == {"html": True, "images": 1}
+    assert second.data["image_bytes"] == 0
+    index = json.loads((tmp_path / "example.com" / "images.json").read_text(encoding="utf-8"))
+    assert (tmp_path / index["https://example.com/logo.png"]).read_bytes() == b"PNG" * 10
+
+
+def test_web_downloader_links_run_does_not_hide_a_changed_page(monkeypatch, tmp_path: Path):
+    site = {"version": "v1"}
+
+    def fake_get(url, **kwargs):
+        etag = f'"{site["version"]}"'
+        if (kwargs.get("headers") or {}).get("If-None-Match") == etag:
+            return DummyResp(status_code=304)
+        return DummyResp(text=f"<a href='/{site['version']}'>x</a>", headers={"ETag": etag})
+
+    use_fake_http(monkeypatch, get=fake_get)
+    params = {"url": "https://example.com", "out_dir": str(tmp_path)}
+    page_html = tmp_path / "example.com" / "page.html"
+
+    WebDownloaderTool().run(dict(params, mode="all"))
+    site["version"] = "v2"
+    WebDownloaderTool().run(dict(params, mode="links"))
+    res = WebDownloaderTool().run(dict(params, mode="all"))
+
+    assert "/v2" in page_html.read_text(encoding="utf-8")
+    assert res.data and res.data["unchanged"]["html"] is False
+
+    page_html.write_text("edited by hand", encoding="utf-8")
+    WebDownloaderTool().run(dict(params, mode="all"))  # stored sha256 no longer matches: no 304
+    assert "/v2" in page_html.read_text(encoding="utf-8")
+
+
+def test_web_downloader_prunes_images_the_page_dropped(monkeypatch, tmp_path: Path):
+    site = {"html": "<img src='/a.png'><img src='/b.png'>"}
+
+    def fake_get(url, **kwargs):
+        if url == "https://example.com":
+            return DummyResp(text=site["html"])
+        return DummyResp(content=url.encode())
+
+    use_fake_http(monkeypatch, get=fake_get)
+    params = {"url": "https://example.com", "mode": "images", "out_dir": str(tmp_path)}
+
+    WebDownloaderTool().run(params)
+    site["html"] = "<img src='/a.png'>"
+    WebDownloaderTool().run(params)
+
+    images = list((tmp_path / "example.com" / "images").iterdir())
+    assert [p.read_bytes() for p in images] == [b"https://example.com/a.png"]
+    manifest = json.loads((tmp_path / "example.com.manifest.json").read_text(encoding="utf-8"))
+    assert "https://example.com/b.png" not in manifest["resources"]
+
+
+def test_web_downloader_dedups_images_across_pages(monkeypatch, tmp_path: Path):
+    pages = {
+        "https://example.com/one": "<img src='/logo.png'><img src='/copy-of-logo.png'>",
+        "https://example.com/two": "<img src='https://cdn.example.com/logo.png'>",
+    }
+
+    def fake_get(url, **kwargs):
+        if url in pages:
+            return DummyResp(text=pages[url])
+        return DummyResp(content=b"same-logo-bytes")
+
+    use_fake_http(monkeypatch, get=fake_get)
+    tool = WebDownloaderTool()
+    for page in pages:
+        tool.run({"url": page, "mode": "images", "out_dir": str(tmp_path)})
+
+    blobs = [p for p in (tmp_path / "_blobs").rglob("*.png")]
+    assert len(blobs) == 1
+
+    linked = list((tmp_path / "example.com_one" / "images").iterdir()) + list(
+        (tmp_path / "example.com_two" / "images").iterdir()
+    )
+    assert len(linked) == 2
+    assert all(p.read_bytes() == b"same-logo-bytes" for p in linked)
+
+
+def test_link_checker_stops_when_cancelled(monkeypatch):
+    from tools import CancelledError, RunContext
+
+    ctx = RunContext()
+    probes: list[str] = []
+
+    def fake_get(url, **kwargs):
+        return DummyResp(text="".join(f"<a href='/p{i}'>x</a>" for i in range(50)))
+
+    def fake_head(url, **kwargs):
+        probes.append(url)
+        ctx.cancel.cancel()
+        return DummyResp(status_code=200)
+
+    use_fake_http(monkeypatch, get=fake_get, head=fake_head)
+
+    with pytest.raises(CancelledError):
+        LinkCheckerTool(workers=1).run({"url": "https://example.com"}, ctx)
+    assert len(probes) == 1
+
+
+def test_web_downloader_reports_progress(monkeypatch, tmp_path: Path):
+    from tools import RunContext
+
+    def fake_get(url, **kwargs):
+        if url == "https://example.com":
+            return DummyResp(text="<img src='/a.png'><img src='/b.png'>")
+        return DummyResp(content=url.encode() * 10)
+
+    use_fake_http(monkeypatch, get=fake_get)
+    events = []
+
+    WebDownloaderTool().run(
+        {"url": "https://example.com", "mode": "images", "out_dir": str(tmp_path)},
+        RunContext(progress=events.append),
+    )
+
+    assert events
+    last = events[-1]
+    assert (last.stage, last.done, last.total) == ("images", 2, 2)
+    assert last.bytes == len("https://example.com/a.png") * 20
+
+
+def test_link_checker_refuses_non_html_start_page(monkeypatch):
+    use_fake_http(monkeypatch, get=lambda *a, **k: DummyResp(content=b"%PDF", headers={"Content-Type": "application/pdf"}))
+
+    with pytest.raises(ValidationError):
+        LinkCheckerTool().run({"url": "https://example.com/file.pdf"})
+
+
+def test_link_checker_crawl_does_not_count_non_html_links_as_pages(monkeypatch):
+    def fake_get(url, **kwargs):
+        if url.endswith(".pdf"):
+            return DummyResp(content=b"%PDF", headers={"Content-Type": "application/pdf"})
+        return DummyResp(text="<a href='/doc.pdf'>d</a><a href='/about'>a</a>")
+
+    use_fake_http(monkeypatch, get=fake_get, head=lambda *a, **k: DummyResp())
+
+    res = LinkCheckerTool().run({"url": "https://example.com", "crawl": True, "max_depth": 1, "use_cache": False})
+
+    assert res.data and res.data["pages_crawled"] == 2  # the start page and /about, not the PDF
+    assert "page fetch failed" not in res.message
+
+
+def test_web_downloader_treats_malformed_content_length_as_unknown(monkeypatch, tmp_path: Path):
+    def fake_get(url, **kwargs):
+        if url == "https://example.com":
+            return DummyResp(text="<img src='/a.png'><img src='/b.png'>")
+        return DummyResp(content=url.encode(), headers={"Content-Length": "12, 12" if "a.png" in url else "nope"})
+
+    use_fake_http(monkeypatch, get=fake_get)
+    res = WebDownloaderTool().run({"url": "https://example.com", "mode": "images", "out_dir": str(tmp_path)})
+
+    assert res.data and res.data["images"] == 2
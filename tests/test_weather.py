@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from tools import http_client
+from tools.weather import WeatherReport, WeatherTool, city_key, parse_cities
+
+
+def _doc(temp: str) -> dict:
+    return {"current_condition": [{"temp_C": temp, "weatherDesc": [{"value": "Sunny"}]}]}
+
+
+class JsonResp:
+    status_code = 200
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+class CountingSession:
+    def __init__(self, temps: list[str]):
+        self.temps = temps
+        self.calls = 0
+        self.done = threading.Event()
+
+    def get(self, url, **kwargs):
+        temp = self.temps[min(self.calls, len(self.temps) - 1)]
+        self.calls += 1
+        self.done.set()
+        return JsonResp(_doc(temp))
+
+
+def test_city_key_normalizes():
+    assert city_key("  buenos   AIRES ") == city_key("Buenos Aires")
+
+
+def test_fresh_hit_skips_network_and_persists(monkeypatch, tmp_path: Path):
+    session = CountingSession(["20"])
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    path = tmp_path / "weather_cache.json"
+
+    WeatherTool(cache_path=path).run({"city": "Paris"})
+    res = WeatherTool(cache_path=path).run({"city": " paris "})
+
+    assert session.calls == 1
+    assert res.data and res.data["cached"] is True and res.data["stale"] is False
+
+
+def test_stale_entry_is_served_then_refreshed(monkeypatch, tmp_path: Path):
+    session = CountingSession(["20", "25"])
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    tool = WeatherTool(cache_path=tmp_path / "w.json", cache_ttl=60)
+    tool.run({"city": "Paris"})
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    session.done.clear()
+    stale = tool.run({"city": "Paris"})
+
+    assert stale.data and stale.data["stale"] is True
+    assert "Temp: 20" in stale.message
+    assert session.done.wait(2)
+    deadline = time.monotonic() + 2
+    while tool.cache.peek(city_key("Paris"))[0]["temp_c"] != 25 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "Temp: 25" in tool.run({"city": "Paris"}).message
+
+
+def test_parse_cities_splits_and_dedupes():
+    assert parse_cities("Paris; London\n paris ;;Rome, IT") == ["Paris", "London", "Rome, IT"]
+    assert parse_cities(["Oslo", " oslo", ""]) == ["Oslo"]
+
+
+class CitySession:
+    def __init__(self):
+        self.timeouts: list[float] = []
+        self.lock = threading.Lock()
+
+    def get(self, url, timeout=None, **kwargs):
+        with self.lock:
+            self.timeouts.append(timeout)
+        if "Atlantis" in url:
+            raise requests.ConnectionError("no such place")
+        return JsonResp(_doc("12" if "Oslo" in url else "30"))
+
+
+def test_multi_city_reports_errors_per_city(monkeypatch):
+    session = CitySession()
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+
+    res = WeatherTool().run({"cities": ["Oslo", "Atlantis", "Cairo"], "timeout": 5})
+
+    assert res.ok
+    assert list(res.data["cities"]) == ["Oslo", "Cairo"]
+    assert res.data["cities"]["Oslo"]["temp_c"] == 12
+    assert "no such place" in res.data["errors"]["Atlantis"]
+    assert session.timeouts == [5, 5, 5]
+    assert "Errors (1):" in res.message
+
+
+def test_multi_city_fails_only_when_every_city_fails(monkeypatch):
+    monkeypatch.setattr(http_client, "get_session", lambda: CitySession())
+
+    res = WeatherTool().run({"cities": "Atlantis"})
+
+    assert not res.ok and list(res.data["errors"]) == ["Atlantis"]
+
+
+J1 = {
+    "current_condition": [
+        {"temp_C": "18", "FeelsLikeC": "17", "humidity": "70", "windspeedKmph": "12",
+         "weatherDesc": [{"value": "Partly cloudy "}], "localObsDateTime": "2026-10-17 09:00 AM"}
+    ],
+    "nearest_area": [{"areaName": [{"value": "Buenos Aires"}], "country": [{"value": "Argentina"}]}],
+    "weather": [
+        {"date": "2026-10-17", "mintempC": "12", "maxtempC": "21", "avgtempC": "16",
+         "hourly": [{"chanceofrain": "0", "weatherDesc": [{"value": "Clear"}]},
+                    {"chanceofrain": "40", "weatherDesc": [{"value": "Patchy rain"}]}]},
+    ],
+}
+
+
+def test_report_projects_j1_and_round_trips():
+    report = WeatherReport.from_j1(J1)
+
+    assert report.area == "Buenos Aires, Argentina"
+    assert (report.temp_c, report.humidity, report.desc) == (18, 70, "Partly cloudy")
+    day = report.forecast[0]
+    assert (day.min_c, day.max_c, day.chance_of_rain, day.desc) == (12, 21, 40, "Patchy rain")
+    assert WeatherReport.from_dict(report.to_dict()) == report
+    assert not hasattr(report, "__dict__")
+
+
+def test_raw_document_only_on_opt_in(monkeypatch, tmp_path: Path):
+    session = CountingSession(["18"])
+    session.get = lambda url, **kwargs: JsonResp(J1)
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+    tool = WeatherTool(cache_path=tmp_path / "w.json")
+
+    plain = tool.run({"city": "Buenos Aires"})
+    raw = tool.run({"city": "Buenos Aires", "include_raw": True})
+
+    assert "raw" not in plain.data and plain.data["weather"]["temp_c"] == 18
+    assert "Forecast:" in plain.message and "12–21°C" in plain.message
+    assert raw.data["raw"] == J1 and raw.data["cached"] is False
+
+
+def test_cache_written_by_older_versions_is_projected(monkeypatch, tmp_path: Path):
+    path = tmp_path / "w.json"
+    old = WeatherTool(cache_path=path)
+    old.cache.put(city_key("Buenos Aires"), J1)
+    old.cache.save()
+    monkeypatch.setattr(http_client, "get_session", lambda: CountingSession(["99"]))
+
+    res = WeatherTool(cache_path=path).run({"city": "Buenos Aires"})
+
+    assert res.data["cached"] is True and res.data["weather"]["area"] == "Buenos Aires, Argentina"
@@ -1,11 +1,41 @@
-from .quick_search import QuickSearchTool
-from .social_shortcuts import SocialShortcutsTool
-from .weather import WeatherTool
-from .web_downloader import WebDownloaderTool
-from .link_checker import LinkCheckerTool
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Light, dependency-free modules are imported eagerly; tool classes (which pull
+# in requests, html parsers, ...) are resolved on first attribute access (PEP 562).
+from .types import CancelToken, Result, RunContext, Tool
+from .errors import CancelledError, ToolError, ValidationError, NetworkError
+
+if TYPE_CHECKING:
+    from .quick_search import QuickSearchTool
+    from .social_shortcuts import SocialShortcutsTool
+    from .weather import WeatherTool
+    from .web_downloader import WebDownloaderTool
+    from .link_checker import LinkCheckerTool
+
+_LAZY = {
+    "QuickSearchTool": ".quick_search",
+    "SocialShortcutsTool": ".social_shortcuts",
+    "WeatherTool": ".weather",
+    "WebDownloaderTool": ".web_downloader",
+    "LinkCheckerTool": ".link_checker",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
 
-from .types import Result, Tool
-from .errors import ToolError, ValidationError, NetworkError
 
 __all__ = [
     "QuickSearchTool",
@@ -14,8 +44,11 @@ __all__ = [
     "WebDownloaderTool",
     "LinkCheckerTool",
     "Result",
+    "RunContext",
+    "CancelToken",
     "Tool",
     "ToolError",
     "ValidationError",
     "NetworkError",
+    "CancelledError",
 ]
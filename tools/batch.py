@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable
+
+from .errors import CancelledError, ToolError
+from .types import Result, RunContext, Tool
+
+log = logging.getLogger("automation_hub")
+
+
+@dataclass(frozen=True)
+class BatchSummary:
+    total: int
+    skipped: int     # already done in an earlier (interrupted) run
+    ok: int
+    failed: int
+    report_path: Path
+    cancelled: int = 0  # not run (or stopped) because the batch was cancelled
+
+
+def read_inputs(path: Path) -> list[str]:
+    """One input per line; blank lines and '#' comments are ignored, duplicates dropped."""
+    lines = path.read_text(encoding="utf-8").splitlines()
+    items = [x.strip() for x in lines]
+    return list(dict.fromkeys(x for x in items if x and not x.startswith("#")))
+
+
+def completed_inputs(report_path: Path) -> set[str]:
+    """Inputs that already succeeded according to an existing JSONL report."""
+    done: set[str] = set()
+    if not report_path.exists():
+        return done
+    with report_path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from an interrupted run
+            if isinstance(rec, dict) and rec.get("ok"):
+                done.add(str(rec.get("input", "")))
+    return done
+
+
+def run_tool_safely(tool: Tool, params: dict[str, Any], ctx: RunContext | None = None) -> Result | None:
+    """Run a tool, turning errors into a failed Result. Returns None when cancelled."""
+    try:
+        if ctx is not None:
+            ctx.check()
+        return tool.run(params, ctx)
+    except CancelledError:
+        return None
+    except ToolError as e:
+        return Result(False, str(e), {})
+    except Exception as e:
+        log.exception("Tool crashed in batch: %s params=%s", e, params)
+        return Result(False, f"Tool crashed: {e}", {})
+
+
+class BatchRunner:
+    """
+    Runs one tool over many inputs on a bounded pool.
+    - Each input fills params[input_key] on top of base_params
+    - Results are appended to a JSONL report as soon as they finish
+    - Re-running with the same report skips inputs that already succeeded
+      (failed ones are retried)
+    - cancelling ctx stops pending items; they are not written to the report
+    """
+
+    def __init__(
+        self,
+        tool: Tool,
+        tool_name: str,
+        input_key: str,
+        base_params: dict[str, Any] | None = None,
+        workers: int = 4,
+    ):
+        self.tool = tool
+        self.tool_name = tool_name
+        self.input_key = input_key
+        self.base_params = dict(base_params or {})
+        self.workers = max(1, workers)
+
+    def run(
+        self,
+        inputs: list[str],
+        report_path: Path,
+        on_result: Callable[[str, Result], None] | None = None,
+        ctx: RunContext | None = None,
+    ) -> BatchSummary:
+        done = completed_inputs(report_path)
+        pending = [x for x in inputs if x not in done]
+        ok = failed = cancelled = 0
+
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        with report_path.open("a", encoding="utf-8") as report, ThreadPoolExecutor(
+            max_workers=self.workers
+        ) as pool:
+            # Items share the batch's cancel token but not its progress callback, so the
+            # job reports one "items" stream instead of interleaving each tool's stages.
+            item_ctx = RunContext(cancel=ctx.cancel) if ctx is not None else None
+            futures = {
+                pool.submit(run_tool_safely, self.tool, {**self.base_params, self.input_key: item}, item_ctx): item
+                for item in pending
+            }
+            progress = ctx.reporter("items", total=len(pending)) if ctx is not None else None
+            for fut in as_completed(futures):
+                item = futures[fut]
+                result = fut.result()
+                if progress is not None:
+                    progress.advance(current=item)
+                if result is None:
+                    cancelled += 1
+                    continue
+                if result.ok:
+                    ok += 1
+                else:
+                    failed += 1
+
+                record = {
+                    "input": item,
+                    "tool": self.tool_name,
+                    "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    "ok": result.ok,
+                    "message": result.message,
+                    "data": result.data or {},
+                }
+                report.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                report.flush()
+
+                if on_result is not None:
+                    on_result(item, result)
+
+            if progress is not None:
+                progress.finish()
+
+        return BatchSummary(
+            total=len(inputs),
+            skipped=len(inputs) - len(pending),
+            ok=ok,
+            failed=failed,
+            report_path=report_path,
+            cancelled=cancelled,
+        )
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Iterable
+
+# Bodies up to this size are hashed in memory; a duplicate never touches the disk.
+_SPOOL_BYTES = 1024 * 1024
+
+
+class BlobStore:
+    """
+    Content-addressed file store: each distinct body is kept once as
+    <root>/<sha[:2]>/<sha><ext>, and page folders hardlink to it.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._tmp = root / "tmp"
+
+    def blob_path(self, sha256: str, ext: str) -> Path:
+        return self.root / sha256[:2] / f"{sha256}{ext}"
+
+    def put_stream(self, chunks: Iterable[bytes], ext: str) -> tuple[Path, str, int, bool]:
+        """
+        Store a body and return (blob path, sha256, size, created).
+        created is False when the same content was already in the store.
+        """
+        self._tmp.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        buf = bytearray()
+        tmp_name: str | None = None
+        f = None
+        try:
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                if f is None and len(buf) + len(chunk) <= _SPOOL_BYTES:
+                    buf += chunk
+                    continue
+                if f is None:
+                    fd, tmp_name = tempfile.mkstemp(prefix=".part_", dir=self._tmp)
+                    f = os.fdopen(fd, "wb")
+                    f.write(buf)
+                    buf.clear()
+                f.write(chunk)
+            if f is not None:
+                f.close()
+                f = None
+
+            sha256 = digest.hexdigest()
+            blob = self.blob_path(sha256, ext)
+            if blob.exists():
+                return blob, sha256, size, False
+
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            if tmp_name is None:
+                fd, tmp_name = tempfile.mkstemp(prefix=".part_", dir=self._tmp)
+                with os.fdopen(fd, "wb") as out:
+                    out.write(buf)
+            os.replace(tmp_name, blob)
+            tmp_name = None
+            return blob, sha256, size, True
+        finally:
+            if f is not None:
+                f.close()
+            if tmp_name is not None:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def link_into(self, blob: Path, dest: Path) -> None:
+        """Expose a blob at dest via hardlink (copy when the filesystem can't link)."""
+        if dest.exists():
+            return
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(blob, dest)
+        except FileExistsError:
+            pass
+        except OSError:
+            shutil.copyfile(blob, dest)
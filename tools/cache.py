@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger("automation_hub")
+
+
+class PersistentTTLCache:
+    """
+    Small key/value cache with TTL expiry and LRU eviction.
+    - Kept in memory as an OrderedDict (oldest use first)
+    - Persisted as one JSON file when save() is called (path=None keeps it in memory)
+    """
+
+    def __init__(self, path: Path | None, ttl: float, max_items: int = 5000):
+        self.path = path
+        self.ttl = ttl
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._items: OrderedDict[str, tuple[float, Any]] | None = None
+        self._dirty = False
+        self._version = 0  # bumped on every change, so save() knows whether it wrote the latest
+        self._write_lock = threading.Lock()
+
+    def _load(self) -> OrderedDict[str, tuple[float, Any]]:
+        if self._items is not None:
+            return self._items
+
+        items: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        if self.path is not None and self.path.exists():
+            try:
+                raw = json.loads(self.path.read_text(encoding="utf-8"))
+                for key, stored_at, value in raw if isinstance(raw, list) else []:
+                    items[str(key)] = (float(stored_at), value)
+            except Exception as e:
+                log.warning("Ignoring unreadable cache %s: %s", self.path, e)
+                items.clear()
+        self._items = items
+        return items
+
+    def get(self, key: str) -> Any | None:
+        """Return a fresh value (and mark it recently used), or None."""
+        with self._lock:
+            items = self._load()
+            entry = items.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                del items[key]
+                self._dirty = True
+                self._version += 1
+                return None
+            items.move_to_end(key)
+            return value
+
+    def peek(self, key: str) -> tuple[Any, float] | None:
+        """
+        Return (value, age in seconds) even if the entry is past its TTL, so
+        callers can serve stale data while they refresh. Marks it recently used.
+        """
+        with self._lock:
+            items = self._load()
+            entry = items.get(key)
+            if entry is None:
+                return None
+            items.move_to_end(key)
+            stored_at, value = entry
+            return value, max(0.0, time.time() - stored_at)
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            items = self._load()
+            items[key] = (time.time(), value)
+            items.move_to_end(key)
+            while len(items) > self.max_items:
+                items.popitem(last=False)
+            self._dirty = True
+            self._version += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def save(self) -> None:
+        """
+        Write the cache to disk (atomic replace). No-op when unchanged.
+        Safe from several threads: writes are serialized, each goes through its
+        own temp file, and the cache only counts as saved if nothing changed
+        while the snapshot was being written.
+        """
+        if self.path is None:
+            return
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty or self._items is None:
+                    return
+                payload = [[k, stored_at, v] for k, (stored_at, v) in self._items.items()]
+                version = self._version
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(payload, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+
+            with self._lock:
+                if self._version == version:
+                    self._dirty = False
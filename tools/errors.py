@@ -11,3 +11,7 @@ class ValidationError(ToolError):
 
 class NetworkError(ToolError):
     """Raised for network/HTTP related failures."""
+
+
+class CancelledError(ToolError):
+    """Raised when a run is cancelled through its RunContext."""
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import importlib.util
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Protocol
+
+# Fastest first; html.parser (stdlib) is always available.
+BACKENDS = ("lxml", "selectolax", "html.parser")
+
+
+@dataclass
+class PageRefs:
+    """Raw references found on a page (not yet resolved against the page URL)."""
+    base_href: str | None = None
+    hrefs: list[str] = field(default_factory=list)      # <a href>
+    images: list[str] = field(default_factory=list)     # <img src>
+    srcset: list[str] = field(default_factory=list)     # candidates from <img>/<source> srcset
+    anchors: int = 0                                    # number of <a> tags, with or without href
+
+
+class Extractor(Protocol):
+    """Single-pass reference extractor; text can be fed in chunks as it arrives."""
+
+    def feed(self, text: str) -> None: ...
+
+    def close(self) -> PageRefs: ...
+
+
+def srcset_urls(value: str) -> list[str]:
+    """URLs from a srcset attribute ("a.png 1x, b.png 2x" -> ["a.png", "b.png"])."""
+    out: list[str] = []
+    for candidate in value.split(","):
+        parts = candidate.split()
+        if parts:
+            out.append(parts[0])
+    return out
+
+
+def _collect(refs: PageRefs, tag: str, get) -> None:
+    """Shared tag handling; get(name) returns an attribute value or None."""
+    if tag == "a":
+        refs.anchors += 1
+        href = get("href")
+        if href:
+            refs.hrefs.append(href)
+    elif tag == "img":
+        src = get("src")
+        if src:
+            refs.images.append(src)
+        srcset = get("srcset")
+        if srcset:
+            refs.srcset.extend(srcset_urls(srcset))
+    elif tag == "source":
+        srcset = get("srcset")
+        if srcset:
+            refs.srcset.extend(srcset_urls(srcset))
+    elif tag == "base" and refs.base_href is None:
+        href = get("href")
+        if href:
+            refs.base_href = href.strip()
+
+
+class _StdlibExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.refs = PageRefs()
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("a", "img", "source", "base"):
+            d = dict(attrs)
+            _collect(self.refs, tag, d.get)
+
+    handle_startendtag = handle_starttag
+
+    def close(self) -> PageRefs:  # type: ignore[override]
+        super().close()
+        return self.refs
+
+
+class _LxmlTarget:
+    """lxml parser target: receives start events, never builds a tree."""
+
+    def __init__(self):
+        self.refs = PageRefs()
+
+    def start(self, tag, attrib):
+        if isinstance(tag, str):
+            _collect(self.refs, tag.lower(), attrib.get)
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def close(self) -> PageRefs:
+        return self.refs
+
+
+class _LxmlExtractor:
+    def __init__(self):
+        from lxml import etree
+
+        self._parser = etree.HTMLParser(target=_LxmlTarget(), recover=True)
+        self._fed = False
+
+    def feed(self, text: str) -> None:
+        if text:
+            self._parser.feed(text)
+            self._fed = True
+
+    def close(self) -> PageRefs:
+        if not self._fed:
+            return PageRefs()
+        return self._parser.close()
+
+
+class _SelectolaxExtractor:
+    """Lexbor parses the whole document at once, so chunks are buffered until close()."""
+
+    def __init__(self):
+        self._chunks: list[str] = []
+
+    def feed(self, text: str) -> None:
+        self._chunks.append(text)
+
+    def close(self) -> PageRefs:
+        from selectolax.lexbor import LexborHTMLParser
+
+        refs = PageRefs()
+        tree = LexborHTMLParser("".join(self._chunks))
+        self._chunks = []
+        for node in tree.css("a, img, source, base"):
+            _collect(refs, node.tag, node.attributes.get)
+        return refs
+
+
+_FACTORIES = {
+    "lxml": _LxmlExtractor,
+    "selectolax": _SelectolaxExtractor,
+    "html.parser": _StdlibExtractor,
+}
+_MODULES = {"lxml": "lxml", "selectolax": "selectolax", "html.parser": "html.parser"}
+
+
+def available_backends() -> list[str]:
+    return [b for b in BACKENDS if importlib.util.find_spec(_MODULES[b]) is not None]
+
+
+def make_extractor(backend: str | None = None) -> Extractor:
+    """
+    Extractor for the requested backend, or the fastest installed one.
+    Unknown or missing backends fall back to html.parser.
+    """
+    if backend is None:
+        backend = available_backends()[0]
+    factory = _FACTORIES.get(backend, _StdlibExtractor)
+    try:
+        return factory()
+    except ImportError:
+        return _StdlibExtractor()
+
+
+def extract(html: str, backend: str | None = None) -> PageRefs:
+    ex = make_extractor(backend)
+    ex.feed(html)
+    return ex.close()
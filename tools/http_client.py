@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .ratelimit import HostRateLimiter, RateSettings, parse_retry_after
+
+DEFAULT_USER_AGENT = "AutomationHub/1.0"
+
+
+@dataclass(frozen=True)
+class HttpSettings:
+    """Connection pool / retry / timeout policy shared by every network tool."""
+    pool_connections: int = 16          # how many per-host pools are kept alive
+    pool_maxsize: int = 8               # keep-alive connections per host
+    host_pool_sizes: dict[str, int] = field(default_factory=dict)  # per-host override of pool_maxsize
+    retries: int = 2
+    backoff: float = 0.5
+    timeout: float = 12
+    user_agent: str = DEFAULT_USER_AGENT
+    rate_limit: RateSettings = field(default_factory=RateSettings)
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "HttpSettings":
+        defaults = HttpSettings()
+        host_pool_sizes = d.get("host_pool_sizes") or {}
+        if not isinstance(host_pool_sizes, dict):
+            raise ValueError("http.host_pool_sizes must be an object.")
+        rate_limit = d.get("rate_limit") or {}
+        if not isinstance(rate_limit, dict):
+            raise ValueError("http.rate_limit must be an object.")
+
+        return HttpSettings(
+            pool_connections=int(d.get("pool_connections", defaults.pool_connections)),
+            pool_maxsize=int(d.get("pool_maxsize", defaults.pool_maxsize)),
+            host_pool_sizes={str(k).lower(): int(v) for k, v in host_pool_sizes.items()},
+            retries=int(d.get("retries", defaults.retries)),
+            backoff=float(d.get("backoff", defaults.backoff)),
+            timeout=float(d.get("timeout", defaults.timeout)),
+            user_agent=str(d.get("user_agent", defaults.user_agent)),
+            rate_limit=RateSettings.from_dict(rate_limit),
+        )
+
+
+class PooledSession(requests.Session):
+    """
+    requests.Session with keep-alive pools, retry/backoff, a default timeout
+    and per-host rate limiting (429 / Retry-After slow the host down for every
+    thread sharing the session, then it speeds back up).
+    """
+
+    def __init__(self, settings: HttpSettings, limiter: HostRateLimiter | None = None):
+        super().__init__()
+        self.settings = settings
+        self.limiter = limiter or HostRateLimiter(settings.rate_limit)
+        self.headers["User-Agent"] = settings.user_agent
+
+        self.mount("http://", self._adapter(settings.pool_maxsize))
+        self.mount("https://", self._adapter(settings.pool_maxsize))
+        for host, size in settings.host_pool_sizes.items():
+            self.mount(f"http://{host}/", self._adapter(size))
+            self.mount(f"https://{host}/", self._adapter(size))
+
+    def _adapter(self, maxsize: int) -> HTTPAdapter:
+        retry = Retry(
+            total=self.settings.retries,
+            connect=self.settings.retries,
+            read=self.settings.retries,
+            status=self.settings.retries,
+            backoff_factor=self.settings.backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"HEAD", "GET", "OPTIONS"}),
+            raise_on_status=False,
+            # Retry-After (429s above all) is left to request(): urllib3 would sleep it
+            # out uncapped and uncancellable, unseen by the limiter the other threads share.
+            respect_retry_after_header=False,
+        )
+        return HTTPAdapter(
+            pool_connections=self.settings.pool_connections,
+            pool_maxsize=maxsize,
+            pool_block=False,
+            max_retries=retry,
+        )
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:  # type: ignore[override]
+        """Extra kwarg: cancel=CancelToken, to stop waiting for a rate-limit slot when a run is cancelled."""
+        cancel = kwargs.pop("cancel", None)
+        kwargs.setdefault("timeout", self.settings.timeout)
+        host = (urlsplit(url).hostname or "").lower()
+        attempts = self.settings.rate_limit.retries + 1
+        for attempt in range(attempts):
+            self.limiter.acquire(host, cancel)
+            resp = super().request(method, url, **kwargs)
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            if resp.status_code == 429:
+                self.limiter.throttled(host, retry_after)
+                if attempt + 1 < attempts:
+                    resp.close()
+                    continue
+            elif resp.status_code == 503 and retry_after is not None:
+                # urllib3 already retried this one (on its own backoff, ignoring
+                # Retry-After); honour the header by pausing the host for every thread.
+                self.limiter.throttled(host, retry_after)
+            else:
+                self.limiter.ok(host)
+            return resp
+        return resp
+
+
+def content_length(headers: Any) -> int:
+    """Declared Content-Length, or 0 when it is missing or malformed (= unknown)."""
+    try:
+        return max(0, int(headers.get("Content-Length") or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+_lock = threading.Lock()
+_settings = HttpSettings()
+_session: PooledSession | None = None
+
+
+def configure(settings: HttpSettings) -> None:
+    """Replace the shared policy; the next get_session() builds a fresh pool."""
+    global _settings, _session
+    with _lock:
+        _settings = settings
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+
+def get_session() -> requests.Session:
+    """Process-wide pooled session (thread-safe to share for GET/HEAD)."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = PooledSession(_settings)
+        return _session
@@ -1,81 +1,299 @@
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 from typing import Any
 from urllib.parse import urljoin, urlparse
 
 
 import requests
-from bs4 import BeautifulSoup
+from . import html_extract, http_client
+from .cache import PersistentTTLCache
 from .errors import NetworkError, ValidationError
-from .types import Result
+from .links import HashedURLSet, normalize_url, origin, resolve_href
+from .page_fetch import MAX_PAGE_BYTES, PageRejected, fetch_page
+from .params import int_param
+from .robots import RobotsCache, iter_sitemap_urls
+from .types import Result, RunContext
+
+log = logging.getLogger("automation_hub")
+
+# Servers answering HEAD with these get a streamed GET instead.
+_HEAD_REJECTED = (405, 501)
+
+
+class _HostLimiter:
+    """Caps how many probes may hit the same host at once."""
+
+    def __init__(self, per_host: int):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._sems: dict[str, threading.BoundedSemaphore] = {}
+
+    def slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = threading.BoundedSemaphore(self.per_host)
+                self._sems[host] = sem
+            return sem
+
+
+class _ProbeStats:
+    """Per-run counters, shared by the probe workers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.head = 0
+        self.fallback = 0
+        self.bytes_saved = 0
+
+    def add(self, head: int = 0, fallback: int = 0, saved: int = 0) -> None:
+        with self._lock:
+            self.head += head
+            self.fallback += fallback
+            self.bytes_saved += saved
+
+    def as_dict(self) -> dict[str, int]:
+        return {"head": self.head, "get_fallback": self.fallback, "bytes_saved": self.bytes_saved}
 
 
 class LinkCheckerTool:
-    description = "Scan a webpage and report broken links (404)."
+    description = "Scan a webpage (or crawl a site) and report broken links (404)."
 
-    def _is_http_url(self, u: str) -> bool:
-        try:
-            p = urlparse(u)
-            return p.scheme in ("http", "https")
-        except Exception:
-            return False
+    def __init__(
+        self,
+        workers: int = 16,
+        per_host: int = 4,
+        page_workers: int = 4,
+        cache_path: Path | None = None,
+        cache_ttl: float = 24 * 3600,
+        cache_max_items: int = 20000,
+        parser: str | None = None,
+        robots: RobotsCache | None = None,
+        max_page_bytes: int = MAX_PAGE_BYTES,
+    ):
+        self.parser = parser
+        self.max_page_bytes = max_page_bytes
+        # None = robots.txt is not consulted (respect_robots can still turn it off per run).
+        self.robots = robots
+        self.workers = workers
+        self.per_host = per_host
+        self.page_workers = page_workers
+        # Only healthy statuses are cached, so broken links are always re-checked.
+        self.cache = PersistentTTLCache(cache_path, ttl=cache_ttl, max_items=cache_max_items)
+
+    def _fetch_links(self, url: str, timeout: int, max_bytes: int, ctx: RunContext) -> tuple[int, list[str]]:
+        """
+        Stream a page through the extractor and return (anchor count, unique
+        normalized http links in page order). Runs on the page pool, so parsing
+        overlaps with other pages' network I/O. Anything that is not HTML
+        raises PageRejected.
+        """
+        ctx.check()
+        page = fetch_page(http_client.get_session(), url, timeout, max_bytes, self.parser, ctx=ctx)
+
+        refs = page.refs or html_extract.PageRefs()
+        base = urljoin(url, refs.base_href) if refs.base_href else url
+
+        targets: list[str] = []
+        for href in refs.hrefs:
+            full = resolve_href(base, href)
+            if full:
+                targets.append(normalize_url(full))
+        return refs.anchors, list(dict.fromkeys(targets))
+
+    def _probe(
+        self, url: str, timeout: int, limiter: _HostLimiter, stats: _ProbeStats, ctx: RunContext
+    ) -> tuple[int | None, str | None]:
+        """
+        Return (status_code, error) for a single link.
+        HEAD first; servers that reject it (405/501) get a streamed GET that
+        is closed as soon as the headers arrive, so bodies are never read.
+        """
+        session = http_client.get_session()
+        with limiter.slot(url):
+            if ctx.cancelled:
+                return None, "cancelled"
+            try:
+                r = session.head(url, timeout=timeout, allow_redirects=True, cancel=ctx.cancel)
+                if r.status_code not in _HEAD_REJECTED:
+                    stats.add(head=1, saved=http_client.content_length(r.headers))
+                    return r.status_code, None
 
-    def run(self, params: dict[str, Any]) -> Result:
+                r = session.get(url, timeout=timeout, stream=True, cancel=ctx.cancel)
+                try:
+                    stats.add(fallback=1, saved=http_client.content_length(r.headers))
+                    return r.status_code, None
+                finally:
+                    r.close()
+            except requests.RequestException as e:
+                return None, str(e)
+
+    def run(self, params: dict[str, Any], ctx: RunContext | None = None) -> Result:
+        ctx = ctx or RunContext()
         base_url = str(params.get("url", "")).strip()
         if not base_url:
             raise ValidationError("Please enter a URL.")
 
-        try:
-            timeout = max(1, int(params.get("timeout", 10)))
-        except (TypeError, ValueError):
-            timeout = 10
+        timeout = int_param(params, "timeout", 10)
+        workers = int_param(params, "workers", self.workers)
+        per_host = int_param(params, "per_host", self.per_host)
+        max_page_bytes = int_param(params, "max_page_bytes", self.max_page_bytes)
         show_errors = bool(params.get("show_errors", False))
+        use_cache = bool(params.get("use_cache", True))
 
-        try:
-            page = requests.get(base_url, timeout=timeout, headers={"User-Agent": "AutomationHub/1.0"})
-            page.raise_for_status()
+        crawl = bool(params.get("crawl", False))
+        max_depth = int_param(params, "max_depth", 2, minimum=0) if crawl else 0
+        max_pages = int_param(params, "max_pages", 50) if crawl else 1
+        robots = self.robots if params.get("respect_robots", True) else None
+        use_sitemap = crawl and bool(params.get("sitemap", False))
 
+        site = origin(base_url)
+        site_rules = robots.rules(base_url, timeout) if robots else None
+        if site_rules and not site_rules.allowed(base_url):
+            raise ValidationError(f"{base_url} is disallowed by robots.txt (turn off respect_robots to check it).")
+
+        try:
+            anchors_total, start_links = self._fetch_links(base_url, timeout, max_page_bytes, ctx)
         except requests.RequestException as e:
             raise NetworkError(f"Error accessing the page: {e}") from e
 
-        soup = BeautifulSoup(page.text, "html.parser")
-        anchors = soup.find_all("a")
+        visited = HashedURLSet()
+        visited.add(normalize_url(base_url))
 
-        checked = 0
-        broken_404: list[str] = []
+        # Sitemap pages join the first level, so the crawl covers them even when nothing links to them.
+        sitemap_urls = 0
+        if use_sitemap:
+            sitemaps = list(site_rules.sitemaps) if site_rules and site_rules.sitemaps else [f"{site}/sitemap.xml"]
+            known = set(start_links)
+            for u in iter_sitemap_urls(sitemaps, timeout, max_urls=max_pages, ctx=ctx):
+                if origin(u) == site and u not in known and u not in visited:
+                    known.add(u)
+                    start_links.append(u)
+                    sitemap_urls += 1
+
+        # Memory stays proportional to what is broken or still in flight, not to the site:
+        # seen links are hashed, finished probes are dropped, and each page keeps only the
+        # links that are still pending or came back 404. Level-by-level BFS keeps it deterministic.
+        probed = HashedURLSet()
+        pending: dict[str, tuple[int, Future]] = {}  # in-flight probes: url -> (discovery order, future)
+        broken: dict[str, int] = {}                  # 404 links -> discovery order
+        probe_errors: list[tuple[int, str]] = []
+        open_pages: list[tuple[str, list[str]]] = [(base_url, start_links)]
+        pages_crawled = 1
+        discovered = 0
         other_errors: list[str] = []
+        cache_hits = 0
+        blocked: dict[str, None] = {}  # same-origin links robots.txt disallows (ordered set)
+        stats = _ProbeStats()
+        limiter = _HostLimiter(per_host)
+        progress = ctx.reporter("links", total=0)
 
-        for a in anchors:
-            href = a.get("href")
-            if not href:
-                continue
-            href = href.strip()
+        with ThreadPoolExecutor(max_workers=workers) as probe_pool, ThreadPoolExecutor(
+            max_workers=self.page_workers
+        ) as page_pool:
 
-            if href.startswith("#"):
-                continue
-            if href.startswith(("mailto:", "tel:", "javascript:", "data:")):
-                continue
+            def schedule(links: list[str], depth: int) -> list[str]:
+                """Start probing unseen links; return same-origin pages to crawl next."""
+                nonlocal cache_hits, discovered
+                next_pages: list[str] = []
+                for u in links:
+                    if site_rules and origin(u) == site and not site_rules.allowed(u):
+                        blocked[u] = None
+                        continue
+                    if probed.add(u):
+                        if use_cache and self.cache.get(u) is not None:
+                            cache_hits += 1
+                        else:
+                            fut = probe_pool.submit(self._probe, u, timeout, limiter, stats, ctx)
+                            progress.add_total(1)
+                            fut.add_done_callback(lambda _f, u=u: progress.advance(current=u))
+                            pending[u] = (discovered, fut)
+                            discovered += 1
 
-            full = urljoin(base_url, href)
-            if not self._is_http_url(full):
-                continue
+                    if depth < max_depth and len(visited) < max_pages and origin(u) == site and visited.add(u):
+                        next_pages.append(u)
+                return next_pages
 
-            checked += 1
-            try:
-                r = requests.get(full, timeout=timeout, headers={"User-Agent": "AutomationHub/1.0"})
-                if r.status_code == 404:
-                    broken_404.append(full)
-            except requests.RequestException as e:
-                if show_errors:
-                    other_errors.append(f"{full} ({e})")
+            def collect(wait: bool) -> None:
+                """Record finished probes (all of them when wait), then prune the page link lists."""
+                for u in [u for u, (_n, f) in pending.items() if wait or f.done()]:
+                    n, fut = pending.pop(u)
+                    status, error = fut.result()
+                    ctx.check()
+                    if status is not None and status < 400:
+                        self.cache.put(u, status)
+                    elif status == 404:
+                        broken[u] = n
+                    elif error is not None and show_errors:
+                        probe_errors.append((n, f"{u} ({error})"))
+                open_pages[:] = [
+                    (page_url, kept)
+                    for page_url, links in open_pages
+                    if (kept := [u for u in links if u in pending or u in broken])
+                ]
+
+            level = schedule(start_links, 0)
+            depth = 1
+            while level:
+                fetched = [page_pool.submit(self._fetch_links, u, timeout, max_page_bytes, ctx) for u in level]
+                next_level: list[str] = []
+                for u, fut in zip(level, fetched):
+                    try:
+                        n_anchors, links = fut.result()
+                    except PageRejected as e:
+                        # A crawled link to a PDF or an image is not a page: no links, not counted.
+                        if e.reason != "content_type" and show_errors:
+                            other_errors.append(f"{u} (page fetch failed: {e})")
+                        continue
+                    except requests.RequestException as e:
+                        if show_errors:
+                            other_errors.append(f"{u} (page fetch failed: {e})")
+                        continue
+                    anchors_total += n_anchors
+                    pages_crawled += 1
+                    open_pages.append((u, links))
+                    next_level.extend(schedule(links, depth))
+                collect(wait=False)
+                level = next_level
+                depth += 1
+
+            collect(wait=True)
+
+        progress.finish()
+
+        try:
+            self.cache.save()
+        except OSError as e:
+            log.warning("Could not save link cache: %s", e)
+        if robots:
+            robots.save()
+
+        # Discovery order, so the report stays deterministic.
+        broken_404 = sorted(broken, key=broken.__getitem__)
+        other_errors.extend(msg for _n, msg in sorted(probe_errors))
+        broken_by_page = {page_url: links for page_url, links in open_pages}
 
         msg_lines = [
-            f"Scanned: {base_url}",
-            f"Links found: {len(anchors)} | HTTP links checked: {checked}",
+            f"Crawled: {base_url} ({pages_crawled} page(s), depth <= {max_depth})" if crawl else f"Scanned: {base_url}",
+            f"Links found: {anchors_total} | Unique HTTP links: {len(probed)} | From cache: {cache_hits}",
             f"Broken (404): {len(broken_404)}",
+            *([f"Skipped (robots.txt): {len(blocked)}"] if blocked else []),
+            *([f"From sitemap: {sitemap_urls} page(s)"] if use_sitemap else []),
+            f"Probes: {stats.head} HEAD, {stats.fallback} GET fallback | Body bytes skipped: {stats.bytes_saved}",
         ]
 
-        if broken_404:
+        if broken_404 and crawl:
+            msg_lines.append("")
+            msg_lines.append("404 links by page:")
+            for page_url, dead in broken_by_page.items():
+                msg_lines.append(page_url)
+                msg_lines.extend([f"  - {u}" for u in dead])
+        elif broken_404:
             msg_lines.append("")
             msg_lines.append("404 links:")
             msg_lines.extend([f"- {u}" for u in broken_404])
@@ -85,4 +303,18 @@ class LinkCheckerTool:
             msg_lines.append("Other errors:")
             msg_lines.extend([f"- {x}" for x in other_errors])
 
-        return Result(True, "\n".join(msg_lines), {"broken_404": broken_404, "other_errors": other_errors})
\ No newline at end of file
+        return Result(
+            True,
+            "\n".join(msg_lines),
+            {
+                "broken_404": broken_404,
+                "other_errors": other_errors,
+                "broken_by_page": broken_by_page,
+                "pages_crawled": pages_crawled,
+                "links_checked": len(probed),
+                "probe_stats": stats.as_dict(),
+                "cache_hits": cache_hits,
+                "robots_blocked": list(blocked),
+                "sitemap_urls": sitemap_urls,
+            },
+        )
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import hashlib
+from urllib.parse import urldefrag, urljoin, urlparse
+
+# hrefs with these prefixes never point at a fetchable page
+SKIP_PREFIXES = ("mailto:", "tel:", "javascript:", "data:")
+
+
+def is_http_url(u: str) -> bool:
+    try:
+        p = urlparse(u)
+        return p.scheme in ("http", "https")
+    except Exception:
+        return False
+
+
+def normalize_url(u: str) -> str:
+    """Canonical form used for dedup and cache keys (no fragment, lowercase scheme/host)."""
+    u, _frag = urldefrag(u)
+    p = urlparse(u)
+    return p._replace(scheme=p.scheme.lower(), netloc=p.netloc.lower(), path=p.path or "/").geturl()
+
+
+def resolve_href(base_url: str, href: str | None) -> str | None:
+    """
+    Turn a raw href into an absolute http(s) URL, or None when it should be skipped
+    (empty, same-page fragment, mailto:/tel:/javascript:/data:, non-http scheme).
+    """
+    if not href:
+        return None
+    href = href.strip()
+    if not href or href.startswith("#"):
+        return None
+    if href.startswith(SKIP_PREFIXES):
+        return None
+    full = urljoin(base_url, href)
+    return full if is_http_url(full) else None
+
+
+def origin(u: str) -> str:
+    p = urlparse(u)
+    return f"{p.scheme.lower()}://{p.netloc.lower()}"
+
+
+class HashedURLSet:
+    """
+    Visited-set that stores a 64-bit hash per URL instead of the URL itself.
+    Memory stays flat on very large crawls; a false "already seen" needs a
+    64-bit collision, which is negligible at crawl sizes.
+    """
+
+    def __init__(self):
+        self._hashes: set[int] = set()
+
+    @staticmethod
+    def _key(u: str) -> int:
+        return int.from_bytes(hashlib.blake2b(u.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def add(self, u: str) -> bool:
+        """Add a URL; returns False if it was already present."""
+        k = self._key(u)
+        if k in self._hashes:
+            return False
+        self._hashes.add(k)
+        return True
+
+    def __contains__(self, u: object) -> bool:
+        return isinstance(u, str) and self._key(u) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+log = logging.getLogger("automation_hub")
+
+
+class PageManifest:
+    """
+    What a previous download of one page fetched, keyed by resource URL:
+    ETag / Last-Modified (for conditional requests), sha256, size and the
+    saved path (relative to the page folder).
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.resources: dict[str, dict[str, Any]] = {}
+        if path.exists():
+            try:
+                raw = json.loads(path.read_text(encoding="utf-8"))
+                if isinstance(raw, dict) and isinstance(raw.get("resources"), dict):
+                    self.resources = {str(k): dict(v) for k, v in raw["resources"].items() if isinstance(v, dict)}
+            except Exception as e:
+                log.warning("Ignoring unreadable manifest %s: %s", path, e)
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self.resources.get(url)
+            return dict(entry) if entry else None
+
+    def put(self, url: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self.resources[url] = dict(entry)
+
+    def remove(self, url: str) -> dict[str, Any] | None:
+        with self._lock:
+            return self.resources.pop(url, None)
+
+    def urls(self) -> list[str]:
+        with self._lock:
+            return list(self.resources)
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"version": self.VERSION, "resources": self.resources}
+            text = json.dumps(payload, indent=2, ensure_ascii=False)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def conditional_headers(entry: dict[str, Any] | None) -> dict[str, str]:
+    """If-None-Match / If-Modified-Since headers for a previously fetched resource."""
+    headers: dict[str, str] = {}
+    if not entry:
+        return headers
+    if entry.get("etag"):
+        headers["If-None-Match"] = str(entry["etag"])
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = str(entry["last_modified"])
+    return headers
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+import requests
+
+from . import html_extract, http_client
+from .errors import ValidationError
+from .html_extract import PageRefs
+from .types import RunContext
+
+MAX_PAGE_BYTES = 20 * 1024 * 1024
+_CHUNK_SIZE = 64 * 1024
+_HTML_TYPES = ("text/html", "application/xhtml+xml")
+_SNIFF_BYTES = 1024
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE)
+_BOMS = ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16"))
+
+
+class PageRejected(ValidationError):
+    """The URL answered, but not with an HTML page we are willing to read."""
+
+    def __init__(self, message: str, reason: str):
+        super().__init__(message)
+        self.reason = reason  # "content_type" or "size"
+
+
+@dataclass
+class FetchedPage:
+    status: int
+    headers: Mapping[str, str]
+    refs: PageRefs | None = None    # None for a 304
+    text: str | None = None         # only with keep_text
+    size: int = 0                   # body bytes read (after Content-Encoding)
+    encoding: str | None = None
+    sha256: str | None = None       # of the decoded text as UTF-8 (what gets saved)
+    text_size: int = 0              # length of that UTF-8 text
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+def _header_charset(content_type: str) -> str | None:
+    for part in content_type.split(";")[1:]:
+        key, _, value = part.partition("=")
+        if key.strip().lower() == "charset" and value.strip():
+            return value.strip().strip("\"'")
+    return None
+
+
+def sniff_encoding(content_type: str, head: bytes) -> str:
+    """
+    Content-Type charset, else BOM, else <meta charset> in the first KiB.
+    Failing those, a text/* Content-Type without a charset means ISO-8859-1
+    (HTTP/1.1's default, and what requests' r.text used before); anything
+    else falls back to UTF-8.
+    """
+    declared = _header_charset(content_type)
+    candidates = [declared]
+    candidates += [enc for bom, enc in _BOMS if head.startswith(bom)]
+    meta = _META_CHARSET.search(head[:_SNIFF_BYTES])
+    if meta:
+        candidates.append(meta.group(1).decode("ascii", "ignore"))
+    for name in candidates:
+        if name:
+            try:
+                return codecs.lookup(name).name
+            except LookupError:
+                continue
+    if declared is None and content_type.strip().lower().startswith("text/"):
+        return "iso8859-1"
+    return "utf-8"
+
+
+def _digest(hasher: Any, text: str) -> int:
+    data = text.encode("utf-8", errors="ignore")
+    hasher.update(data)
+    return len(data)
+
+
+def fetch_page(
+    session: requests.Session,
+    url: str,
+    timeout: float,
+    max_bytes: int = MAX_PAGE_BYTES,
+    parser: str | None = None,
+    headers: dict[str, str] | None = None,
+    keep_text: bool = False,
+    ctx: RunContext | None = None,
+) -> FetchedPage:
+    """
+    Stream an HTML page into the reference extractor chunk by chunk, so
+    parsing overlaps the download and memory stays bounded.
+    - non-HTML Content-Type (missing is tolerated) and bodies over max_bytes
+      (declared or actual) raise PageRejected before/while reading
+    - charset is decoded incrementally (header, BOM or <meta>; see sniff_encoding)
+    - a 304 to a conditional request is returned without a body
+    HTTP errors raise requests.HTTPError, as raise_for_status() does.
+    """
+    kwargs: dict[str, Any] = {"timeout": timeout, "stream": True}
+    if headers:
+        kwargs["headers"] = headers
+    if ctx is not None:
+        kwargs["cancel"] = ctx.cancel
+    with session.get(url, **kwargs) as r:
+        r.raise_for_status()
+        if r.status_code == 304:
+            return FetchedPage(r.status_code, r.headers)
+
+        content_type = str(r.headers.get("Content-Type", ""))
+        mime = content_type.split(";", 1)[0].strip().lower()
+        if mime and mime not in _HTML_TYPES:
+            raise PageRejected(f"{url} is not an HTML page ({mime}).", "content_type")
+        declared = http_client.content_length(r.headers)
+        if declared > max_bytes:
+            raise PageRejected(f"{url} is {declared} bytes (limit {max_bytes}).", "size")
+
+        extractor = html_extract.make_extractor(parser)
+        decoder = None
+        encoding = None
+        parts: list[str] = []
+        hasher = hashlib.sha256()
+        size = text_size = 0
+        head = b""
+        for chunk in r.iter_content(chunk_size=_CHUNK_SIZE):
+            if not chunk:
+                continue
+            if ctx is not None:
+                ctx.check()
+            size += len(chunk)
+            if size > max_bytes:
+                raise PageRejected(f"{url} exceeded {max_bytes} bytes.", "size")
+            if decoder is None:
+                # Hold back the first bytes until there is enough to sniff a <meta charset>.
+                head += chunk
+                if len(head) < _SNIFF_BYTES:
+                    continue
+                chunk, head = head, b""
+                encoding = sniff_encoding(content_type, chunk)
+                decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            text = decoder.decode(chunk)
+            extractor.feed(text)
+            text_size += _digest(hasher, text)
+            if keep_text:
+                parts.append(text)
+
+        if decoder is None:
+            encoding = sniff_encoding(content_type, head)
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        text = decoder.decode(head, final=True)
+        extractor.feed(text)
+        text_size += _digest(hasher, text)
+        if keep_text:
+            parts.append(text)
+
+        return FetchedPage(
+            r.status_code,
+            r.headers,
+            refs=extractor.close(),
+            text="".join(parts) if keep_text else None,
+            size=size,
+            encoding=encoding,
+            sha256=hasher.hexdigest(),
+            text_size=text_size,
+        )
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from typing import Any
+
+
+def int_param(params: dict[str, Any], key: str, default: int, minimum: int = 1) -> int:
+    """Read an integer param (UI entries arrive as strings); bad values fall back to default."""
+    try:
+        return max(minimum, int(params.get(key, default)))
+    except (TypeError, ValueError):
+        return default
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    stage: str                  # what is being counted ("links", "images", ...)
+    done: int
+    total: int | None           # None while still unknown
+    bytes: int = 0              # transferred so far in this stage
+    current: str = ""           # URL (or item) most recently worked on
+    eta: float | None = None    # seconds, estimated from the average rate so far
+
+    def describe(self) -> str:
+        parts = [f"{self.done}/{self.total if self.total is not None else '?'} {self.stage}"]
+        if self.bytes:
+            parts.append(format_bytes(self.bytes))
+        if self.eta is not None:
+            parts.append(f"ETA {self.eta:.0f}s")
+        return " · ".join(parts)
+
+
+ProgressCallback = Callable[[ProgressEvent], None]
+
+
+def format_bytes(n: int) -> str:
+    size = float(n)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{n} B"
+
+
+class ProgressReporter:
+    """
+    Thread-safe counter that forwards ProgressEvents to a callback at most
+    once per min_interval (plus a final event from finish()), so workers can
+    call advance() per item or per chunk without flooding the consumer.
+    """
+
+    def __init__(
+        self,
+        callback: ProgressCallback | None,
+        stage: str,
+        total: int | None = None,
+        min_interval: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._callback = callback
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.stage = stage
+        self.total = total
+        self.done = 0
+        self.bytes = 0
+        self.current = ""
+        self.min_interval = min_interval
+        self._started = clock()
+        self._last_emit = float("-inf")
+
+    def add_total(self, n: int) -> None:
+        """Grow the total as more work is discovered (e.g. while crawling)."""
+        if self._callback is None:
+            return
+        with self._lock:
+            self.total = (self.total or 0) + n
+
+    def advance(self, n: int = 1, bytes: int = 0, current: str = "") -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            self.done += n
+            self.bytes += bytes
+            if current:
+                self.current = current
+            now = self._clock()
+            if now - self._last_emit < self.min_interval:
+                return
+            self._last_emit = now
+            event = self._snapshot(now)
+        self._callback(event)
+
+    def finish(self) -> None:
+        if self._callback is None:
+            return
+        with self._lock:
+            event = self._snapshot(self._clock())
+        self._callback(event)
+
+    def _snapshot(self, now: float) -> ProgressEvent:
+        eta = None
+        if self.total is not None and self.done > 0:
+            elapsed = now - self._started
+            eta = max(0.0, elapsed / self.done * (self.total - self.done))
+        return ProgressEvent(self.stage, self.done, self.total, self.bytes, self.current, eta)
@@ -4,7 +4,7 @@ import webbrowser
 from typing import Any
 from urllib.parse import quote_plus
 
-from .types import Result
+from .types import Result, RunContext
 from .errors import ValidationError
 
 
@@ -14,7 +14,7 @@ class QuickSearchTool:
     def __init__(self, engines: dict[str, str]):
         self.engines = engines
 
-    def run(self, params: dict[str, Any]) -> Result:
+    def run(self, params: dict[str, Any], ctx: RunContext | None = None) -> Result:
         engine = str(params.get("engine", "")).strip()
         query = str(params.get("query", "")).strip()
 
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+
+from .errors import CancelledError
+from .types import CancelToken
+
+_SLEEP_SLICE = 0.25  # how often a waiting request looks at its cancel token
+
+
+@dataclass(frozen=True)
+class RateSettings:
+    """Per-host politeness policy (requests per second; 0 = no fixed limit)."""
+    rate: float = 0.0
+    burst: int = 4                      # requests allowed back to back before pacing kicks in
+    host_rates: dict[str, float] = field(default_factory=dict)  # per-host override of rate
+    throttled_rate: float = 2.0         # starting pace for an unlimited host after its first 429
+    min_rate: float = 0.2
+    recovery: float = 1.1               # pace grows by this factor per successful response
+    backoff: float = 1.0                # pause after a 429 without Retry-After (doubles per strike)
+    max_pause: float = 60.0             # cap for Retry-After / backoff pauses
+    retries: int = 2                    # re-sends after a 429
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "RateSettings":
+        defaults = RateSettings()
+        host_rates = d.get("host_rates") or {}
+        if not isinstance(host_rates, dict):
+            raise ValueError("http.rate_limit.host_rates must be an object.")
+
+        return RateSettings(
+            rate=float(d.get("rate", defaults.rate)),
+            burst=max(1, int(d.get("burst", defaults.burst))),
+            host_rates={str(k).lower(): float(v) for k, v in host_rates.items()},
+            throttled_rate=float(d.get("throttled_rate", defaults.throttled_rate)),
+            min_rate=float(d.get("min_rate", defaults.min_rate)),
+            recovery=float(d.get("recovery", defaults.recovery)),
+            backoff=float(d.get("backoff", defaults.backoff)),
+            max_pause=float(d.get("max_pause", defaults.max_pause)),
+            retries=int(d.get("retries", defaults.retries)),
+        )
+
+
+def parse_retry_after(value: str | None, now: float | None = None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+@dataclass
+class _HostState:
+    limit: float | None        # current pace (req/s); None = unlimited
+    configured: float | None   # pace from settings, the ceiling recovery climbs back to
+    tat: float = 0.0           # theoretical arrival time of the next request (GCRA)
+    paused_until: float = 0.0
+    strikes: int = 0           # consecutive 429s
+    burst: int | None = None   # per-host override of settings.burst (1 under a Crawl-delay)
+
+
+class HostRateLimiter:
+    """
+    Token bucket per host, shared by every thread using the session.
+    - acquire() reserves a slot and sleeps until it comes up (GCRA: up to
+      `burst` requests back to back, then one every 1/rate seconds)
+    - throttled() (a 429 / Retry-After) pauses the host for everyone and halves
+      its pace; ok() lets the pace recover gradually (AIMD), so a host that
+      pushes back settles just under its limit instead of a 429 storm
+    """
+
+    def __init__(
+        self,
+        settings: RateSettings,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.settings = settings
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        st = self._hosts.get(host)
+        if st is None:
+            rate = self.settings.host_rates.get(host, self.settings.rate)
+            configured = rate if rate > 0 else None
+            st = self._hosts[host] = _HostState(limit=configured, configured=configured)
+        return st
+
+    def rate(self, host: str) -> float | None:
+        with self._lock:
+            return self._state(host.lower()).limit
+
+    def cap(self, host: str, rate: float, burst: int | None = None) -> None:
+        """
+        Never go faster than rate on host, nor more than burst requests back to
+        back (a robots.txt Crawl-delay means one request per delay: burst=1).
+        """
+        with self._lock:
+            st = self._state(host.lower())
+            st.configured = rate if st.configured is None else min(st.configured, rate)
+            st.limit = rate if st.limit is None else min(st.limit, rate)
+            if burst is not None:
+                st.burst = max(1, burst if st.burst is None else min(st.burst, burst))
+
+    def reserve(self, host: str) -> float:
+        """Reserve the next slot for host; returns how many seconds to wait for it."""
+        host = host.lower()
+        with self._lock:
+            st = self._state(host)
+            now = self._clock()
+            start = max(now, st.paused_until)
+            if st.limit is None:
+                return start - now
+            interval = 1.0 / st.limit
+            tat = max(st.tat, start)
+            burst = st.burst if st.burst is not None else self.settings.burst
+            at = max(start, tat - (burst - 1) * interval)
+            st.tat = tat + interval
+            return at - now
+
+    def acquire(self, host: str, cancel: CancelToken | None = None) -> None:
+        """
+        Wait for the reserved slot, however far out it is (max_pause only caps a
+        host's pause, not a request's place in the queue). Sleeps in slices so a
+        cancelled run stops waiting promptly (CancelledError).
+        """
+        wait = self.reserve(host)
+        while wait > 0:
+            if cancel is not None and cancel.cancelled:
+                raise CancelledError("Cancelled.")
+            step = min(wait, _SLEEP_SLICE)
+            self._sleep(step)
+            wait -= step
+
+    def throttled(self, host: str, retry_after: float | None = None) -> float:
+        """Record pushback from host; returns the pause applied (seconds)."""
+        s = self.settings
+        host = host.lower()
+        with self._lock:
+            st = self._state(host)
+            st.strikes += 1
+            current = st.limit if st.limit is not None else s.throttled_rate * 2
+            st.limit = max(s.min_rate, current / 2)
+            pause = retry_after if retry_after is not None else s.backoff * 2 ** (st.strikes - 1)
+            pause = min(pause, s.max_pause)
+            st.paused_until = max(st.paused_until, self._clock() + pause)
+            return pause
+
+    def ok(self, host: str) -> None:
+        s = self.settings
+        with self._lock:
+            st = self._state(host.lower())
+            st.strikes = 0
+            if st.limit is None or st.limit == st.configured:
+                return
+            grown = st.limit * s.recovery
+            if st.configured is not None:
+                st.limit = min(st.configured, grown)
+            elif grown >= s.throttled_rate * 16:
+                st.limit = None  # recovered well past where it was throttled: unlimited again
+            else:
+                st.limit = grown
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from typing import Any, Callable
+
+from .types import Tool
+
+log = logging.getLogger("automation_hub")
+
+ToolFactory = Callable[[], Tool]
+
+
+def lazy(target: str, *args: Any, **kwargs: Any) -> ToolFactory:
+    """
+    Factory for "package.module:ClassName"; the module is only imported when
+    the factory is called, e.g. lazy("tools.weather:WeatherTool", cache_path=p).
+    """
+    module_name, _, attr = target.partition(":")
+
+    def build() -> Tool:
+        cls = getattr(importlib.import_module(module_name), attr)
+        return cls(*args, **kwargs)
+
+    return build
+
+
+class ToolRegistry:
+    """
+    Tools by display name, created on first use.
+    - register() only stores a factory; nothing is imported or built yet
+    - get() builds the tool once (thread-safe) and reuses it afterwards
+    - a factory that fails (missing dependency, bad config) is logged and
+      get() returns None, so the UI can show "Tool not available"
+    """
+
+    def __init__(self):
+        self._factories: dict[str, ToolFactory] = {}
+        self._tools: dict[str, Tool] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: ToolFactory) -> None:
+        with self._lock:
+            self._factories[name] = factory
+            self._tools.pop(name, None)
+
+    def names(self) -> list[str]:
+        return list(self._factories)
+
+    def loaded(self) -> list[str]:
+        with self._lock:
+            return list(self._tools)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._factories
+
+    def get(self, name: str) -> Tool | None:
+        with self._lock:
+            tool = self._tools.get(name)
+            if tool is not None:
+                return tool
+            factory = self._factories.get(name)
+            if factory is None:
+                return None
+            try:
+                tool = factory()
+            except Exception as e:
+                log.exception("Could not load tool %s: %s", name, e)
+                return None
+            self._tools[name] = tool
+            log.info("Loaded tool %s", name)
+            return tool
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import gzip
+import io
+import logging
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, BinaryIO, Iterable, Iterator
+from urllib.parse import urlsplit
+
+import requests
+
+from . import http_client
+from .cache import PersistentTTLCache
+from .links import is_http_url, normalize_url, origin
+from .types import RunContext
+
+log = logging.getLogger("automation_hub")
+
+ROBOTS_MAX_BYTES = 512 * 1024           # RFC 9309: parse at least 500 KiB, ignore the rest
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024    # sitemaps.org limit, uncompressed
+_RETRY_UNREACHABLE = 300.0              # 5xx / network error: allow, but ask again after this
+
+
+# ---------------- robots.txt ----------------
+
+@lru_cache(maxsize=1024)
+def _pattern(rule: str) -> re.Pattern[str]:
+    """robots.txt path pattern ("*" wildcard, trailing "$" anchor) as a prefix regex."""
+    anchored = rule.endswith("$")
+    body = re.escape(rule[:-1] if anchored else rule).replace(r"\*", ".*")
+    return re.compile(body + ("$" if anchored else ""))
+
+
+@dataclass(frozen=True)
+class RobotsRules:
+    """The part of one robots.txt that applies to us. Empty = everything allowed."""
+    rules: tuple[tuple[bool, str], ...] = ()   # (allow, path pattern)
+    crawl_delay: float | None = None
+    sitemaps: tuple[str, ...] = ()
+
+    def allowed(self, url: str) -> bool:
+        """Longest matching rule wins; on a tie Allow beats Disallow (RFC 9309)."""
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        if path == "/robots.txt":
+            return True
+        best, verdict = -1, True
+        for allow, rule in self.rules:
+            if len(rule) >= best and _pattern(rule).match(path):
+                if len(rule) > best or allow:
+                    best, verdict = len(rule), allow
+        return verdict
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"rules": [list(r) for r in self.rules], "crawl_delay": self.crawl_delay, "sitemaps": list(self.sitemaps)}
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "RobotsRules":
+        return RobotsRules(
+            rules=tuple((bool(a), str(p)) for a, p in d.get("rules") or []),
+            crawl_delay=d.get("crawl_delay"),
+            sitemaps=tuple(d.get("sitemaps") or ()),
+        )
+
+
+def parse_robots(text: str, user_agent: str = http_client.DEFAULT_USER_AGENT) -> RobotsRules:
+    """
+    Keep the groups whose User-agent is our product token (matched exactly,
+    case-insensitively, per RFC 9309), falling back to "*". Sitemap lines
+    apply to everyone.
+    """
+    token = user_agent.split("/", 1)[0].strip().lower()
+    groups: list[tuple[list[str], list[tuple[bool, str]], list[float]]] = []
+    sitemaps: list[str] = []
+    agents: list[str] = []
+    in_rules = False
+
+    for line in text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        key, sep, value = line.partition(":")
+        if not sep:
+            continue
+        key, value = key.strip().lower(), value.strip()
+        if key == "sitemap":
+            if is_http_url(value):
+                sitemaps.append(value)
+            continue
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            if not agents:
+                groups.append((agents, [], []))
+            agents.append(value.lower())
+            continue
+        if not groups:
+            continue
+        in_rules = True
+        _agents, rules, delay = groups[-1]
+        if key in ("allow", "disallow") and value:
+            rules.append((key == "allow", value))
+        elif key == "crawl-delay":
+            try:
+                delay.append(float(value))
+            except ValueError:
+                pass
+
+    def specificity(agent: str) -> int:
+        if agent == "*":
+            return 0
+        return len(agent) if agent == token else -1
+
+    best = max((specificity(a) for agents_, _r, _d in groups for a in agents_), default=-1)
+    rules: list[tuple[bool, str]] = []
+    delays: list[float] = []
+    if best >= 0:
+        for agents_, group_rules, group_delay in groups:
+            if any(specificity(a) == best for a in agents_):
+                rules.extend(group_rules)
+                delays.extend(group_delay)
+    return RobotsRules(tuple(rules), max(delays) if delays else None, tuple(dict.fromkeys(sitemaps)))
+
+
+class RobotsCache:
+    """
+    robots.txt per origin, fetched once and kept for `ttl` seconds (in memory
+    and, with a path, on disk across runs). Crawl-delay is handed to the
+    shared session's rate limiter, so it holds for every tool.
+    - 4xx: no robots.txt, everything allowed (cached)
+    - 5xx / unreachable: allowed for now, asked again after a few minutes
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        ttl: float = 24 * 3600,
+        max_items: int = 2000,
+        max_crawl_delay: float = 10.0,
+        user_agent: str = http_client.DEFAULT_USER_AGENT,
+    ):
+        self.ttl = ttl
+        self.max_crawl_delay = max_crawl_delay
+        self.user_agent = user_agent
+        self.cache = PersistentTTLCache(path, ttl=ttl, max_items=max_items)
+        self._lock = threading.Lock()
+        self._origin_locks: dict[str, threading.Lock] = {}
+        self._parsed: dict[str, tuple[float, RobotsRules]] = {}  # origin -> (expires, rules)
+
+    def _memo(self, site: str) -> RobotsRules | None:
+        hit = self._parsed.get(site)
+        if hit is not None and hit[0] > time.monotonic():
+            return hit[1]
+        return None
+
+    def rules(self, url: str, timeout: float = 10) -> RobotsRules:
+        site = origin(url)
+        rules = self._memo(site)
+        if rules is None:
+            with self._lock:
+                lock = self._origin_locks.setdefault(site, threading.Lock())
+            with lock:  # one fetch per origin, however many threads ask
+                rules = self._memo(site)
+                if rules is None:
+                    rules = self._load(site, timeout)
+        if rules.crawl_delay:
+            limiter = getattr(http_client.get_session(), "limiter", None)
+            if limiter is not None:
+                delay = min(rules.crawl_delay, self.max_crawl_delay)
+                limiter.cap(urlsplit(site).hostname or "", 1.0 / max(delay, 1e-3), burst=1)
+        return rules
+
+    def _load(self, site: str, timeout: float) -> RobotsRules:
+        stored = self.cache.get(site)
+        if stored is not None:
+            rules = RobotsRules.from_dict(stored)
+            self._parsed[site] = (time.monotonic() + self.ttl, rules)
+            return rules
+
+        ttl = self.ttl
+        try:
+            with http_client.get_session().get(f"{site}/robots.txt", timeout=timeout, stream=True) as r:
+                if r.status_code >= 500:
+                    ttl, rules = _RETRY_UNREACHABLE, RobotsRules()
+                elif r.status_code >= 400:
+                    rules = RobotsRules()
+                else:
+                    body = bytearray()
+                    for chunk in r.iter_content(chunk_size=16 * 1024):
+                        body += chunk
+                        if len(body) >= ROBOTS_MAX_BYTES:
+                            break
+                    rules = parse_robots(bytes(body[:ROBOTS_MAX_BYTES]).decode("utf-8", "replace"), self.user_agent)
+        except requests.RequestException as e:
+            log.info("robots.txt for %s unavailable: %s", site, e)
+            ttl, rules = _RETRY_UNREACHABLE, RobotsRules()
+
+        if ttl == self.ttl:
+            self.cache.put(site, rules.to_dict())
+        self._parsed[site] = (time.monotonic() + ttl, rules)
+        return rules
+
+    def allowed(self, url: str, timeout: float = 10) -> bool:
+        return self.rules(url, timeout).allowed(url)
+
+    def save(self) -> None:
+        try:
+            self.cache.save()
+        except OSError as e:
+            log.warning("Could not save robots cache: %s", e)
+
+
+# ---------------- sitemaps ----------------
+
+class _CappedReader:
+    """File-like wrapper that refuses to read past `limit` bytes."""
+
+    def __init__(self, f: BinaryIO, limit: int):
+        self._f = f
+        self._left = limit
+
+    def read(self, n: int = -1) -> bytes:
+        want = self._left + 1 if n is None or n < 0 else min(n, self._left + 1)
+        data = self._f.read(want)
+        self._left -= len(data)
+        if self._left < 0:
+            raise ValueError("sitemap is larger than the size limit")
+        return data
+
+
+def parse_sitemap(stream: BinaryIO, max_bytes: int = SITEMAP_MAX_BYTES) -> Iterator[tuple[str, str]]:
+    """
+    Yield ("url" | "sitemap", loc) from a <urlset> or <sitemapindex>, gzipped
+    or not. Parsed incrementally and pruned as it goes, so memory stays flat
+    however large the file is.
+    """
+    buffered = stream if hasattr(stream, "peek") else io.BufferedReader(stream)  # type: ignore[arg-type]
+    source: Any = buffered
+    if buffered.peek(2)[:2] == b"\x1f\x8b":
+        source = gzip.GzipFile(fileobj=buffered)
+
+    root = None
+    kind = "url"
+    for event, elem in ET.iterparse(_CappedReader(source, max_bytes), events=("start", "end")):
+        tag = elem.tag.rsplit("}", 1)[-1]
+        if event == "start":
+            if root is None:
+                root = elem
+            elif tag in ("url", "sitemap"):
+                kind = tag
+            continue
+        if tag == "loc" and elem.text:
+            yield kind, elem.text.strip()
+        elif tag in ("url", "sitemap") and root is not None:
+            root.clear()  # drop finished entries
+
+
+def iter_sitemap_urls(
+    sitemaps: Iterable[str],
+    timeout: float = 10,
+    max_urls: int = 10_000,
+    max_sitemaps: int = 50,
+    ctx: RunContext | None = None,
+) -> Iterator[str]:
+    """
+    Page URLs from sitemaps, following sitemap indexes breadth-first. A
+    sitemap that is missing, too large or malformed is logged and skipped
+    (whatever it yielded before failing is kept).
+    """
+    queue = deque(sitemaps)
+    seen: set[str] = set()
+    produced = 0
+    session = http_client.get_session()
+
+    while queue and len(seen) < max_sitemaps:
+        sitemap = queue.popleft()
+        if sitemap in seen:
+            continue
+        seen.add(sitemap)
+        try:
+            with session.get(sitemap, timeout=timeout, stream=True, cancel=ctx.cancel if ctx else None) as r:
+                if r.status_code >= 400:
+                    log.info("Sitemap %s: HTTP %s", sitemap, r.status_code)
+                    continue
+                r.raw.decode_content = True  # undo Content-Encoding; .xml.gz files are handled by parse_sitemap
+                r.raw.auto_close = False     # parse_sitemap buffers reads; EOF must not close the stream under it
+                for kind, loc in parse_sitemap(r.raw):
+                    if ctx is not None:
+                        ctx.check()
+                    if not is_http_url(loc):
+                        continue
+                    if kind == "sitemap":
+                        queue.append(loc)
+                        continue
+                    yield normalize_url(loc)
+                    produced += 1
+                    if produced >= max_urls:
+                        return
+        except (requests.RequestException, ET.ParseError, OSError, EOFError, ValueError) as e:
+            log.warning("Skipping sitemap %s: %s", sitemap, e)
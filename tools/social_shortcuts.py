@@ -4,7 +4,7 @@ import webbrowser
 from typing import Any
 
 from .errors import ValidationError
-from .types import Result
+from .types import Result, RunContext
 
 
 class SocialShortcutsTool:
@@ -13,7 +13,7 @@ class SocialShortcutsTool:
     def __init__(self, socials: dict[str, str]):
         self.socials = socials
 
-    def run(self, params: dict[str, Any]) -> Result:
+    def run(self, params: dict[str, Any], ctx: RunContext | None = None) -> Result:
         platform = str(params.get("platform", "")).strip()
         if not platform:
             raise ValidationError("Choose a platform.")
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from typing import Any, Protocol
 
+from .errors import CancelledError
+from .progress import ProgressCallback, ProgressReporter
+
 
 @dataclass(frozen=True)
 class Result:
@@ -11,8 +15,42 @@ class Result:
     data: dict[str, Any] | None = None
 
 
+class CancelToken:
+    """Set from the UI thread, polled cooperatively by the tool's worker threads."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """Per-run handles passed to Tool.run (cancellation, progress reporting)."""
+    cancel: CancelToken = field(default_factory=CancelToken)
+    progress: ProgressCallback | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel.cancelled
+
+    def check(self) -> None:
+        """Raise CancelledError if the run was cancelled."""
+        if self.cancel.cancelled:
+            raise CancelledError("Cancelled.")
+
+    def reporter(self, stage: str, total: int | None = None) -> ProgressReporter:
+        """Throttled progress reporter for one stage of the run (no-op without a callback)."""
+        return ProgressReporter(self.progress, stage, total)
+
+
 class Tool(Protocol):
     """Contract for all tools used by the UI."""
     description: str
 
-    def run(self, params: dict[str, Any]) -> Result: ...
+    def run(self, params: dict[str, Any], ctx: RunContext | None = None) -> Result: ...
@@ -1,42 +1,320 @@
 from __future__ import annotations
 
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from typing import Any
 
 import requests
 
-from .errors import NetworkError, ValidationError
-from .types import Result
+from . import http_client
+from .cache import PersistentTTLCache
+from .errors import CancelledError, NetworkError, ToolError, ValidationError
+from .params import int_param
+from .types import CancelToken, Result, RunContext
+
+log = logging.getLogger("automation_hub")
+
+
+def city_key(city: str) -> str:
+    """Cache key: case- and whitespace-insensitive ("  buenos   AIRES" == "Buenos Aires")."""
+    return " ".join(city.split()).casefold()
+
+
+def parse_cities(value: Any) -> list[str]:
+    """A list, or one string separated by ';' or newlines (cities may contain commas)."""
+    if isinstance(value, str):
+        value = value.replace("\n", ";").split(";")
+    cities = [str(c).strip() for c in (value or [])]
+    seen: set[str] = set()
+    out: list[str] = []
+    for c in cities:
+        if c and city_key(c) not in seen:
+            seen.add(city_key(c))
+            out.append(c)
+    return out
+
+
+def _int(value: Any) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _desc(entry: dict[str, Any]) -> str:
+    return ((entry.get("weatherDesc") or [{}])[0].get("value") or "N/A").strip()
+
+
+@dataclass(frozen=True, slots=True)
+class DayForecast:
+    date: str
+    min_c: int | None
+    max_c: int | None
+    avg_c: int | None
+    desc: str                        # midday conditions
+    chance_of_rain: int | None       # highest hourly chance, in %
+
+    @staticmethod
+    def from_j1(day: dict[str, Any]) -> "DayForecast":
+        hourly = day.get("hourly") or [{}]
+        rain = [r for r in (_int(h.get("chanceofrain")) for h in hourly) if r is not None]
+        return DayForecast(
+            date=str(day.get("date", "")),
+            min_c=_int(day.get("mintempC")),
+            max_c=_int(day.get("maxtempC")),
+            avg_c=_int(day.get("avgtempC")),
+            desc=_desc(hourly[len(hourly) // 2]),
+            chance_of_rain=max(rain) if rain else None,
+        )
+
+    def describe(self) -> str:
+        rain = f", rain {self.chance_of_rain}%" if self.chance_of_rain is not None else ""
+        return f"{self.date}: {self.min_c}–{self.max_c}°C, {self.desc}{rain}"
+
+
+@dataclass(frozen=True, slots=True)
+class WeatherReport:
+    """The part of a wttr.in j1 document the app uses (a few hundred bytes instead of ~50 KB)."""
+    area: str
+    observed: str
+    temp_c: int | None
+    feels_c: int | None
+    humidity: int | None
+    wind_kmph: int | None
+    desc: str
+    forecast: tuple[DayForecast, ...] = ()
+
+    @staticmethod
+    def from_j1(doc: dict[str, Any]) -> "WeatherReport":
+        current = (doc.get("current_condition") or [{}])[0]
+        nearest = (doc.get("nearest_area") or [{}])[0]
+        name = ((nearest.get("areaName") or [{}])[0].get("value") or "").strip()
+        country = ((nearest.get("country") or [{}])[0].get("value") or "").strip()
+        return WeatherReport(
+            area=", ".join(x for x in (name, country) if x),
+            observed=str(current.get("localObsDateTime", "")),
+            temp_c=_int(current.get("temp_C")),
+            feels_c=_int(current.get("FeelsLikeC")),
+            humidity=_int(current.get("humidity")),
+            wind_kmph=_int(current.get("windspeedKmph")),
+            desc=_desc(current),
+            forecast=tuple(DayForecast.from_j1(d) for d in doc.get("weather") or []),
+        )
+
+    @staticmethod
+    def from_dict(d: dict[str, Any]) -> "WeatherReport":
+        if "current_condition" in d:  # raw j1 document (cache written by older versions)
+            return WeatherReport.from_j1(d)
+        return WeatherReport(
+            area=str(d.get("area", "")),
+            observed=str(d.get("observed", "")),
+            temp_c=_int(d.get("temp_c")),
+            feels_c=_int(d.get("feels_c")),
+            humidity=_int(d.get("humidity")),
+            wind_kmph=_int(d.get("wind_kmph")),
+            desc=str(d.get("desc", "N/A")),
+            forecast=tuple(
+                DayForecast(
+                    date=str(f.get("date", "")),
+                    min_c=_int(f.get("min_c")),
+                    max_c=_int(f.get("max_c")),
+                    avg_c=_int(f.get("avg_c")),
+                    desc=str(f.get("desc", "N/A")),
+                    chance_of_rain=_int(f.get("chance_of_rain")),
+                )
+                for f in d.get("forecast") or []
+                if isinstance(f, dict)
+            ),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
 
 
 class WeatherTool:
     description = "Get current weather for a city (uses wttr.in JSON, no API key)."
 
-    def run(self, params: dict[str, Any]) -> Result:
-        city = str(params.get("city", "")).strip()
-        if not city:
-            raise ValidationError("Please enter a city.")
+    def __init__(
+        self,
+        cache_path: Path | None = None,
+        cache_ttl: float = 600,
+        max_stale: float = 24 * 3600,
+        cache_max_items: int = 200,
+    ):
+        # Fresh for cache_ttl; after that served stale (and refreshed in the
+        # background) until max_stale, then fetched synchronously again.
+        self.cache = PersistentTTLCache(cache_path, ttl=cache_ttl, max_items=cache_max_items)
+        self.max_stale = max_stale
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
 
+    def _fetch(self, city: str, timeout: int = 12, cancel: CancelToken | None = None) -> dict[str, Any]:
         url = f"https://wttr.in/{city}?format=j1"
-
         try:
-            r = requests.get(url, timeout=12, headers={"User-Agent": "AutomationHub/1.0"})
+            r = http_client.get_session().get(url, timeout=timeout, cancel=cancel)
             r.raise_for_status()
-            data = r.json()
-
-            current = (data.get("current_condition") or [{}])[0]
-            temp_c = current.get("temp_C")
-            feels_c = current.get("FeelsLikeC")
-            humidity = current.get("humidity")
-            wind_kmph = current.get("windspeedKmph")
-            desc = ((current.get("weatherDesc") or [{}])[0].get("value")) or "N/A"
-
-            msg = (
-                f"{city} | {desc}\n"
-                f"Temp: {temp_c}°C (feels {feels_c}°C) | Humidity: {humidity}% | Wind: {wind_kmph} km/h"
-            )
-            return Result(True, msg, {"city": city, "raw": data})
-
+            return r.json()
         except requests.RequestException as e:
             raise NetworkError(f"Weather request failed: {e}") from e
         except ValueError as e:
             raise NetworkError("Weather response was not valid JSON.") from e
+
+    def _store(self, key: str, report: WeatherReport, save: bool = True) -> None:
+        self.cache.put(key, report.to_dict())
+        if save:
+            self._save()
+
+    def _save(self) -> None:
+        try:
+            self.cache.save()
+        except OSError as e:
+            log.warning("Could not save weather cache: %s", e)
+
+    def _refresh_in_background(self, city: str, key: str) -> None:
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def work() -> None:
+            try:
+                self._store(key, WeatherReport.from_j1(self._fetch(city)))
+            except Exception as e:
+                log.warning("Background weather refresh failed for %s: %s", city, e)
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=work, name=f"weather-refresh-{key}", daemon=True).start()
+
+    def _lookup(
+        self,
+        city: str,
+        refresh: bool,
+        timeout: int,
+        include_raw: bool = False,
+        save: bool = True,
+        cancel: CancelToken | None = None,
+    ) -> tuple[WeatherReport, dict[str, Any] | None, float | None, bool]:
+        """
+        Return (report, raw document, cache age or None if fetched now, stale).
+        Only the projection is cached, so include_raw always goes to the network.
+        save=False leaves writing the cache file to the caller (one write per batch).
+        """
+        key = city_key(city)
+        entry = None if refresh or include_raw else self.cache.peek(key)
+        if entry is not None:
+            value, age = entry
+            report = WeatherReport.from_dict(value)
+            if age <= self.cache.ttl:
+                return report, None, age, False
+            if age <= self.max_stale:
+                self._refresh_in_background(city, key)
+                return report, None, age, True
+
+        raw = self._fetch(city, timeout, cancel)
+        report = WeatherReport.from_j1(raw)
+        self._store(key, report, save)
+        return report, raw if include_raw else None, None, False
+
+    def _result(
+        self,
+        city: str,
+        report: WeatherReport,
+        raw: dict[str, Any] | None = None,
+        age: float | None = None,
+        stale: bool = False,
+    ) -> Result:
+        msg = (
+            f"{city} | {report.desc}\n"
+            f"Temp: {report.temp_c}°C (feels {report.feels_c}°C) | Humidity: {report.humidity}%"
+            f" | Wind: {report.wind_kmph} km/h"
+        )
+        if report.forecast:
+            msg += "\nForecast:\n" + "\n".join(f"  {day.describe()}" for day in report.forecast)
+        if age is not None:
+            msg += f"\n(cached {age:.0f}s ago{', refreshing' if stale else ''})"
+        data: dict[str, Any] = {
+            "city": city,
+            "weather": report.to_dict(),
+            "cached": age is not None,
+            "age": age,
+            "stale": stale,
+        }
+        if raw is not None:
+            data["raw"] = raw
+        return Result(True, msg, data)
+
+    def _run_many(self, cities: list[str], params: dict[str, Any], ctx: RunContext) -> Result:
+        """
+        Fetch several cities concurrently over the shared pool. A failing city is
+        reported under "errors" instead of failing the whole batch.
+        """
+        refresh = bool(params.get("refresh"))
+        timeout = int_param(params, "timeout", 12)
+        workers = int_param(params, "workers", 8)
+        progress = ctx.reporter("cities", total=len(cities))
+
+        def one(city: str) -> tuple[WeatherReport, dict[str, Any] | None, float | None, bool]:
+            ctx.check()
+            try:
+                return self._lookup(city, refresh, timeout, save=False, cancel=ctx.cancel)
+            finally:
+                progress.advance(current=city)
+
+        rows: dict[str, dict[str, Any]] = {}
+        errors: dict[str, str] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=min(workers, len(cities))) as pool:
+                futures = [pool.submit(one, c) for c in cities]
+                for city, fut in zip(cities, futures):
+                    try:
+                        report, _raw, age, _stale = fut.result()
+                    except CancelledError:
+                        raise
+                    except ToolError as e:
+                        errors[city] = str(e)
+                        continue
+                    rows[city] = dict(report.to_dict(), cached=age is not None)
+        finally:
+            self._save()  # once for the whole batch, cancelled or not
+        progress.finish()
+        ctx.check()
+
+        width = max(len(c) for c in cities)
+        lines = [f"{'City':<{width}} | Conditions           | Temp  | Feels | Hum  | Wind"]
+        for city, f in rows.items():
+            cell = {k: "-" if v is None else str(v) for k, v in f.items() if k != "forecast"}
+            lines.append(
+                f"{city:<{width}} | {cell['desc'][:20]:<20} | {cell['temp_c']:>3}°C | {cell['feels_c']:>3}°C"
+                f" | {cell['humidity']:>3}% | {cell['wind_kmph']} km/h"
+            )
+        if errors:
+            lines.append("")
+            lines.append(f"Errors ({len(errors)}):")
+            lines.extend(f"- {c}: {e}" for c, e in errors.items())
+
+        return Result(bool(rows), "\n".join(lines), {"cities": rows, "errors": errors})
+
+    def run(self, params: dict[str, Any], ctx: RunContext | None = None) -> Result:
+        ctx = ctx or RunContext()
+        cities = parse_cities(params.get("cities"))
+        if cities:
+            return self._run_many(cities, params, ctx)
+
+        city = str(params.get("city", "")).strip()
+        if not city:
+            raise ValidationError("Please enter a city.")
+        ctx.check()
+
+        report, raw, age, stale = self._lookup(
+            city,
+            bool(params.get("refresh")),
+            int_param(params, "timeout", 12),
+            include_raw=bool(params.get("include_raw")),
+            cancel=ctx.cancel,
+        )
+        return self._result(city, report, raw, age, stale)
@@ -1,33 +1,73 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 from urllib.parse import urljoin, urlparse
 
 import requests
-from bs4 import BeautifulSoup
 
-from .errors import NetworkError, ValidationError
-from .types import Result
+from . import html_extract, http_client
+from .blobstore import BlobStore
+from .errors import CancelledError, NetworkError, ValidationError
+from .links import origin, resolve_href
+from .manifest import PageManifest, conditional_headers
+from .page_fetch import _CHUNK_SIZE, MAX_PAGE_BYTES, fetch_page
+from .params import int_param
+from .progress import ProgressReporter
+from .robots import RobotsCache
+from .types import Result, RunContext
+
+
+class _ByteBudget:
+    """Total bytes all image workers may still write in this run."""
+
+    def __init__(self, limit: int):
+        self._lock = threading.Lock()
+        self.remaining = limit
+
+    def take(self, n: int) -> bool:
+        with self._lock:
+            if n > self.remaining:
+                self.remaining = 0
+                return False
+            self.remaining -= n
+            return True
+
+
+class _SkipImage(Exception):
+    """An image was dropped on purpose (size cap / byte budget)."""
 
 
 class WebDownloaderTool:
     description = "Download a page HTML, extract links, and/or download images."
 
+    def __init__(
+        self,
+        workers: int = 8,
+        max_image_bytes: int = 25 * 1024 * 1024,
+        max_total_bytes: int = 500 * 1024 * 1024,
+        parser: str | None = None,
+        robots: RobotsCache | None = None,
+        max_page_bytes: int = MAX_PAGE_BYTES,
+    ):
+        self.parser = parser
+        self.max_page_bytes = max_page_bytes
+        self.robots = robots
+        self.workers = workers
+        self.max_image_bytes = max_image_bytes
+        self.max_total_bytes = max_total_bytes
+
     def _safe_name(self, text: str) -> str:
         text = text.strip().lower()
         text = re.sub(r"[^a-z0-9_\-\.]+", "_", text)
         return text[:120] or "page"
 
-    def _is_http_url(self, u: str) -> bool:
-        try:
-            p = urlparse(u)
-            return p.scheme in ("http", "https")
-        except Exception:
-            return False
-
     def _guess_ext(self, content_type: str) -> str:
         ct = (content_type or "").lower()
         if "jpeg" in ct or "jpg" in ct:
@@ -40,7 +80,76 @@ class WebDownloaderTool:
             return ".gif"
         return ""
 
-    def run(self, params: dict[str, Any]) -> Result:
+    def _download_image(
+        self,
+        session: requests.Session,
+        img_url: str,
+        page_folder: Path,
+        blobs: BlobStore,
+        timeout: int,
+        max_bytes: int,
+        budget: _ByteBudget,
+        previous: dict[str, Any] | None,
+        ctx: RunContext,
+        progress: ProgressReporter,
+    ) -> dict[str, Any]:
+        """
+        Stream one image into the blob store and hardlink it into the page's
+        images/ folder under a content-derived name. A previously fetched image
+        is requested conditionally; a 304 leaves everything untouched.
+        Returns the manifest entry plus "changed" and "written" (bytes transferred).
+        """
+        ctx.check()
+        if previous and not (page_folder / previous["path"]).exists():
+            previous = None
+
+        with session.get(
+            img_url, timeout=timeout, stream=True, headers=conditional_headers(previous), cancel=ctx.cancel
+        ) as img_r:
+            if previous and img_r.status_code == 304:
+                return dict(previous, changed=False, written=0)
+            img_r.raise_for_status()
+
+            declared = http_client.content_length(img_r.headers)
+            if declared > max_bytes:
+                raise _SkipImage(f"{img_url} is {declared} bytes (cap {max_bytes})")
+
+            ext = os.path.splitext(urlparse(img_url).path)[1]
+            if not ext:
+                ext = self._guess_ext(img_r.headers.get("Content-Type", "")) or ".bin"
+
+            def capped_chunks():
+                written = 0
+                for chunk in img_r.iter_content(chunk_size=_CHUNK_SIZE):
+                    if not chunk:
+                        continue
+                    ctx.check()
+                    written += len(chunk)
+                    if written > max_bytes:
+                        raise _SkipImage(f"{img_url} exceeded {max_bytes} bytes")
+                    if not budget.take(len(chunk)):
+                        raise _SkipImage(f"{img_url} skipped: total byte budget used up")
+                    progress.advance(0, bytes=len(chunk), current=img_url)
+                    yield chunk
+
+            blob, sha256, size, _created = blobs.put_stream(capped_chunks(), ext)
+
+        dest = page_folder / "images" / f"{sha256[:16]}{ext}"
+        blobs.link_into(blob, dest)
+        rel_path = dest.relative_to(page_folder).as_posix()
+        return {
+            "path": rel_path,
+            "blob": blob.relative_to(blobs.root.parent).as_posix(),
+            "size": size,
+            "sha256": sha256,
+            "etag": img_r.headers.get("ETag"),
+            "last_modified": img_r.headers.get("Last-Modified"),
+            "changed": not (previous and previous.get("path") == rel_path),
+            "written": size,
+        }
+
+    def run(self, params: dict[str, Any], ctx: RunContext | None = None) -> Result:
+        ctx = ctx or RunContext()
         url = str(params.get("url", "")).strip()
         if not url:
             raise ValidationError("Please enter a URL.")
@@ -51,49 +160,92 @@ class WebDownloaderTool:
 
 
         out_dir = Path(params.get("out_dir") or "downloads")
-        try:
-            timeout = max(1, int(params.get("timeout", 12)))
-        except (TypeError, ValueError):
-            timeout = 12
+        timeout = int_param(params, "timeout", 12)
 
-        out_dir.mkdir(parents=True, exist_ok=True)
-
-        try:
-            r = requests.get(url, timeout=timeout, headers={"User-Agent": "AutomationHub/1.0"})
-            r.raise_for_status()
-        except requests.RequestException as e:
-            raise NetworkError(f"Request failed: {e}") from e
+        robots = self.robots if params.get("respect_robots", True) else None
+        site_rules = robots.rules(url, timeout) if robots else None
+        if site_rules and not site_rules.allowed(url):
+            raise ValidationError(f"{url} is disallowed by robots.txt (turn off respect_robots to download it).")
 
-        html = r.text
-        soup = BeautifulSoup(html, "html.parser")
+        out_dir.mkdir(parents=True, exist_ok=True)
 
         parsed = urlparse(url)
         page_key = self._safe_name(parsed.netloc + parsed.path)
         page_folder = out_dir / page_key
         page_folder.mkdir(parents=True, exist_ok=True)
 
-        saved = {"html": None, "links": None, "images": 0}
+        # Sits next to the page folder so a re-run knows what it already has.
+        manifest = PageManifest(out_dir / f"{page_key}.manifest.json")
+        html_path = page_folder / "page.html"
+        previous_page = manifest.get(url) if html_path.exists() else None
+        # A 304 only means "your copy is current" if the copy on disk is the one recorded.
+        if previous_page and previous_page.get("sha256") != hashlib.sha256(html_path.read_bytes()).hexdigest():
+            previous_page = None
+
+        session = http_client.get_session()
+        # Streamed: links and images are extracted while the page downloads; the
+        # text itself is only kept when it is going to be saved.
+        keep_html = mode in ("html", "all")
+        try:
+            page = fetch_page(
+                session,
+                url,
+                timeout,
+                int_param(params, "max_page_bytes", self.max_page_bytes),
+                self.parser,
+                headers=conditional_headers(previous_page),
+                keep_text=keep_html,
+                ctx=ctx,
+            )
+        except requests.RequestException as e:
+            raise NetworkError(f"Request failed: {e}") from e
+
+        page_changed = not (previous_page and page.not_modified)
+        if page_changed:
+            html = page.text
+            if previous_page and previous_page.get("sha256") == page.sha256:
+                page_changed = False
+            refs = page.refs or html_extract.PageRefs()
+        else:
+            html = html_path.read_text(encoding="utf-8", errors="ignore")
+            # One pass collects <a>, <img>, srcset and <base href> together.
+            refs = html_extract.extract(html, self.parser)
+        base = urljoin(url, refs.base_href) if refs.base_href else url
+
+        saved: dict[str, Any] = {"html": None, "links": None, "images": 0}
+        unchanged = {"html": not page_changed, "images": 0}
         notes: list[str] = []
 
+        html_written = False
         if mode in ("html", "all"):
-            html_path = page_folder / "page.html"
-            html_path.write_text(html, encoding="utf-8", errors="ignore")
+            if page_changed or not html_path.exists():
+                html_path.write_text(html or "", encoding="utf-8", errors="ignore")
+                html_written = True
+                notes.append(f"Saved HTML: {html_path}")
+            else:
+                notes.append(f"HTML unchanged: {html_path}")
             saved["html"] = str(html_path)
-            notes.append(f"Saved HTML: {html_path}")
+
+        # The page's validators describe page.html, so they are only recorded when the
+        # file on disk now holds this response; otherwise the next html/all run would
+        # get a 304 and keep an older file.
+        if not page.not_modified and (html_written or not page_changed):
+            manifest.put(
+                url,
+                {
+                    "path": "page.html",
+                    "size": page.text_size,
+                    "sha256": page.sha256,
+                    "etag": page.headers.get("ETag"),
+                    "last_modified": page.headers.get("Last-Modified"),
+                },
+            )
 
         if mode in ("links", "all"):
             links = []
-            for a in soup.find_all("a"):
-                href = a.get("href")
-                if not href:
-                    continue
-                href = href.strip()
-                if href.startswith("#"):
-                    continue
-                if href.startswith(("mailto:", "tel:", "javascript:", "data:")):
-                    continue
-                full = urljoin(url, href)
-                if self._is_http_url(full):
+            for href in refs.hrefs:
+                full = resolve_href(base, href)
+                if full:
                     links.append(full)
 
             seen = set()
@@ -112,39 +264,107 @@ class WebDownloaderTool:
             images_folder = page_folder / "images"
             images_folder.mkdir(parents=True, exist_ok=True)
 
+            sources = refs.images + (refs.srcset if params.get("include_srcset") else [])
             img_urls = []
-            for img in soup.find_all("img"):
-                src = img.get("src")
-                if not src:
-                    continue
-                src = src.strip()
-                if src.startswith("data:"):
-                    continue
-                full = urljoin(url, src)
-                if self._is_http_url(full):
+            for src in sources:
+                full = resolve_href(base, src)
+                if full:
                     img_urls.append(full)
 
             img_urls = list(dict.fromkeys(img_urls))
+            if site_rules:
+                site = origin(url)
+                allowed = [u for u in img_urls if origin(u) != site or site_rules.allowed(u)]
+                saved["robots_blocked"] = len(img_urls) - len(allowed)
+                img_urls = allowed
+
+            workers = int_param(params, "workers", self.workers)
+            max_image_bytes = int_param(params, "max_image_bytes", self.max_image_bytes)
+            budget = _ByteBudget(int_param(params, "max_total_bytes", self.max_total_bytes))
 
             count = 0
-            for i, img_url in enumerate(img_urls, start=1):
-                try:
-                    img_r = requests.get(img_url, timeout=timeout, headers={"User-Agent": "AutomationHub/1.0"})
-                    img_r.raise_for_status()
+            total_bytes = 0
+            skipped: list[str] = []
+            index: dict[str, str] = {}
+            stale: set[str] = set()
+            if img_urls:
+                blobs = BlobStore(out_dir / "_blobs")
+                progress = ctx.reporter("images", total=len(img_urls))
+                with ThreadPoolExecutor(max_workers=min(workers, len(img_urls))) as pool:
+                    futures = [
+                        pool.submit(
+                            self._download_image,
+                            session,
+                            img_url,
+                            page_folder,
+                            blobs,
+                            timeout,
+                            max_image_bytes,
+                            budget,
+                            manifest.get(img_url),
+                            ctx,
+                            progress,
+                        )
+                        for img_url in img_urls
+                    ]
+                    for img_url, fut in zip(img_urls, futures):
+                        fut.add_done_callback(lambda _f, u=img_url: progress.advance(current=u))
+                    for img_url, fut in zip(img_urls, futures):
+                        previous = manifest.get(img_url)
+                        try:
+                            entry = fut.result()
+                        except _SkipImage as e:
+                            skipped.append(str(e))
+                            continue
+                        except (requests.RequestException, OSError, CancelledError):
+                            continue
+                        count += 1
+                        total_bytes += entry.pop("written")
+                        if not entry.pop("changed"):
+                            unchanged["images"] += 1
+                        elif previous and previous.get("path"):
+                            stale.add(previous["path"])
+                        manifest.put(img_url, entry)
+                        index[img_url] = entry.get("blob") or entry["path"]
+
+                progress.finish()
 
-                    ext = os.path.splitext(urlparse(img_url).path)[1]
-                    if not ext:
-                        ext = self._guess_ext(img_r.headers.get("Content-Type", "")) or ".bin"
+            # Forget images this page no longer references, then drop every link
+            # no surviving entry (downloaded this run or not) still points to.
+            wanted = set(img_urls)
+            for u in manifest.urls():
+                if u != url and u not in wanted:
+                    entry = manifest.remove(u)
+                    if entry and entry.get("path"):
+                        stale.add(entry["path"])
+            kept = {e["path"] for e in map(manifest.get, img_urls) if e and e.get("path")}
+            for rel in stale - kept:
+                (page_folder / rel).unlink(missing_ok=True)
 
-                    file_name = f"img_{i:03d}{ext}"
-                    (images_folder / file_name).write_bytes(img_r.content)
-                    count += 1
-                except requests.RequestException:
-                    continue
+            index_path = page_folder / "images.json"
+            index_path.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+            saved["images_index"] = str(index_path)
 
             saved["images"] = count
-            notes.append(f"Downloaded images: {count} file(s) into {images_folder}")
+            saved["image_bytes"] = total_bytes
+            notes.append(f"Images: {count} file(s) in {images_folder} ({total_bytes} bytes transferred)")
+            if unchanged["images"]:
+                notes.append(f"Unchanged images: {unchanged['images']}")
+            if skipped:
+                notes.append(f"Skipped images: {len(skipped)} (size cap / byte budget)")
+            if saved.get("robots_blocked"):
+                notes.append(f"Skipped images: {saved['robots_blocked']} (disallowed by robots.txt)")
+
+        if robots:
+            robots.save()
+        try:
+            manifest.save()
+        except OSError as e:
+            notes.append(f"Could not save manifest: {e}")
+        # Images finished before a cancel are kept in the manifest above.
+        ctx.check()
 
+        saved["unchanged"] = unchanged
         msg = "\n".join(
             ["Web download complete.", f"Base URL: {url}", f"Output: {page_folder}", ""] + notes
         )